@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""add change log
+
+Adds the `change_log` table. The managers append an entry for every created,
+updated and deleted user and group; the v2 API lists them as changes feed.
+The `id` is the feed's cursor. Existing objects have no entries, so clients
+start with a full listing and follow the feed from then on.
+
+Revision ID: 3f6c2d8b91a4
+Revises: 77a33a74536c
+Create Date: 2026-10-19 14:03:52.118274
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6c2d8b91a4"
+down_revision: str | Sequence[str] | None = "77a33a74536c"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "change_log",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.INTEGER(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column("object_type", sa.String(length=16), nullable=False),
+        sa.Column("public_id", sa.UUID(), nullable=False),
+        sa.Column("action", sa.String(length=16), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("school_name", sa.String(length=255), nullable=True),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_change_log_object_type_id", "change_log", ["object_type", "id"], unique=False)
+    op.create_index("ix_change_log_changed_at", "change_log", ["changed_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_change_log_changed_at", table_name="change_log")
+    op.drop_index("ix_change_log_object_type_id", table_name="change_log")
+    op.drop_table("change_log")
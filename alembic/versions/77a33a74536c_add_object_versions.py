@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""add object versions
+
+Adds the `version` counter to the `user` and `group` tables. The managers
+increment it whenever an object or what it shows of related objects changes;
+the v2 API derives entity tags from it. Existing rows start at 1.
+
+Revision ID: 77a33a74536c
+Revises: e49791148e25
+Create Date: 2026-10-19 10:12:31.412907
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "77a33a74536c"
+down_revision: str | Sequence[str] | None = "e49791148e25"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("user", sa.Column("version", sa.INTEGER(), server_default="1", nullable=False))
+    op.add_column("group", sa.Column("version", sa.INTEGER(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("group", "version")
+    op.drop_column("user", "version")
@@ -6,6 +6,12 @@
 #
 #   TRUSTED_PROXY_IPS: Optional. Comma-separated IPs/CIDRs trusted for
 #   X-Forwarded-* headers. If unset, Gunicorn ignores forwarded headers.
+#
+#   PRELOAD: Optional. "true" loads the application in the Gunicorn master
+#   process before forking the workers. Defaults to UCR ucsschool/kelvin/preload.
+#
+#   PROMETHEUS_MULTIPROC_DIR: Optional. Directory in which the workers store
+#   their metrics for /metrics. Emptied on start. Defaults to /tmp/kelvin-metrics.
 
 TIMEOUT="${APPCENTER_WAIT_TIMEOUT:-60}"
 elapsed=0
@@ -47,6 +53,20 @@ if [[ -z "$NUM_WORKERS" ]]; then
 elif [[ "$NUM_WORKERS" -lt  "1" ]]; then
     NUM_WORKERS="$(nproc)"
 fi
+# read by the workers to split the database connection budget between them
+export NUM_WORKERS
+
+PRELOAD="${PRELOAD:-$(ucr get ucsschool/kelvin/preload)}"
+
+case "${PRELOAD,,}" in
+    1|yes|true|enabled|on) PRELOAD_ARG="--preload" ;;
+    *) PRELOAD_ARG="" ;;
+esac
+
+# every worker writes its metrics there, /metrics reports those of all workers
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/kelvin-metrics}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
 
 python -c "import openapi_client_udm"
 
@@ -67,6 +87,8 @@ fi
 exec gunicorn \
     --workers "$NUM_WORKERS" \
     --worker-class uvicorn.workers.UvicornWorker \
+    --config python:ucsschool.kelvin.gunicorn_conf \
+    ${PRELOAD_ARG} \
     ${TRUSTED_PROXY_IPS:+--forwarded-allow-ips="$TRUSTED_PROXY_IPS"} \
     --bind 0.0.0.0:8911 \
     ucsschool.kelvin.main:app
@@ -0,0 +1,47 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Import-time budget for the application module.
+
+Every gunicorn worker imports ``ucsschool.kelvin.main`` unless the app is
+preloaded (UCR ``ucsschool/kelvin/preload``), so the import time is part of
+every worker start and restart. The budget can be adjusted for slow test
+machines with ``KELVIN_IMPORT_TIME_BUDGET`` (seconds).
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+IMPORT_TIME_BUDGET = float(os.environ.get("KELVIN_IMPORT_TIME_BUDGET", "5.0"))
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by ``import module``."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if cumulative_us.strip().isdigit():
+            times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def test_main_import_time_is_within_budget():
+    times = import_times("ucsschool.kelvin.main")
+
+    total = times["ucsschool.kelvin.main"] / 1_000_000
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:15]
+    assert total <= IMPORT_TIME_BUDGET, "Importing took {:.2f}s, slowest modules:\n{}".format(
+        total, "\n".join(f"{us / 1_000_000:8.3f}s {name}" for name, us in slowest)
+    )
@@ -1,7 +1,7 @@
 # SPDX-FileCopyrightText: 2020-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from collections.abc import Sequence
+import threading
 from unittest.mock import Mock, patch
 
 import ldap3
@@ -11,6 +11,7 @@ from ldap3.strategy.sync import SyncStrategy
 
 import ucsschool.kelvin.constants
 import ucsschool.kelvin.ldap
+import ucsschool.kelvin.routers.v1.school
 import ucsschool.lib.models.utils
 from udm_rest_client import UDM
 
@@ -99,14 +100,47 @@ def test_get_user():
 
 
 @must_run_in_container
-def test_admin_group_members():
-    username = "Administrator"
+def test_api_group_memberships():
     ucsschool.kelvin.ldap.get_uldap_conf.cache_clear()
     uldap = ucsschool.kelvin.ldap.get_uldap_conf()
-    members = ucsschool.kelvin.ldap.admin_group_members()
-    administrator_dn = f"uid={username},cn=users,{uldap.ldap_base}"
-    assert isinstance(members, Sequence)
-    assert administrator_dn in members
+    administrator_dn = f"uid=Administrator,cn=users,{uldap.ldap_base}"
+    groups = ucsschool.kelvin.ldap.api_group_memberships(administrator_dn)
+    assert ucsschool.kelvin.constants.API_USERS_GROUP_NAME in groups
+
+
+@pytest.mark.parametrize(
+    "api_groups,kelvin_admin,kelvin_reader",
+    (
+        ((), False, False),
+        ((ucsschool.kelvin.constants.API_USERS_GROUP_NAME,), True, False),
+        ((ucsschool.kelvin.constants.API_READERS_GROUP_NAME,), False, True),
+        (
+            (
+                ucsschool.kelvin.constants.API_USERS_GROUP_NAME,
+                ucsschool.kelvin.constants.API_READERS_GROUP_NAME,
+            ),
+            True,
+            True,
+        ),
+    ),
+)
+def test_check_auth_reads_only_matching_api_groups(api_groups, kelvin_admin, kelvin_reader, random_name):
+    username = random_name()
+    user_dn = f"uid={username},cn=users,dc=test"
+    user = ucsschool.kelvin.ldap.LdapUser(username=username, disabled=False, dn=user_dn)
+    uldap = Mock()
+    uldap.search.return_value = [{"cn": Mock(value=group)} for group in api_groups]
+    with (
+        patch.object(ucsschool.kelvin.ldap, "get_dn_of_user", return_value=user_dn),
+        patch.object(ucsschool.kelvin.ldap, "get_user", return_value=user),
+        patch.object(ucsschool.kelvin.ldap, "uldap_admin_read_local", return_value=uldap),
+    ):
+        result = ucsschool.kelvin.ldap._check_auth_and_get_user(username, random_name())
+    assert result.kelvin_admin is kelvin_admin
+    assert result.kelvin_reader is kelvin_reader
+    uldap.search.assert_called_once()
+    assert f"(uniqueMember={user_dn})" in uldap.search.call_args.kwargs["search_filter"]
+    assert uldap.search.call_args.kwargs["attributes"] == ["cn"]
 
 
 @must_run_in_container
@@ -118,3 +152,70 @@ async def test_udm_kwargs_real():
     async with UDM(**udm_kwargs) as udm:
         base_dn = await udm.session.base_dn
         assert base_dn == uldap.ldap_base
+
+
+@pytest.fixture
+def uldap_recording_threads():
+    """Replace the uldap3 connections with mocks that record the threads they are used in."""
+    threads = []
+
+    def search(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return []
+
+    uldap = Mock()
+    uldap.search.side_effect = search
+    uldap.search_dn.side_effect = search
+    uldap.user_account.return_value = uldap
+    with (
+        patch.object(ucsschool.kelvin.ldap, "uldap_admin_read_local", return_value=uldap),
+        patch.object(ucsschool.kelvin.routers.v1.school, "uldap_admin_read_local", return_value=uldap),
+        patch.object(ucsschool.kelvin.routers.v1.school, "uldap_admin_read_primary", return_value=uldap),
+    ):
+        yield threads
+
+
+@pytest.mark.asyncio
+async def test_no_blocking_ldap_call_on_event_loop(uldap_recording_threads, random_name):
+    loop_thread = threading.get_ident()
+    school_module = ucsschool.kelvin.routers.v1.school
+    assert await ucsschool.kelvin.ldap.check_auth_and_get_user(random_name(), random_name()) is None
+    assert await school_module.search_schools_in_ldap(random_name()) == []
+    assert await school_module.computer_dn2name(f"cn={random_name()},cn=computers,dc=test") is None
+    assert await school_module.computer_name2dn(random_name()) is None
+    assert len(uldap_recording_threads) == 4
+    assert loop_thread not in uldap_recording_threads
+
+
+@pytest.mark.asyncio
+async def test_run_in_ldap_executor_copies_context():
+    from asgi_correlation_id.context import correlation_id
+
+    token = correlation_id.set("abc123")
+    try:
+        result = await ucsschool.kelvin.ldap.run_in_ldap_executor(
+            lambda: (threading.current_thread().name, correlation_id.get())
+        )
+    finally:
+        correlation_id.reset(token)
+    thread_name, cid = result
+    assert thread_name.startswith(ucsschool.kelvin.ldap.LDAP_EXECUTOR_THREAD_NAME_PREFIX)
+    assert cid == "abc123"
+
+
+@pytest.mark.asyncio
+async def test_lib_ldap_searches_run_in_ldap_executor():
+    threads = []
+
+    def uldap_exists(search_filter, search_base=None):
+        threads.append(threading.current_thread().name)
+        return True
+
+    ucsschool.kelvin.ldap.use_ldap_executor_in_lib()
+    try:
+        with patch.object(ucsschool.lib.models.utils, "uldap_exists", uldap_exists):
+            assert await ucsschool.lib.models.utils.uldap_exists_async("(uid=foo)") is True
+    finally:
+        ucsschool.kelvin.ldap.shutdown_ldap_executor()
+    assert threads[0].startswith(ucsschool.kelvin.ldap.LDAP_EXECUTOR_THREAD_NAME_PREFIX)
+    assert ucsschool.lib.models.utils._uldap_executor is None
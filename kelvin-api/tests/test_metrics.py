@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import logging
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from ucsschool_objects.core.adapters.sqlalchemy import PoolStatus
+
+from ucsschool.kelvin import metrics
+from ucsschool.kelvin.metrics import generate_metrics, observe_db_pool
+from ucsschool.kelvin.service.middleware import UNMATCHED_ROUTE, MetricsMiddleware
+from udm_rest_client import UDM
+
+
+def request_count(method: str, route: str, status: int) -> float:
+    value = REGISTRY.get_sample_value(
+        "kelvin_http_request_duration_seconds_count",
+        {"method": method, "route": route, "status": str(status)},
+    )
+    return value or 0.0
+
+
+@pytest.fixture
+def metrics_client(monkeypatch) -> TestClient:
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    app = FastAPI()
+
+    @app.get("/things/{name}")
+    async def get_thing(name: str):
+        if name == "missing":
+            raise HTTPException(status_code=404)
+        return {"name": name}
+
+    app.add_middleware(MetricsMiddleware, fastapi_app=app, logger=logging.getLogger(__name__))
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "method,path,route,status",
+    [
+        ("GET", "/things/a", "/things/{name}", 200),
+        ("GET", "/things/missing", "/things/{name}", 404),
+        ("DELETE", "/things/a", "/things/{name}", 405),
+        ("GET", "/nothing", UNMATCHED_ROUTE, 404),
+    ],
+)
+def test_request_duration_by_route_template(metrics_client, method, path, route, status):
+    before = request_count(method, route, status)
+
+    response = metrics_client.request(method, path)
+
+    assert response.status_code == status
+    assert request_count(method, route, status) == before + 1
+    assert REGISTRY.get_sample_value("kelvin_http_requests_in_progress", {"method": method}) == 0
+
+
+def test_observe_db_pool_counts_increase():
+    before = REGISTRY.get_sample_value("kelvin_db_pool_checkouts_total") or 0.0
+    checkouts = metrics._pool_totals["checkouts"]
+    wait_seconds = metrics._pool_totals["wait_seconds"]
+
+    for total in (checkouts + 3, checkouts + 7):
+        observe_db_pool(
+            PoolStatus(
+                size=5,
+                max_overflow=2,
+                checked_out=2,
+                overflow=0,
+                checkouts=total,
+                wait_seconds=wait_seconds + 0.5,
+                max_wait_seconds=0.25,
+            )
+        )
+
+    assert REGISTRY.get_sample_value("kelvin_db_pool_connections", {"state": "checked_out"}) == 2
+    assert REGISTRY.get_sample_value("kelvin_db_pool_checkouts_total") == before + 7
+    assert b"kelvin_db_pool_checkout_wait_seconds_total" in generate_metrics()
+
+
+@pytest.mark.asyncio
+async def test_trace_udm_requests_replaces_the_udm_session():
+    """
+    `trace_udm_requests()` rewires udm-rest-client internals (version 1.3.2 in
+    uv.lock), an upgrade that changes them must fail here instead of silently
+    losing the UDM request metrics.
+    """
+
+    async def ping(_request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/univention/udm/ping", ping)
+    async with TestServer(app) as server:
+        url = str(server.make_url("/univention/udm/"))
+        async with UDM(username="admin", password="secret", url=url) as udm:
+            untraced = udm.session.session
+            trust_env, max_headers = untraced.trust_env, untraced._max_headers
+
+            metrics.trace_udm_requests(udm)
+            traced = udm.session.session
+
+            assert traced is not untraced and untraced.closed
+            assert traced is udm.session._client.rest_client.pool_manager
+            assert (traced.trust_env, traced._max_headers) == (trust_env, max_headers)
+            before = REGISTRY.get_sample_value(
+                "kelvin_udm_request_duration_seconds_count", {"method": "GET", "status": "200"}
+            )
+            assert await udm.session.get_json(f"{url}ping") == {}
+            assert (
+                REGISTRY.get_sample_value(
+                    "kelvin_udm_request_duration_seconds_count", {"method": "GET", "status": "200"}
+                )
+                == (before or 0.0) + 1
+            )
+        assert traced.closed
@@ -1226,6 +1226,50 @@ async def test_create_with_password_hashes(
     logger.debug("OK: can login as user with new password.")
 
 
+@pytest.mark.asyncio
+async def test_bulk_create_or_update(
+    auth_header,
+    retry_http_502,
+    url_fragment,
+    create_ou_using_python,
+    create_random_users,
+    random_user_create_model,
+    random_name,
+    import_config,
+    udm_kwargs,
+    schedule_delete_user_name_using_udm,
+):
+    school = await create_ou_using_python()
+    roles = [f"{url_fragment}/roles/student"]
+    (existing,) = await create_random_users(school, {"student": 1})
+    existing.lastname = random_name()
+    new_user = await random_user_create_model(school, roles=roles)
+    schedule_delete_user_name_using_udm(new_user.name)
+    data = [
+        json.loads(existing.json()),
+        json.loads(new_user.json()),
+        {"name": random_name()},
+        json.loads(new_user.json()),
+    ]
+    response = retry_http_502(
+        requests.post,
+        f"{url_fragment}/users/bulk",
+        headers={"Content-Type": "application/json", **auth_header},
+        json=data,
+    )
+    assert response.status_code == 200, f"{response.__dict__!r}"
+    results = response.json()
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["status_code"] for result in results] == [200, 201, 422, 409], results
+    assert results[0]["user"]["lastname"] == existing.lastname
+    assert results[1]["user"]["name"] == new_user.name
+    assert results[3]["user"] is None
+    async with UDM(**udm_kwargs) as udm:
+        lib_users = await User.get_all(udm, school, f"username={existing.name}")
+        assert lib_users[0].lastname == existing.lastname
+        assert len(await User.get_all(udm, school, f"username={new_user.name}")) == 1
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("role", USER_ROLES, ids=role_id)
 async def test_create_legal_wards_wrong_role(
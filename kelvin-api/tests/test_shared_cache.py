@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import asyncio
+
+import pytest
+from aiocache import cached
+
+from ucsschool.kelvin.shared_cache import SQLiteCache
+
+NAMESPACE = "test_shared_cache"
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "cache" / "shared-cache.sqlite"
+
+
+@pytest.mark.asyncio
+async def test_entries_are_shared_between_instances(cache_path):
+    worker_a = SQLiteCache(path=cache_path, namespace=NAMESPACE)
+    worker_b = SQLiteCache(path=cache_path, namespace=NAMESPACE)
+
+    await worker_a.set("DEMOSCHOOL", ["DEMOSCHOOL"])
+    assert await worker_b.get("DEMOSCHOOL") == ["DEMOSCHOOL"]
+    assert await worker_b.multi_get(["DEMOSCHOOL", "OTHER"]) == [["DEMOSCHOOL"], None]
+
+    assert await worker_b.delete("DEMOSCHOOL") == 1
+    assert await worker_a.get("DEMOSCHOOL") is None
+    assert not await worker_a.exists("DEMOSCHOOL")
+
+
+@pytest.mark.asyncio
+async def test_entries_expire(cache_path):
+    cache = SQLiteCache(path=cache_path, namespace=NAMESPACE)
+
+    await cache.set("short", [], ttl=0.1)
+    await cache.set("long", [], ttl=60)
+    assert await cache.get("short") == []
+    await asyncio.sleep(0.2)
+
+    assert await cache.get("short") is None
+    assert await cache.get("long") == []
+    await cache.add("short", ["new"])
+    with pytest.raises(ValueError, match="already exists"):
+        await cache.add("long", ["new"])
+
+
+@pytest.mark.asyncio
+async def test_increment_expire_and_clear(cache_path):
+    cache = SQLiteCache(path=cache_path, namespace=NAMESPACE)
+    other = SQLiteCache(path=cache_path, namespace="other")
+    await other.set("key", 1)
+
+    assert await cache.increment("counter") == 1
+    assert await cache.increment("counter", 2) == 3
+    assert await cache.expire("counter", 60)
+    assert not await cache.expire("missing", 60)
+
+    await cache.clear(namespace=NAMESPACE)
+    assert await cache.get("counter") is None
+    assert await other.get("key") == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_function_is_computed_once_per_node(cache_path):
+    calls = []
+
+    async def search(ou: str):
+        calls.append(ou)
+        return [ou]
+
+    # two decorated copies stand for the same function in two worker processes
+    worker_a = cached(ttl=60, cache=SQLiteCache, path=cache_path, namespace=NAMESPACE)(search)
+    worker_b = cached(ttl=60, cache=SQLiteCache, path=cache_path, namespace=NAMESPACE)(search)
+
+    assert await worker_a("DEMOSCHOOL") == ["DEMOSCHOOL"]
+    assert await worker_b("DEMOSCHOOL") == ["DEMOSCHOOL"]
+    assert calls == ["DEMOSCHOOL"]
@@ -1,17 +1,19 @@
 # SPDX-FileCopyrightText: 2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
 
 import jwt
 import pytest
 import requests
 
 import ucsschool.kelvin.constants
+import ucsschool.kelvin.token_auth
 from ucsschool.kelvin.constants import TOKEN_HASH_ALGORITHM
 from ucsschool.kelvin.token_auth import get_token_ttl
 
-pytestmark = pytest.mark.skipif(
+must_run_in_container = pytest.mark.skipif(
     not ucsschool.kelvin.constants.CN_ADMIN_PASSWORD_FILE.exists(),
     reason="Must run inside Docker container started by appcenter.",
 )
@@ -32,6 +34,7 @@ async def create_fake_access_token(*, data: dict, expires_delta: timedelta = Non
     return encoded_jwt
 
 
+@must_run_in_container
 @pytest.mark.asyncio
 async def test_get_fake_token(retry_http_502, url_fragment):
     sub_data = {"username": "Administrator", "kelvin_admin": True, "schools": [], "roles": []}
@@ -39,3 +42,106 @@ async def test_get_fake_token(retry_http_502, url_fragment):
     auth_header = {"Authorization": f"Bearer {token}"}
     response = retry_http_502(requests.get, f"{url_fragment}/users/ARBITRARY", headers=auth_header)
     assert response.status_code == 401, "The route should return an Access denied 401"
+
+
+@pytest.fixture
+def token_keys(tmp_path, monkeypatch):
+    """Use temporary token signing and verification keys."""
+    secret_file = tmp_path / "tokens.secret"
+    secret_file.write_text("current-secret\n")
+    verify_keys_dir = tmp_path / "tokens.d"
+    verify_keys_dir.mkdir()
+    monkeypatch.setattr(ucsschool.kelvin.token_auth, "TOKEN_SIGN_SECRET_FILE", secret_file)
+    monkeypatch.setattr(
+        ucsschool.kelvin.token_auth, "TOKEN_SIGN_PRIVATE_KEY_FILE", tmp_path / "tokens.key"
+    )
+    monkeypatch.setattr(ucsschool.kelvin.token_auth, "TOKEN_VERIFY_KEYS_DIR", verify_keys_dir)
+    ucsschool.kelvin.token_auth.reset_token_keyring()
+    yield tmp_path
+    ucsschool.kelvin.token_auth.reset_token_keyring()
+
+
+@pytest.mark.asyncio
+async def test_create_access_token_sets_kid_and_aware_expiry(token_keys):
+    before = datetime.now(tz=timezone.utc)
+    token = await ucsschool.kelvin.token_auth.create_access_token(
+        data={"sub": {"username": "foo"}}, expires_delta=timedelta(minutes=5)
+    )
+    header = jwt.get_unverified_header(token)
+    assert header["kid"] == ucsschool.kelvin.token_auth.hmac_token_key("current-secret").kid
+    payload = jwt.decode(token, "current-secret", algorithms=[TOKEN_HASH_ALGORITHM])
+    expiry = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    assert before + timedelta(minutes=4) < expiry <= before + timedelta(minutes=5, seconds=1)
+
+
+@pytest.mark.asyncio
+async def test_verify_token_caches_verified_tokens(token_keys):
+    token = await ucsschool.kelvin.token_auth.create_access_token(data={"sub": {"username": "foo"}})
+    with patch.object(ucsschool.kelvin.token_auth.jwt, "decode", wraps=jwt.decode) as decode:
+        for _ in range(3):
+            claims = await ucsschool.kelvin.token_auth.verify_token(token)
+            assert claims["sub"] == {"username": "foo"}
+    assert decode.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_verify_token_rejects_expired_and_foreign_tokens(token_keys):
+    expired = jwt.encode({"exp": 1}, "current-secret", algorithm=TOKEN_HASH_ALGORITHM)
+    unknown_kid = jwt.encode(
+        {"exp": 9999999999}, "current-secret", algorithm=TOKEN_HASH_ALGORITHM, headers={"kid": "unknown"}
+    )
+    wrong_secret = jwt.encode({"exp": 9999999999}, "other-secret", algorithm=TOKEN_HASH_ALGORITHM)
+    no_expiry = jwt.encode({"sub": {}}, "current-secret", algorithm=TOKEN_HASH_ALGORITHM)
+    for token in (expired, unknown_kid, wrong_secret, no_expiry):
+        with pytest.raises(jwt.PyJWTError):
+            await ucsschool.kelvin.token_auth.verify_token(token)
+
+
+@pytest.mark.asyncio
+async def test_verify_token_accepts_legacy_and_rotated_keys(token_keys):
+    (token_keys / "tokens.d" / "previous.secret").write_text("previous-secret\n")
+    legacy = jwt.encode({"exp": 9999999999}, "current-secret", algorithm=TOKEN_HASH_ALGORITHM)
+    previous_key = ucsschool.kelvin.token_auth.hmac_token_key("previous-secret")
+    rotated = jwt.encode(
+        {"exp": 9999999999},
+        "previous-secret",
+        algorithm=TOKEN_HASH_ALGORITHM,
+        headers={"kid": previous_key.kid},
+    )
+    assert (await ucsschool.kelvin.token_auth.verify_token(legacy))["exp"] == 9999999999
+    assert (await ucsschool.kelvin.token_auth.verify_token(rotated))["exp"] == 9999999999
+
+
+@pytest.mark.asyncio
+async def test_verify_token_rotated_key_uses_configured_algorithm(token_keys, monkeypatch):
+    monkeypatch.setattr(ucsschool.kelvin.token_auth, "TOKEN_SIGN_ALGORITHM", "HS512")
+    (token_keys / "tokens.d" / "previous.secret").write_text("previous-secret\n")
+    previous_key = ucsschool.kelvin.token_auth.hmac_token_key("previous-secret", "HS512")
+    rotated = jwt.encode(
+        {"exp": 9999999999}, "previous-secret", algorithm="HS512", headers={"kid": previous_key.kid}
+    )
+    assert (await ucsschool.kelvin.token_auth.verify_token(rotated))["exp"] == 9999999999
+
+
+@pytest.mark.asyncio
+async def test_asymmetric_token_verifiable_with_public_key(token_keys, monkeypatch):
+    serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+    ec = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ec")
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    (token_keys / "tokens.key").write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    monkeypatch.setattr(ucsschool.kelvin.token_auth, "TOKEN_SIGN_ALGORITHM", "ES256")
+    token = await ucsschool.kelvin.token_auth.create_access_token(data={"sub": {"username": "foo"}})
+    # another replica or an edge proxy only needs the public key
+    public_key = ucsschool.kelvin.token_auth.public_token_key(public_pem, "ES256")
+    assert jwt.get_unverified_header(token)["kid"] == public_key.kid
+    payload = jwt.decode(token, public_key.verification_key, algorithms=["ES256"])
+    assert payload["sub"] == {"username": "foo"}
@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""The policy cache of ``univention.admin.uldap_docker.access.getPolicies()``."""
+
+from collections import Counter
+from unittest.mock import Mock
+
+import ldap
+import pytest
+
+from univention.admin import uldap_docker
+from univention.admin.uldap_docker import _PolicyCache, access
+
+BASE = "dc=test"
+SCHOOL = f"ou=school,{BASE}"
+USERS = f"cn=users,{SCHOOL}"
+POLICY = f"cn=pwhistory,cn=policies,{BASE}"
+PTYPE = "univentionPolicyPWHistory"
+ENTRIES = {
+    BASE: {"univentionPolicyReference": []},
+    SCHOOL: {"univentionPolicyReference": [POLICY]},
+    USERS: {},
+    POLICY: {
+        "objectClass": ["top", "univentionPolicy", PTYPE],
+        "cn": ["pwhistory"],
+        "univentionPWLength": ["8"],
+        "emptyAttributes": ["univentionPWHistoryLen"],
+    },
+}
+EXPECTED = {
+    PTYPE: {
+        "univentionPWHistoryLen": {"policy": POLICY, "value": [], "fixed": 0},
+        "univentionPWLength": {"policy": POLICY, "value": ["8"], "fixed": 0},
+    }
+}
+USER_ATTRS = {"objectClass": ["person"], "univentionPolicyReference": []}
+
+
+def _get(dn, attr=[], required=False):
+    try:
+        return ENTRIES[dn]
+    except KeyError:
+        if required:
+            raise ldap.NO_SUCH_OBJECT(dn)
+        return {}
+
+
+@pytest.fixture
+def lo() -> access:
+    """An `access` object without a connection, reading `ENTRIES` with a stubbed `get()`."""
+    lo = access.__new__(access)
+    lo.base = BASE
+    lo.reconnect = False
+    lo.follow_referral = False
+    lo.decode_ignorelist = []
+    lo._policy_cache = _PolicyCache()
+    lo.lo = Mock()
+    lo.lo.add_ext_s.return_value = lo.lo.modify_ext_s.return_value = (None, None, None, [])
+    lo.lo.rename_s.return_value = (None, None, None, [])
+    lo.get = Mock(side_effect=_get)
+    return lo
+
+
+def _user_policies(lo: access, uid: str):
+    return lo.getPolicies(f"uid={uid},{USERS}", attrs=USER_ATTRS)
+
+
+def test_merge_policy_with_empty_attributes():
+    """Regression: ``list(empty) + pattrs.keys()`` raised a TypeError whenever a policy applied."""
+    lo = access.__new__(access)
+    lo.base = BASE
+    lo.reconnect = False
+    lo._policy_cache = _PolicyCache()
+    lo.get = Mock(side_effect=_get)
+    result = {}
+
+    lo._merge_policy(POLICY, f"uid=a,{USERS}", {"person"}, result)
+
+    assert result == EXPECTED
+
+
+def test_siblings_read_ancestors_and_policies_once(lo: access):
+    assert _user_policies(lo, "a") == EXPECTED
+    assert _user_policies(lo, "b") == EXPECTED
+
+    assert Counter(call.args[0] for call in lo.get.call_args_list) == {
+        USERS: 1,
+        SCHOOL: 1,
+        BASE: 1,
+        POLICY: 1,
+    }
+
+
+def test_entries_expire_after_ttl(lo: access, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(uldap_docker.time, "monotonic", lambda: now[0])
+    _user_policies(lo, "a")
+    calls = lo.get.call_count
+
+    now[0] += lo._policy_cache.ttl - 1
+    _user_policies(lo, "b")
+    assert lo.get.call_count == calls
+
+    now[0] += 1
+    _user_policies(lo, "c")
+    assert lo.get.call_count == 2 * calls
+
+
+def test_least_recently_used_entry_is_evicted_at_maxsize():
+    cache = _PolicyCache(maxsize=2, ttl=60)
+    cache.set(("policy", "a"), 1)
+    cache.set(("policy", "b"), 2)
+    cache.get(("policy", "a"))
+
+    cache.set(("policy", "c"), 3)
+
+    assert cache.get(("policy", "a")) == 1
+    assert cache.get(("policy", "c")) == 3
+    with pytest.raises(KeyError):
+        cache.get(("policy", "b"))
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        pytest.param(lambda lo: lo.add(f"cn=new,{SCHOOL}", [("cn", ["new"])]), id="add"),
+        pytest.param(lambda lo: lo.modify(SCHOOL, [("description", ["old"], ["new"])]), id="modify"),
+        pytest.param(
+            lambda lo: lo.modify_s(SCHOOL, [(ldap.MOD_REPLACE, "description", ["new"])]),
+            id="modify_s",
+        ),
+        pytest.param(
+            lambda lo: lo.modify_ext_s(SCHOOL, [(ldap.MOD_REPLACE, "description", ["new"])]),
+            id="modify_ext_s",
+        ),
+        pytest.param(lambda lo: lo.rename(f"cn=x,{SCHOOL}", f"cn=y,{SCHOOL}"), id="rename"),
+        pytest.param(lambda lo: lo.rename_ext_s(f"cn=x,{SCHOOL}", "cn=y"), id="rename_ext_s"),
+        pytest.param(lambda lo: lo.delete(f"cn=x,{SCHOOL}"), id="delete"),
+    ],
+)
+def test_writes_clear_the_cache(lo: access, write):
+    _user_policies(lo, "a")
+    calls = lo.get.call_count
+
+    write(lo)
+    _user_policies(lo, "a")
+
+    assert lo.get.call_count == 2 * calls
+
+
+def test_merged_values_are_copies_of_the_cached_policy(lo: access):
+    result = _user_policies(lo, "a")
+    result[PTYPE]["univentionPWLength"]["value"].append("12")
+    result[PTYPE]["univentionPWHistoryLen"]["value"].append("3")
+
+    assert _user_policies(lo, "b") == EXPECTED
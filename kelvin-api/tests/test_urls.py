@@ -6,7 +6,8 @@ from fastapi import APIRouter, FastAPI, Request
 from fastapi.testclient import TestClient
 from starlette.routing import NoMatchFound
 
-from ucsschool.kelvin.urls import cached_url_for, url_to_name
+from ucsschool.kelvin.routers.v1.base import LibModelHelperMixin
+from ucsschool.kelvin.urls import _url_for_same_api_prefix, cached_url_for, https_url_for, url_to_name
 from ucsschool.lib.models.base import NoObject
 
 
@@ -35,6 +36,16 @@ def test_app() -> FastAPI:
     async def test_url_to_name(request: Request, obj_type: str, url: str | None = None):
         return {"url_to_name": url_to_name(request, obj_type, url)}
 
+    @object_router.get("/_test/url_for/{name}")
+    async def test_url_for(request: Request, name: str, param: str, value: str):
+        url = cached_url_for(request, name, **{param: value})
+        return {
+            "template": str(url),
+            "scan": str(_url_for_same_api_prefix(request, name, **{param: value})),
+            "https": https_url_for(request, name, **{param: value}),
+            "scheme_and_quote": LibModelHelperMixin.scheme_and_quote(str(url)),
+        }
+
     @object_router.get("/_test/no_match")
     async def test_no_match(request: Request):
         return {"resolved_url": str(cached_url_for(request, "does_not_exist"))}
@@ -48,6 +59,7 @@ def test_app() -> FastAPI:
     v2.include_router(object_router)
     app.include_router(v1)
     app.include_router(v2)
+    app.mount("/v1/static", APIRouter(), name="static")
 
     return app
 
@@ -58,8 +70,7 @@ def test_client(test_app: FastAPI) -> TestClient:
 
 
 @pytest.fixture(autouse=True)
-def clear_cached_url_for_cache():
-    cached_url_for.cache.clear()
+def clear_url_to_name_cache():
     url_to_name.cache.clear()
 
 
@@ -77,6 +88,38 @@ def test_cached_url_should_vary_by_api_version(test_client: TestClient, query: s
     assert response.json()["resolved_url"] == expected_url
 
 
+@pytest.mark.parametrize("api_prefix", ["v1", "v2"])
+@pytest.mark.parametrize(
+    "name, param, value",
+    [
+        pytest.param("get", "username", "demo_student", id="user"),
+        pytest.param("get", "username", "demo student", id="user-quoted"),
+        pytest.param("get", "role_name", "teacher", id="role"),
+        pytest.param("school_get", "school_name", "DEMOSCHOOL", id="school"),
+        pytest.param("item_get", "item_id", "1", id="item"),
+    ],
+)
+def test_url_templates_match_route_scan(
+    test_client: TestClient, api_prefix: str, name: str, param: str, value: str
+):
+    response = test_client.get(
+        f"/{api_prefix}/_test/url_for/{name}", params={"param": param, "value": value}
+    )
+
+    assert response.status_code == 200
+    urls = response.json()
+    assert urls["template"] == urls["scan"]
+    assert urls["template"].startswith(f"http://kelvin.server.test/{api_prefix}/")
+    assert urls["https"] == urls["scheme_and_quote"]
+
+
+def test_cached_url_for_falls_back_to_mounted_routes(test_client: TestClient):
+    response = test_client.get("/v1/_test/url_for/static", params={"param": "path", "value": "x.css"})
+
+    assert response.status_code == 200
+    assert response.json()["template"] == "http://kelvin.server.test/v1/static/x.css"
+
+
 def test_cached_url_for_raises_no_match_found(test_client: TestClient):
     with pytest.raises(NoMatchFound):
         test_client.get("/v1/_test/no_match")
@@ -1,19 +1,19 @@
 # SPDX-FileCopyrightText: 2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
-"""Unit tests for the pure ``_user_to_model`` helpers in the v2 user router.
+"""Unit tests for the pure ``_user_to_dict`` helpers in the v2 user router.
 
 These exercise the group-classification logic in isolation, building real
 domain objects (``User``/``Group``/``Role``/``School``) instead of talking to a
-live backend. The full ``_user_to_model`` path (URL building, model assembly)
+live backend. The full ``_user_to_dict`` path (URL building, model assembly)
 remains covered by the integration tests in ``test_route_user.py``.
 """
 
 import uuid
 
-from ucsschool_objects import UNLOADED, Group, Role, School, SchoolMembership, User
+from ucsschool_objects import UNLOADED, Group, GroupRow, Role, School, SchoolMembership, User
 
-from ucsschool.kelvin.routers.v2.user import _school_classes_and_workgroups
+from ucsschool.kelvin.routers.v2.user import _group_names_by_role, _school_classes_and_workgroups
 
 
 def _group(name: str, school: str, *roles: str) -> Group:
@@ -134,3 +134,25 @@ def test_group_with_both_roles_lands_in_both_mappings() -> None:
     school_classes, workgroups = _school_classes_and_workgroups(user)
     assert school_classes == {"DEMOSCHOOL": ["hybrid"]}
     assert workgroups == {"DEMOSCHOOL": ["hybrid"]}
+
+
+def test_projection_rows_are_classified_like_domain_groups() -> None:
+    # The list endpoint classifies projection rows, the single-object
+    # endpoints domain groups; both must produce the same mappings.
+    groups = (
+        _group("DEMOSCHOOL-2b", "DEMOSCHOOL", "school_class"),
+        _group("DEMOSCHOOL-1a", "DEMOSCHOOL", "school_class", "workgroup"),
+        _group("SCHOOL2-chess", "SCHOOL2", "workgroup"),
+    )
+    rows = [
+        GroupRow(
+            public_id=group.public_id,
+            name=group.name,
+            school_name=group.school.name,
+            role_names=tuple(role.name for role in group.roles),
+        )
+        for group in groups
+    ]
+    assert _group_names_by_role(
+        (row.name, row.school_name, row.role_names) for row in rows
+    ) == _school_classes_and_workgroups(_user(*groups))
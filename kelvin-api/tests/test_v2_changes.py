@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""How a page of the change log becomes the entries of a v2 changes feed."""
+
+import datetime
+import uuid
+from typing import Dict, List
+
+from pydantic import BaseModel
+from ucsschool_objects import ChangeAction, ChangeRow
+
+from ucsschool.kelvin.routers.v2.changes import _ChangeModel, _changes, _Page
+
+CHANGED_AT = datetime.datetime(2026, 10, 19, 12, 0, tzinfo=datetime.timezone.utc)
+CREATED, UPDATED, DELETED = ChangeAction.CREATED, ChangeAction.UPDATED, ChangeAction.DELETED
+
+
+class _Object(BaseModel):
+    url: str
+
+
+class _Change(_ChangeModel):
+    object: _Object = None
+
+
+def _rows(*changes) -> List[ChangeRow]:
+    return [
+        ChangeRow(cursor, action, public_id, f"name-{public_id.hex[:4]}", None, CHANGED_AT)
+        for cursor, (action, public_id) in enumerate(changes, start=11)
+    ]
+
+
+def _feed(page: _Page, objects: Dict[uuid.UUID, _Object]) -> list:
+    changes = _changes(page, _Change, objects, lambda row: f"tombstone/{row.name}")
+    return [(change.cursor, change.action, change.url) for change in changes]
+
+
+def test_page_lists_each_object_once_at_its_last_change():
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    rows = _rows((CREATED, a), (UPDATED, b), (UPDATED, a), (DELETED, c), (UPDATED, b))
+    objects = {a: _Object(url="a"), b: _Object(url="b")}
+
+    page = _Page(rows, cursor=10, limit=10)
+
+    assert not page.has_more
+    assert page.next_cursor == 15
+    assert page.changed_ids == [a, b]
+    assert _feed(page, objects) == [
+        (13, CREATED, "a"),
+        (14, DELETED, f"tombstone/name-{c.hex[:4]}"),
+        (15, UPDATED, "b"),
+    ]
+
+
+def test_page_skips_objects_missing_from_the_collection():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    rows = _rows((CREATED, a), (DELETED, a), (UPDATED, b))
+
+    page = _Page(rows, cursor=10, limit=10)
+
+    # "a" was created and deleted, "b" is gone or of another kind
+    assert _feed(page, {}) == [(12, DELETED, f"tombstone/name-{a.hex[:4]}")]
+
+
+def test_page_limit_and_cursor():
+    a = uuid.uuid4()
+    rows = _rows((UPDATED, a), (UPDATED, a), (UPDATED, a))
+
+    page = _Page(rows, cursor=10, limit=2)
+    empty = _Page([], cursor=42, limit=2)
+
+    assert page.has_more
+    assert page.next_cursor == 12
+    assert _feed(page, {a: _Object(url="a")}) == [(12, UPDATED, "a")]
+    assert (empty.has_more, empty.next_cursor, _feed(empty, {})) == (False, 42, [])
+
+
+def test_rename_is_identified_by_public_id():
+    a = uuid.uuid4()
+    mirror = {a: "old-url"}
+    page = _Page(_rows((UPDATED, a)), cursor=10, limit=10)
+
+    for change in _changes(page, _Change, {a: _Object(url="new-url")}, lambda row: "tombstone"):
+        mirror[change.public_id] = change.url
+
+    # the update replaces the object at the old url, which is gone from the mirror
+    assert mirror == {a: "new-url"}
+    assert "old-url" not in mirror.values()
+
+
+def test_tombstone_carries_public_id():
+    a = uuid.uuid4()
+    page = _Page(_rows((DELETED, a)), cursor=10, limit=10)
+
+    [change] = _changes(page, _Change, {}, lambda row: "tombstone")
+
+    assert (change.action, change.public_id, change.url) == (DELETED, a, "tombstone")
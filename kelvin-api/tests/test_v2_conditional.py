@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import uuid
+from typing import Optional
+
+import pytest
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from ucsschool_objects import VersionRow
+
+from ucsschool.kelvin.routers.v2._conditional import (
+    check_if_match,
+    entity_tag,
+    not_modified_response,
+    with_entity_tag,
+)
+
+VERSION = VersionRow(public_id=uuid.uuid4(), version=3)
+TAG = entity_tag(VERSION)
+CURRENT: Optional[VersionRow] = VERSION
+
+
+def check_current_if_match(request: Request) -> None:
+    check_if_match(request, CURRENT)
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/model")
+    async def get_model(request: Request, response: Response):
+        if (not_modified := not_modified_response(request, VERSION)) is not None:
+            return not_modified
+        return with_entity_tag({"name": "model"}, response, VERSION)
+
+    @app.get("/response")
+    async def get_response(request: Request, response: Response):
+        return with_entity_tag(ORJSONResponse({"name": "response"}), response, VERSION)
+
+    @app.patch("/model", dependencies=[Depends(check_current_if_match)])
+    async def patch_model():
+        return {"name": "patched"}
+
+    return TestClient(app)
+
+
+def test_entity_tag_is_a_quoted_strong_tag():
+    assert TAG == f'"{VERSION.public_id.hex}-3"'
+    assert TAG != entity_tag(VersionRow(public_id=VERSION.public_id, version=4))
+
+
+@pytest.mark.parametrize("path", ["/model", "/response"])
+def test_get_sets_etag(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == TAG
+
+
+@pytest.mark.parametrize(
+    "header,status_code",
+    [
+        (TAG, 304),
+        (f'"other", W/{TAG}', 304),
+        ("*", 304),
+        ('"other"', 200),
+    ],
+)
+def test_if_none_match(client, header, status_code):
+    response = client.get("/model", headers={"If-None-Match": header})
+
+    assert response.status_code == status_code
+    assert response.headers["ETag"] == TAG
+    assert (response.content == b"") is (status_code == 304)
+
+
+@pytest.mark.parametrize(
+    "header,current,status_code",
+    [
+        (None, VERSION, 200),
+        (TAG, VERSION, 200),
+        ("*", VERSION, 200),
+        (f"W/{TAG}", VERSION, 412),
+        ('"other"', VERSION, 412),
+        (TAG, None, 412),
+        ("*", None, 412),
+    ],
+)
+def test_if_match(client, monkeypatch, header, current, status_code):
+    monkeypatch.setattr(f"{__name__}.CURRENT", current)
+    headers = {"If-Match": header} if header else {}
+
+    response = client.patch("/model", headers=headers)
+
+    assert response.status_code == status_code
@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Contract tests for the direct v2 response serialisation.
+
+With ``ucsschool/kelvin/v2/fast_serialization`` enabled the v2 routers return
+their dicts without building and validating pydantic models. The bytes sent to
+the client must be the same as on the default (pydantic) path.
+"""
+
+import datetime
+from typing import Any, Dict, List, Type
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+import ucsschool.kelvin.routers.v2._serialize
+from ucsschool.kelvin.routers.v1.school_class import SchoolClassModel
+from ucsschool.kelvin.routers.v1.user import UserModel
+from ucsschool.kelvin.routers.v2._serialize import response_dict, v2_list_response, v2_response
+
+BASE_URL = "https://kelvin.example.com/ucsschool/kelvin/v1"
+
+USER_VALUES: Dict[str, Any] = dict(
+    school=f"{BASE_URL}/schools/DEMOSCHOOL",
+    dn="uid=demo.student,cn=schueler,cn=users,ou=DEMOSCHOOL,dc=example,dc=com",
+    name="demo.student",
+    firstname="Demo",
+    lastname="Student",
+    birthday=datetime.date(2010, 3, 4),
+    disabled=False,
+    email="demo.student@example.com",
+    expiration_date=None,
+    record_uid="demo.student",
+    source_uid="TESTID",
+    url=f"{BASE_URL}/users/demo.student",
+    schools=[f"{BASE_URL}/schools/DEMOSCHOOL", f"{BASE_URL}/schools/DEMOSCHOOL2"],
+    roles=[f"{BASE_URL}/roles/student"],
+    school_classes={"DEMOSCHOOL": ["1a", "2b"]},
+    workgroups={},
+    ucsschool_roles=["student:school:DEMOSCHOOL", "student:school:DEMOSCHOOL2"],
+    legal_guardians=[f"{BASE_URL}/users/demo.parent"],
+    legal_wards=[],
+    udm_properties={},
+)
+
+SCHOOL_CLASS_VALUES: Dict[str, Any] = dict(
+    name="1a",
+    school=f"{BASE_URL}/schools/DEMOSCHOOL",
+    description=None,
+    users=[f"{BASE_URL}/users/demo.student", f"{BASE_URL}/users/demo.teacher"],
+    create_share=True,
+    ucsschool_roles=["school_class:school:DEMOSCHOOL"],
+    url=f"{BASE_URL}/classes/DEMOSCHOOL/1a",
+    dn="cn=DEMOSCHOOL-1a,cn=klassen,cn=schueler,cn=groups,ou=DEMOSCHOOL,dc=example,dc=com",
+    udm_properties={},
+)
+
+
+def _client(model_class: Type[BaseModel], values: List[Dict[str, Any]]) -> TestClient:
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/list", response_model=List[model_class])
+    async def list_objects():
+        return v2_list_response(model_class, values)
+
+    @app.get("/object", response_model=model_class)
+    async def get_object():
+        return v2_response(model_class, values[0])
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "model_class,values",
+    [
+        (UserModel, USER_VALUES),
+        (UserModel, {**USER_VALUES, "birthday": None, "email": None, "legal_guardians": []}),
+        (SchoolClassModel, SCHOOL_CLASS_VALUES),
+    ],
+)
+@pytest.mark.parametrize("path", ["/list", "/object"])
+def test_fast_serialization_is_byte_equivalent(
+    model_class: Type[BaseModel], values: Dict[str, Any], path: str, monkeypatch
+):
+    client = _client(model_class, [values, {**values, "name": f"{values['name']}2"}])
+    monkeypatch.setattr(ucsschool.kelvin.routers.v2._serialize, "FAST_SERIALIZATION", False)
+    validated = client.get(path)
+    monkeypatch.setattr(ucsschool.kelvin.routers.v2._serialize, "FAST_SERIALIZATION", True)
+    direct = client.get(path)
+
+    assert validated.status_code == direct.status_code == 200
+    assert direct.content == validated.content
+
+
+def test_response_dict_fills_defaults_in_field_order():
+    values = dict(USER_VALUES)
+    del values["workgroups"], values["legal_wards"]
+
+    result = response_dict(UserModel, values)
+
+    assert list(result) == list(UserModel.__fields__)
+    assert result["workgroups"] == {}
+    assert result["legal_wards"] == []
@@ -44,11 +44,14 @@ IMPORT_CONFIG_FILE_DEFAULT = Path("/usr/share/ucs-school-import/configs/kelvin_d
 IMPORT_CONFIG_FILE_USER = Path("/var/lib/ucs-school-import/configs/kelvin.json")
 KELVIN_IMPORTUSER_HOOKS_PATH = Path("/var/lib/ucs-school-import/kelvin-hooks")
 MACHINE_PASSWORD_FILE = "/etc/machine.secret"  # noqa: S105
+SHARED_CACHE_FILE_DEFAULT = Path("/var/cache", APP_ID, "shared-cache.sqlite")
 STATIC_FILES_PATH = Path("/kelvin/kelvin-api/static")
 STATIC_FILE_CHANGELOG = STATIC_FILES_PATH / "changelog.html"
 STATIC_FILE_README = STATIC_FILES_PATH / "readme.html"
 TOKEN_SIGN_SECRET_FILE = APP_CONFIG_BASE_PATH / "tokens.secret"
 TOKEN_HASH_ALGORITHM = "HS256"  # noqa: S105
+TOKEN_SIGN_PRIVATE_KEY_FILE = APP_CONFIG_BASE_PATH / "tokens.key"
+TOKEN_VERIFY_KEYS_DIR = APP_CONFIG_BASE_PATH / "tokens.d"
 UDM_MAPPED_PROPERTIES_CONFIG_FILE = KELVIN_CONFIG_BASE_PATH / "mapped_udm_properties.json"
 UCRV_TOKEN_TTL = "ucsschool/kelvin/access_tokel_ttl"  # noqa: S105
 URL_KELVIN_BASE = "/ucsschool/kelvin"
@@ -8,6 +8,7 @@ from pathlib import Path
 
 from sqlalchemy import make_url
 from sqlalchemy.engine.url import URL
+from ucsschool_objects.core.adapters.sqlalchemy import DatabaseSettings, database_settings
 
 from ucsschool.lib.models.utils import env_or_ucr
 
@@ -27,3 +28,12 @@ def get_database_url() -> URL:
     if sqlalchemy_url.drivername == "postgresql":
         sqlalchemy_url = sqlalchemy_url.set(drivername="postgresql+psycopg")
     return sqlalchemy_url
+
+
+def get_database_settings() -> DatabaseSettings:
+    """Database URL and connection pool settings of one worker process."""
+    return database_settings(
+        get_database_url(),
+        lambda name: env_or_ucr(f"ucsschool/kelvin/db/{name}"),
+        workers=int(os.getenv("NUM_WORKERS") or 1),
+    )
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Gunicorn server hooks, loaded by ``start-kelvin.sh`` with
+``--config python:ucsschool.kelvin.gunicorn_conf``.
+
+With ``--preload`` (UCR ``ucsschool/kelvin/preload``) gunicorn imports the
+application once in the master process. ``on_starting`` then also loads the
+configuration and initializes the UCS@school import framework there, before
+the workers are forked. The workers inherit all of it, so starting or
+restarting a worker does not import and initialize it again.
+
+``child_exit`` removes the Prometheus metrics of a stopped worker from
+``PROMETHEUS_MULTIPROC_DIR``, so the gauges of ``/metrics`` do not count it.
+"""
+
+import os
+
+
+def on_starting(server) -> None:
+    if not server.cfg.preload_app:
+        return
+    from ucsschool.kelvin.service.lifespan import warm_up
+
+    try:
+        warm_up()
+    except Exception as exc:
+        # the workers repeat the initialization in their lifespan and fail there
+        server.log.warning("Preloading the Kelvin configuration failed: %s", exc)
+
+
+def child_exit(server, worker) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -3,10 +3,14 @@
 # SPDX-FileCopyrightText: 2020-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import asyncio
+import contextvars
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
 
 import ldap3
 import ldap3.core.connection
@@ -16,7 +20,7 @@ from ldap3.strategy.restartable import RestartableStrategy
 from pydantic import BaseModel
 from uldap3 import Entry, LdapConfig as uLdapConfig, escape_filter_chars
 
-from ucsschool.lib.models.utils import env_or_ucr, uldap_admin_read_local
+from ucsschool.lib.models.utils import env_or_ucr, set_uldap_executor, uldap_admin_read_local
 
 from .constants import (
     API_READERS_GROUP_NAME,
@@ -24,9 +28,15 @@ from .constants import (
     CN_ADMIN_PASSWORD_FILE,
     MACHINE_PASSWORD_FILE,
 )
+from .metrics import LDAP_OPERATION_DURATION
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+LDAP_EXECUTOR_MAX_WORKERS = int(env_or_ucr("ucsschool/kelvin/ldap/max_workers") or "10")
+LDAP_EXECUTOR_THREAD_NAME_PREFIX = "kelvin-ldap"
+_ldap_executor: Optional[ThreadPoolExecutor] = None
+
 
 class FirstAttemptImmediateRestartableStrategy(RestartableStrategy):
     """``RestartableStrategy`` that performs the first reconnect attempt without waiting.
@@ -81,6 +91,51 @@ except Exception as e:
     logger.warning("Could not configure LDAP reconnection behaviour: %s", e)
 
 
+def get_ldap_executor() -> ThreadPoolExecutor:
+    """
+    Thread pool in which all blocking uldap3/ldap3 operations run, those of
+    the lib included (see `use_ldap_executor_in_lib()`).
+
+    Its size bounds the number of concurrent LDAP operations (and thus
+    connections) of a worker process.
+    """
+    global _ldap_executor
+    if _ldap_executor is None:
+        _ldap_executor = ThreadPoolExecutor(
+            max_workers=LDAP_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix=LDAP_EXECUTOR_THREAD_NAME_PREFIX,
+        )
+    return _ldap_executor
+
+
+def use_ldap_executor_in_lib() -> None:
+    """Run the LDAP searches of the lib's `uldap_exists_async()` in the LDAP thread pool."""
+    set_uldap_executor(get_ldap_executor())
+
+
+def shutdown_ldap_executor() -> None:
+    global _ldap_executor
+    set_uldap_executor(None)
+    if _ldap_executor is not None:
+        _ldap_executor.shutdown(wait=False, cancel_futures=True)
+        _ldap_executor = None
+
+
+async def run_in_ldap_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run the blocking LDAP function `func` in the LDAP thread pool, so the event
+    loop can serve other requests in the meantime.
+
+    The context (e.g. the correlation ID used in log messages) is copied to
+    the thread.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_ldap_executor(), functools.partial(ctx.run, func, *args, **kwargs)
+    )
+
+
 @lru_cache
 def get_uldap_conf(
     ldap_base: Optional[str] = None,
@@ -118,25 +173,26 @@ class LdapUser(BaseModel):
     attributes: Optional[Dict[str, List[Any]]] = None
 
 
-def group_members(group: str) -> list[str]:
+def api_group_memberships(user_dn: str) -> Set[str]:
+    """
+    Get the names of the Kelvin API groups (admins and readers) `user_dn` is a
+    member of.
+
+    Instead of reading the complete member lists of the groups, a single
+    search filtered on ``uniqueMember`` is sent, so the cost does not grow
+    with the number of API users.
+    """
     ldap_base = env_or_ucr("ldap/base")
-    search_filter = f"(cn={escape_filter_chars(group)})"
+    search_filter = (
+        f"(&(|(cn={escape_filter_chars(API_USERS_GROUP_NAME)})"
+        f"(cn={escape_filter_chars(API_READERS_GROUP_NAME)}))"
+        f"(uniqueMember={escape_filter_chars(user_dn)}))"
+    )
     base = f"cn=groups,{ldap_base}"
     uldap = uldap_admin_read_local()
-    results = uldap.search(search_filter=search_filter, attributes=["uniqueMember"], search_base=base)
-    if len(results) == 1:
-        return results[0]["uniqueMember"].values
-    else:
-        logger.error("Reading group %r from LDAP: results=%r", group, results)
-        return []
-
-
-def admin_group_members() -> list[str]:
-    return group_members(API_USERS_GROUP_NAME)
-
-
-def reader_group_members() -> list[str]:
-    return group_members(API_READERS_GROUP_NAME)
+    with LDAP_OPERATION_DURATION.labels("search").time():
+        results = uldap.search(search_filter=search_filter, attributes=["cn"], search_base=base)
+    return {result["cn"].value for result in results}
 
 
 def user_is_disabled(ldap_result: Entry) -> bool:
@@ -190,10 +246,12 @@ def get_user(
             f"))"
         )
     uldap = uldap_admin_read_local().user_account(user=bind_dn, password=bind_pw)
-    results = uldap.search(
-        search_filter,
-        attributes=attributes,
-    )
+    # the connection binds with the user's credentials for the search
+    with LDAP_OPERATION_DURATION.labels("bind" if bind_dn else "search").time():
+        results = uldap.search(
+            search_filter,
+            attributes=attributes,
+        )
     if len(results) == 1:
         result = results[0]
         return LdapUser(
@@ -214,7 +272,8 @@ def get_user(
 def get_dn_of_user(username: str) -> str:
     search_filter = f"(uid={escape_filter_chars(username)})"
     uldap = uldap_admin_read_local()
-    results = uldap.search(search_filter=search_filter, attributes=None)
+    with LDAP_OPERATION_DURATION.labels("search").time():
+        results = uldap.search(search_filter=search_filter, attributes=None)
     if len(results) == 1:
         return results[0].entry_dn
     elif len(results) > 1:
@@ -225,14 +284,8 @@ def get_dn_of_user(username: str) -> str:
         return ""
 
 
-def check_auth_and_get_user(username: str, password: str) -> Optional[LdapUser]:
-    """
-    Get user data if user exists and the password is correct.
-
-    :param str username: user to load
-    :param str password: password for `username`
-    :return: LdapUser object if user is found and the password is correct, None otherwise.
-    """
+def _check_auth_and_get_user(username: str, password: str) -> Optional[LdapUser]:
+    """Blocking implementation of :py:func:`check_auth_and_get_user()`."""
     user_dn = get_dn_of_user(username)
     if user_dn:
         try:
@@ -240,12 +293,9 @@ def check_auth_and_get_user(username: str, password: str) -> Optional[LdapUser]:
         except uldap3.exceptions.BindError:
             user = None
         if user:
-            admin_users = admin_group_members()
-            if user_dn in admin_users:
-                user.kelvin_admin = True
-            reader_users = reader_group_members()
-            if user_dn in reader_users:
-                user.kelvin_reader = True
+            api_groups = api_group_memberships(user_dn)
+            user.kelvin_admin = API_USERS_GROUP_NAME in api_groups
+            user.kelvin_reader = API_READERS_GROUP_NAME in api_groups
         else:
             logger.debug("Wrong password for existing user %r.", username)
         return user
@@ -254,6 +304,19 @@ def check_auth_and_get_user(username: str, password: str) -> Optional[LdapUser]:
         return None
 
 
+async def check_auth_and_get_user(username: str, password: str) -> Optional[LdapUser]:
+    """
+    Get user data if user exists and the password is correct.
+
+    The LDAP operations run in the LDAP thread pool.
+
+    :param str username: user to load
+    :param str password: password for `username`
+    :return: LdapUser object if user is found and the password is correct, None otherwise.
+    """
+    return await run_in_ldap_executor(_check_auth_and_get_user, username, password)
+
+
 _udm_kwargs: Dict[str, str] = {}
 
 
@@ -6,11 +6,12 @@ from datetime import timedelta
 from functools import lru_cache
 from typing import Any
 
-from fastapi import APIRouter, Depends, FastAPI, HTTPException, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Response, status
 from fastapi.openapi.docs import get_swagger_ui_oauth2_redirect_html
 from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from .constants import (
     APP_VERSION,
@@ -20,12 +21,14 @@ from .constants import (
     URL_TOKEN_BASE,
 )
 from .ldap import check_auth_and_get_user
+from .metrics import generate_metrics
 from .routers import v1, v2
 from .service.dependency import check_db_compatibility
 from .service.exception_handler import add_exception_handlers
 from .service.lifespan import build_app_lifespan
 from .service.middleware import add_middlewares
 from .token_auth import Token, create_access_token, get_token_ttl
+from .urls import build_url_templates
 
 
 @lru_cache(maxsize=1)
@@ -64,12 +67,18 @@ async def health(_: None = Depends(check_db_compatibility)):
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    # not async: reading the metric files of all workers would block the event loop
+    return Response(generate_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.post(URL_TOKEN_BASE, response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     logger: logging.Logger = Depends(get_logger),
 ):
-    user = check_auth_and_get_user(form_data.username, form_data.password)
+    user = await check_auth_and_get_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -144,6 +153,11 @@ v2_router.include_router(
     prefix="/users",
     tags=["users"],
 )
+v2_router.include_router(
+    v2.changes.router,
+    prefix="/changes",
+    tags=["changes"],
+)
 v2_router.include_router(v1.doc.router)
 
 
@@ -160,3 +174,4 @@ app.mount(
     StaticFiles(directory=str(STATIC_FILES_PATH)),
     name="static_v2",
 )
+build_url_templates(app)
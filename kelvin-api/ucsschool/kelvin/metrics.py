@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Prometheus metrics of the Kelvin API, served on ``/metrics``.
+
+``start-kelvin.sh`` sets ``PROMETHEUS_MULTIPROC_DIR``. Every gunicorn worker
+then writes its values to files in that directory, and ``/metrics`` reports
+the values of all workers together, whichever worker answers the scrape.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import aiohttp
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from ucsschool_objects.core.adapters.sqlalchemy import PoolStatus
+
+if TYPE_CHECKING:  # pragma: no cover
+    from udm_rest_client import UDM
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "kelvin_http_request_duration_seconds",
+    "Time to answer an HTTP request, by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "kelvin_http_requests_in_progress",
+    "HTTP requests currently being answered.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "kelvin_db_pool_connections",
+    "Database connection pools: size, max_overflow (capacity is their sum), checked_out, overflow.",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter(
+    "kelvin_db_pool_checkouts",
+    "Database connections taken from the pools.",
+)
+DB_POOL_CHECKOUT_WAIT = Counter(
+    "kelvin_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pools.",
+)
+UDM_REQUEST_DURATION = Histogram(
+    "kelvin_udm_request_duration_seconds",
+    "Time of an HTTP request to the UDM REST API.",
+    ["method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+LDAP_OPERATION_DURATION = Histogram(
+    "kelvin_ldap_operation_duration_seconds",
+    "Time of an LDAP operation. 'bind' is a search with the credentials of a user, including the bind.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+_pool_totals = {"checkouts": 0, "wait_seconds": 0.0}
+
+
+def generate_metrics() -> bytes:
+    """Metrics in the Prometheus text format. Reads files, do not call it in the event loop."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def observe_db_pool(status: PoolStatus) -> None:
+    """Update the database pool metrics from the current state of this worker's pool."""
+    DB_POOL_CONNECTIONS.labels("size").set(status.size)
+    DB_POOL_CONNECTIONS.labels("max_overflow").set(status.max_overflow)
+    DB_POOL_CONNECTIONS.labels("checked_out").set(status.checked_out)
+    DB_POOL_CONNECTIONS.labels("overflow").set(status.overflow)
+    # the pool counts totals, the counters need the increase since the last call
+    if status.checkouts < _pool_totals["checkouts"]:
+        # a new pool, e.g. after the engine was disposed, counts from zero
+        _pool_totals.update(checkouts=0, wait_seconds=0.0)
+    DB_POOL_CHECKOUTS.inc(status.checkouts - _pool_totals["checkouts"])
+    DB_POOL_CHECKOUT_WAIT.inc(max(status.wait_seconds - _pool_totals["wait_seconds"], 0.0))
+    _pool_totals["checkouts"] = status.checkouts
+    _pool_totals["wait_seconds"] = status.wait_seconds
+
+
+async def _on_udm_request_start(
+    _session: aiohttp.ClientSession, context: SimpleNamespace, _params: aiohttp.TraceRequestStartParams
+) -> None:
+    context.start = time.perf_counter()
+
+
+async def _on_udm_request_end(
+    _session: aiohttp.ClientSession, context: SimpleNamespace, params: aiohttp.TraceRequestEndParams
+) -> None:
+    UDM_REQUEST_DURATION.labels(params.method, params.response.status).observe(
+        time.perf_counter() - context.start
+    )
+
+
+async def _on_udm_request_exception(
+    _session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceRequestExceptionParams,
+) -> None:
+    UDM_REQUEST_DURATION.labels(params.method, "error").observe(time.perf_counter() - context.start)
+
+
+# what udm-rest-client sets on the session it opens
+UDM_MAX_HEADERS = 1000
+
+_udm_trace_config = aiohttp.TraceConfig()
+_udm_trace_config.on_request_start.append(_on_udm_request_start)
+_udm_trace_config.on_request_end.append(_on_udm_request_end)
+_udm_trace_config.on_request_exception.append(_on_udm_request_exception)
+_udm_trace_config.freeze()
+
+
+def trace_udm_requests(udm: "UDM") -> None:
+    """Send the requests of ``udm`` through an aiohttp session created with the UDM request trace config.
+
+    udm-rest-client opens its session without a way to pass ``trace_configs``, so the connector of the
+    opened session is moved to a new session created with them, before the first request is sent.
+    ``test_trace_udm_requests_replaces_the_udm_session`` pins this to the udm-rest-client internals.
+    """
+    untraced = udm.session.session
+    traced = aiohttp.ClientSession(
+        connector=untraced.connector,
+        trust_env=untraced.trust_env,
+        max_headers=UDM_MAX_HEADERS,
+        trace_configs=[_udm_trace_config],
+    )
+    untraced.detach()
+    udm.session._client.rest_client.pool_manager = traced
+    udm.session._session = traced
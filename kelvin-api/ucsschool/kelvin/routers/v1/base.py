@@ -18,6 +18,7 @@ from udm_rest_client import UDM, UdmObject
 from ...config import UDM_MAPPING_CONFIG
 from ...exceptions import UnknownUDMProperty
 from ...ldap import udm_kwargs
+from ...metrics import trace_udm_requests
 from ...urls import cached_url_for, url_to_name
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -164,21 +165,21 @@ class LibModelHelperMixin(BaseModel):
         if self.udm_properties is None:
             self.udm_properties = {}
 
-    def as_lib_model(self, request: Request) -> UCSSchoolModel:
+    async def as_lib_model(self, request: Request) -> UCSSchoolModel:
         """Get the corresponding ucsschool.lib object to this Kelvin object."""
-        kwargs = self._as_lib_model_kwargs(request)
+        kwargs = await self._as_lib_model_kwargs(request)
         udm_properties = kwargs.pop("udm_properties") if "udm_properties" in kwargs else {}
         filtered_udm_properties = self.filter_udm_properties(udm_properties)
         lib_obj: UCSSchoolModel = self.Config.lib_class(**kwargs)
         lib_obj.udm_properties = filtered_udm_properties
         return lib_obj
 
-    def _as_lib_model_kwargs(self, request: Request) -> Dict[str, Any]:
+    async def _as_lib_model_kwargs(self, request: Request) -> Dict[str, Any]:
         """
         Get object data as dict that can be used to create the ucsschool.lib
         object corresponding to this Kelvin object.
 
-        kwargs = kelvin_object._as_lib_model_kwargs()
+        kwargs = await kelvin_object._as_lib_model_kwargs()
         lib_object = LibClass(**kwargs)
         """
         kwargs = self.dict()
@@ -201,8 +202,8 @@ class UcsSchoolBaseModel(LibModelHelperMixin):
 
     class Config(LibModelHelperMixin.Config): ...
 
-    def as_lib_model(self, request: Request) -> UCSSchoolModel:
-        kwargs = self._as_lib_model_kwargs(request)
+    async def as_lib_model(self, request: Request) -> UCSSchoolModel:
+        kwargs = await self._as_lib_model_kwargs(request)
         udm_properties = kwargs.pop("udm_properties") if "udm_properties" in kwargs else {}
         filtered_udm_properties = self.filter_udm_properties(udm_properties)
         if self.Config.lib_class.supports_school():
@@ -243,6 +244,7 @@ def get_language_from_header(request: Request) -> str:
 async def udm_ctx(request: Request):
     language = get_language_from_header(request)
     async with UDM(**udm_kwargs(), language=language) as udm:
+        trace_udm_requests(udm)
         yield udm
 
 
@@ -5,7 +5,6 @@ import logging
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from aiocache import Cache, cached
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -30,7 +29,8 @@ from ucsschool.lib.models.utils import env_or_ucr, ucr, uldap_admin_read_primary
 from ucsschool.lib.schoolldap import name_from_dn
 from udm_rest_client import UDM
 
-from ...ldap import LdapUser, uldap_admin_read_local
+from ...ldap import LdapUser, run_in_ldap_executor, uldap_admin_read_local
+from ...shared_cache import shared_cached
 from ...token_auth import get_kelvin_admin, get_kelvin_reader
 from ...urls import cached_url_for
 from .base import APIAttributesMixin, LibModelHelperMixin, udm_ctx
@@ -83,19 +83,23 @@ class SchoolModel(SchoolCreateModel, APIAttributesMixin):
             str(cached_url_for(request, "school_get", school_name=kwargs["name"]))
         )
         kwargs["administrative_servers"] = [
-            name for name in [computer_dn2name(dn) for dn in obj.administrative_servers] if name
+            name for name in [await computer_dn2name(dn) for dn in obj.administrative_servers] if name
         ]
-        kwargs["class_share_file_server"] = computer_dn2name(obj.class_share_file_server)
+        kwargs["class_share_file_server"] = await computer_dn2name(obj.class_share_file_server)
         kwargs["educational_servers"] = [
-            name for name in [computer_dn2name(dn) for dn in obj.educational_servers] if name
+            name for name in [await computer_dn2name(dn) for dn in obj.educational_servers] if name
         ]
-        kwargs["home_share_file_server"] = computer_dn2name(obj.home_share_file_server)
+        kwargs["home_share_file_server"] = await computer_dn2name(obj.home_share_file_server)
         return kwargs
 
 
-def computer_dn2name(dn: str) -> Optional[str]:
+async def computer_dn2name(dn: str) -> Optional[str]:
     if not dn:
         return None
+    return await run_in_ldap_executor(_computer_dn2name, dn)
+
+
+def _computer_dn2name(dn: str) -> Optional[str]:
     on_primary = ucr.get("ldap/server/type") == "master"
     uldap = uldap_admin_read_primary() if not on_primary else uldap_admin_read_local()
     filter_s, base = dn.split(",", 1)
@@ -108,8 +112,12 @@ def computer_dn2name(dn: str) -> Optional[str]:
     return None
 
 
+async def computer_name2dn(name: str) -> Optional[str]:
+    return await run_in_ldap_executor(_computer_name2dn, name)
+
+
 @lru_cache(maxsize=1024)
-def computer_name2dn(name: str) -> Optional[str]:
+def _computer_name2dn(name: str) -> Optional[str]:
     uldap = uldap_admin_read_local()
     for dn in uldap.search_dn(School._ldap_filter(name)):
         return dn
@@ -129,7 +137,7 @@ async def fix_school_attributes(
     if len(school_obj.administrative_servers) != len(school.administrative_servers):
         dns = []
         for host in school.administrative_servers:
-            if dn := computer_name2dn(host):
+            if dn := await computer_name2dn(host):
                 dns.append(dn)
             else:
                 success = await school_obj.create_dc_slave(udm, host, True)
@@ -144,7 +152,7 @@ async def fix_school_attributes(
     ):
         dns = []
         for host in school.educational_servers:
-            if dn := computer_name2dn(host):
+            if dn := await computer_name2dn(host):
                 dns.append(dn)
             else:
                 success = await school_obj.create_dc_slave(udm, host, False)
@@ -158,13 +166,13 @@ async def fix_school_attributes(
         school.class_share_file_server
         and name_from_dn(school_obj.class_share_file_server) != school.class_share_file_server
     ):
-        school_obj.class_share_file_server = computer_name2dn(school.class_share_file_server)
+        school_obj.class_share_file_server = await computer_name2dn(school.class_share_file_server)
         changed = True
     if (
         school.home_share_file_server
         and name_from_dn(school_obj.home_share_file_server) != school.home_share_file_server
     ):
-        school_obj.home_share_file_server = computer_name2dn(school.home_share_file_server)
+        school_obj.home_share_file_server = await computer_name2dn(school.home_share_file_server)
         changed = True
     if changed:
         await school_obj.modify(udm)
@@ -292,7 +300,7 @@ async def school_create(
             "display_name": "Example School"
         }
     """
-    school_obj: School = school.as_lib_model(request)
+    school_obj: School = await school.as_lib_model(request)
     if await school_obj.exists(udm):
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="School exists.")
     await validate_create_request_params(school, logger, udm)
@@ -360,8 +368,12 @@ async def school_exists(
     return Response(status_code=status_code)
 
 
-@cached(ttl=OU_CACHE_TTL, cache=Cache.MEMORY, namespace=OU_CACHE_NAMESPACE, key_builder=ou_cache_key)
+@shared_cached(ttl=OU_CACHE_TTL, namespace=OU_CACHE_NAMESPACE, key_builder=ou_cache_key)
 async def _search_schools_in_ldap(ou: str) -> List[str]:
+    return await run_in_ldap_executor(_search_schools_in_ldap_blocking, ou)
+
+
+def _search_schools_in_ldap_blocking(ou: str) -> List[str]:
     uldap = uldap_admin_read_local()
     results = uldap.search(
         filter_format("(&(objectClass=ucsschoolOrganizationalUnit)(ou=%s))", (ou,)),
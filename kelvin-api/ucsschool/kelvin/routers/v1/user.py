@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2020-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import asyncio
 import base64
 import binascii
 import calendar
@@ -8,9 +9,9 @@ import datetime
 import logging
 import time
 from collections.abc import Sequence
-from functools import lru_cache
+from functools import lru_cache, partial
 from operator import attrgetter
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Type
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Type
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request, Response, status
 from ldap import explode_dn
@@ -48,21 +49,22 @@ from ucsschool.importer.models.import_user import (
     convert_to_teacher_and_staff,
 )
 from ucsschool.lib.models.attributes import ValidationError as LibValidationError
-from ucsschool.lib.models.base import WrongModel
+from ucsschool.lib.models.base import NoObject, WrongModel
 from ucsschool.lib.models.user import User
-from ucsschool.lib.models.utils import uldap_admin_write_primary
+from ucsschool.lib.models.utils import env_or_ucr, uldap_admin_write_primary
 from ucsschool.lib.roles import (
     InvalidUcsschoolRoleString,
     UnknownRole,
     create_ucsschool_role_string,
     get_role_info,
 )
-from udm_rest_client import UDM, CreateError, ModifyError, MoveError
+from udm_rest_client import UDM, CreateError, ModifyError, MoveError, UdmError
 from univention.admin.filter import conjunction, expression
 
 from ...config import UDM_MAPPING_CONFIG
 from ...import_config import get_import_config, init_ucs_school_import_framework
-from ...ldap import LdapUser, get_dn_of_user
+from ...ldap import LdapUser, get_dn_of_user, run_in_ldap_executor
+from ...service.exception_handler import udm_error_details
 from ...token_auth import get_kelvin_admin, get_kelvin_reader
 from ...urls import cached_url_for, url_to_name
 from .base import (
@@ -78,6 +80,10 @@ from .school import search_schools_in_ldap
 
 router = APIRouter()
 
+BULK_MAX_USERS = 1000
+BULK_CONCURRENCY = int(env_or_ucr("ucsschool/kelvin/bulk/concurrency") or "4")
+_BULK_SEARCH_CHUNK_SIZE = 100
+
 
 @lru_cache(maxsize=1)
 def accepted_udm_properties() -> Set[str]:
@@ -280,8 +286,8 @@ class UserCreateModel(UserBaseModel):
 
     _not_both_password_and_hashes = root_validator(allow_reuse=True)(not_both_password_and_hashes)
 
-    def _as_lib_model_kwargs(self, request: Request) -> Dict[str, Any]:
-        kwargs = super()._as_lib_model_kwargs(request)
+    async def _as_lib_model_kwargs(self, request: Request) -> Dict[str, Any]:
+        kwargs = await super()._as_lib_model_kwargs(request)
         if isinstance(kwargs["password"], SecretStr):
             kwargs["password"] = kwargs["password"].get_secret_value()
         kwargs["school"] = (
@@ -675,17 +681,18 @@ async def search(  # noqa: C901
     udm_objs = [udm_obj async for udm_obj in udm.get("users/user").search(udm_filter)]
     t1 = time.time()
     users: List[ImportUser] = []
-    for udm_obj in udm_objs:
-        try:
-            users.append(await ImportUser.from_udm_obj(udm_obj, None, udm))
-        except WrongModel as exc:
-            msg = f"Wrong ImportUser model when reading user {udm_obj.dn!r}: {exc!s}"
-            logger.error(msg)
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=msg)
-        except Exception as exc:
-            msg = f"Unknown error when reading user {udm_obj.dn!r}: {exc!s}"
-            logger.error(msg)
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=msg)
+    with ImportUser.batch_conversion():
+        for udm_obj in udm_objs:
+            try:
+                users.append(await ImportUser.from_udm_obj(udm_obj, None, udm))
+            except WrongModel as exc:
+                msg = f"Wrong ImportUser model when reading user {udm_obj.dn!r}: {exc!s}"
+                logger.error(msg)
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=msg)
+            except Exception as exc:
+                msg = f"Unknown error when reading user {udm_obj.dn!r}: {exc!s}"
+                logger.error(msg)
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=msg)
     t2 = time.time()
     users.sort(key=attrgetter("name"))
     t3 = time.time()
@@ -725,7 +732,7 @@ async def get(
 
     - **username**: name of the school user (required)
     """
-    dn = get_dn_of_user(username)
+    dn = await run_in_ldap_executor(get_dn_of_user, username)
     if not dn:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -829,6 +836,24 @@ async def create(
     **Note:** Even though only **school** or **schools** needs to be set,
         its advised to set both as best practice.
     """
+    user = await _prepare_new_user(request, request_user, logger, udm)
+    await _create_prepared_user(user, request_user, logger, udm)
+    return await UserModel.from_lib_model(user, request, udm)
+
+
+async def _prepare_new_user(
+    request: Request,
+    request_user: UserCreateModel,
+    logger: logging.Logger,
+    udm: UDM,
+    *,
+    exists: Optional[bool] = None,
+) -> ImportUser:
+    """
+    Validate a user to be created and allocate its name.
+
+    `exists` is the result of an existence check already done by the caller.
+    """
     t0 = time.time()
     request_user.Config.lib_class = SchoolUserRole.get_lib_class(
         [
@@ -836,9 +861,11 @@ async def create(
             for role in request_user.roles
         ]
     )
-    user: ImportUser = request_user.as_lib_model(request)
+    user: ImportUser = await request_user.as_lib_model(request)
     await fix_case_of_ous(user)
-    if await user.exists(udm):
+    if exists is None:
+        exists = await user.exists(udm)
+    if exists:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="School user exists.")
     t1 = time.time()
 
@@ -868,6 +895,21 @@ async def create(
             )
         await user.validate(udm, validate_unlikely_changes=True, check_username=True)
         t4 = time.time()
+    except (LibValidationError, UcsSchoolImportError, WorkgroupDoesNotExistError) as exc:
+        error_msg = f"Failed to create {user!r}: {exc}"
+        logger.exception(error_msg)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
+
+    logger.debug("Timings: t1=%.3f t2=%.3f t3=%.3f t4=%.3f", t1 - t0, t2 - t1, t3 - t2, t4 - t3)
+    return user
+
+
+async def _create_prepared_user(
+    user: ImportUser, request_user: UserCreateModel, logger: logging.Logger, udm: UDM
+) -> None:
+    """Create a user returned by `_prepare_new_user()` in UDM."""
+    t4 = time.time()
+    try:
         logger.info("Going to create %s with %r...", user, user.to_dict())
         res = await user.create(udm)  # TODO: this takes 750 ms
         t5 = time.time()
@@ -889,16 +931,7 @@ async def create(
         await set_password_hashes(user.dn, request_user.kelvin_password_hashes)
     t6 = time.time()
 
-    logger.debug(
-        "Timings: t1=%.3f t2=%.3f t3=%.3f t4=%.3f t5=%.3f t6=%.3f",
-        t1 - t0,
-        t2 - t1,
-        t3 - t2,
-        t4 - t3,
-        t5 - t4,
-        t6 - t5,
-    )
-    return await UserModel.from_lib_model(user, request, udm)
+    logger.debug("Timings: t5=%.3f t6=%.3f", t5 - t4, t6 - t5)
 
 
 async def change_school(
@@ -1192,7 +1225,7 @@ async def partial_update(  # noqa: C901
 
 
 @router.put("/{username}", status_code=status.HTTP_200_OK, response_model=UserModel)
-async def complete_update(  # noqa: C901
+async def complete_update(
     username: str,
     user: UserCreateModel,
     request: Request,
@@ -1294,14 +1327,30 @@ async def complete_update(  # noqa: C901
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No object with name={username!r} found or not authorized.",
         )
-    user.Config.lib_class = SchoolUserRole.get_lib_class(
+    return await _replace_user(udm_obj.dn, user, await request.json(), request, logger, udm)
+
+
+async def _replace_user(  # noqa: C901
+    dn: str,
+    user: UserCreateModel,
+    request_data: Mapping[str, Any],
+    request: Request,
+    logger: logging.Logger,
+    udm: UDM,
+) -> UserModel:
+    """
+    Replace the user at `dn` with `user`, parsed from `request_data`.
+    """
+    # kept locally, Config is shared by all requests
+    lib_class = SchoolUserRole.get_lib_class(
         [
             SchoolUserRole(url_to_name(request, "role", UcsSchoolBaseModel.unscheme_and_unquote(role)))
             for role in user.roles
         ]
     )
-    user_request: ImportUser = user.as_lib_model(request)
-    user_current: ImportUser = await get_import_user(udm, udm_obj.dn)
+    user.Config.lib_class = lib_class
+    user_request: ImportUser = await user.as_lib_model(request)
+    user_current: ImportUser = await get_import_user(udm, dn)
 
     # Check that legal-guardian parameters are only used with the correct role
     for param, role in [["legal_guardians", "student"], ["legal_wards", "legal_guardian"]]:
@@ -1314,7 +1363,7 @@ async def complete_update(  # noqa: C901
             )
 
     # leave workgroups as they were if not passed in the request
-    if "workgroups" not in await request.json():
+    if "workgroups" not in request_data:
         user_request.workgroups = user_current.workgroups
 
     # 1. move
@@ -1342,7 +1391,7 @@ async def complete_update(  # noqa: C901
     # 4. modify
     changed = False
     # TODO: Should not access private interface:
-    for attr in list(user.Config.lib_class._attributes.keys()) + ["udm_properties"]:
+    for attr in list(lib_class._attributes.keys()) + ["udm_properties"]:
         if attr == "kelvin_password_hashes":
             # handled below
             continue
@@ -1372,7 +1421,7 @@ async def complete_update(  # noqa: C901
             logger.warning(
                 "Error modifying user %r with %r: %s",
                 user_current,
-                await request.json(),
+                request_data,
                 exc,
             )
             if isinstance(exc, ModifyError):
@@ -1389,6 +1438,124 @@ async def complete_update(  # noqa: C901
     return await UserModel.from_lib_model(user_current, request, udm)
 
 
+class BulkUserResult(BaseModel):
+    index: int = Field(..., description="Position of the user in the request.")
+    status_code: int = Field(..., description="Status code of the single user request.")
+    user: Optional[UserModel] = Field(None, description="The user, if it was created or updated.")
+    detail: Any = Field(None, description="Error details, as in the response of a single request.")
+
+
+def _bulk_error(index: int, exc: Exception, logger: logging.Logger) -> BulkUserResult:
+    """The result of a failed user, as the exception handlers would have answered it."""
+    if isinstance(exc, HTTPException):
+        status_code, detail = exc.status_code, exc.detail
+    elif isinstance(exc, ValidationError):
+        status_code, detail = status.HTTP_422_UNPROCESSABLE_ENTITY, exc.errors()
+    elif isinstance(exc, UdmError):
+        status_code, detail = exc.status or 500, udm_error_details(exc)
+    elif isinstance(exc, NoObject):
+        status_code, detail = status.HTTP_404_NOT_FOUND, str(exc)
+    elif isinstance(exc, LibValidationError):
+        status_code, detail = status.HTTP_400_BAD_REQUEST, str(exc)
+    else:
+        logger.exception("Error in bulk request for user at index %d: %s", index, exc)
+        status_code, detail = status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error"
+    return BulkUserResult(index=index, status_code=status_code, detail=detail)
+
+
+_UserWrite = Callable[[], Awaitable[UserModel]]
+
+
+async def _existing_user_dns(udm: UDM, names: Iterable[str]) -> Dict[str, str]:
+    """DNs of the existing users with the names `names`, by lower case name."""
+    dns: Dict[str, str] = {}
+    names = sorted(set(names))
+    for start in range(0, len(names), _BULK_SEARCH_CHUNK_SIZE):
+        chunk = names[start : start + _BULK_SEARCH_CHUNK_SIZE]
+        filter_s = "(|{})".format("".join(f"(uid={escape_filter_chars(name)})" for name in chunk))
+        async for udm_obj in udm.get("users/user").search(filter_s):
+            dns[udm_obj.props.username.lower()] = udm_obj.dn
+    return dns
+
+
+@router.post("/bulk", status_code=status.HTTP_200_OK, response_model=List[BulkUserResult])
+async def bulk_create_or_update(
+    request: Request,
+    users: List[Dict[str, Any]] = Body(..., min_items=1, max_items=BULK_MAX_USERS),
+    logger: logging.Logger = Depends(get_logger),
+    udm: UDM = Depends(udm_ctx),
+    authenticated_user: LdapUser = Depends(get_kelvin_admin),
+) -> List[BulkUserResult]:
+    """
+    Create or update up to 1000 school users in one request:
+
+    - the body is a list of users, each in the format of **POST /users/**
+    - a user whose **name** exists is updated like with **PUT /users/{username}**,
+        the other users are created
+
+    The response has one result per user, in the order of the request, with the
+    **status_code** and the **user** or error **detail** that the single request
+    would have returned. A failing user does not affect the others.
+
+    The users are written to UDM concurrently, so a user cannot refer to another
+    user of the same request, e.g. as legal guardian.
+    """
+    results: List[Optional[BulkUserResult]] = [None] * len(users)
+    request_users: Dict[int, UserCreateModel] = {}
+    for index, data in enumerate(users):
+        try:
+            request_users[index] = UserCreateModel.parse_obj(data)
+        except ValidationError as exc:
+            results[index] = _bulk_error(index, exc, logger)
+    # one search for all users instead of one per user
+    existing = await _existing_user_dns(udm, (u.name for u in request_users.values() if u.name))
+
+    async def create_user(user: ImportUser, request_user: UserCreateModel) -> UserModel:
+        await _create_prepared_user(user, request_user, logger, udm)
+        return await UserModel.from_lib_model(user, request, udm)
+
+    # Users to create are prepared one after the other, as their names are
+    # allocated from the same counters. Only the writes run concurrently.
+    writes: List[Tuple[int, int, _UserWrite]] = []
+    seen: Set[str] = set()
+    for index, request_user in request_users.items():
+        name = (request_user.name or "").lower()
+        try:
+            if name in seen:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"User {request_user.name!r} is part of the request more than once.",
+                )
+            if name:
+                seen.add(name)
+            if name in existing:
+                replace = partial(
+                    _replace_user, existing[name], request_user, users[index], request, logger, udm
+                )
+                writes.append((index, status.HTTP_200_OK, replace))
+            else:
+                user = await _prepare_new_user(
+                    request, request_user, logger, udm, exists=False if name else None
+                )
+                writes.append((index, status.HTTP_201_CREATED, partial(create_user, user, request_user)))
+        except Exception as exc:
+            results[index] = _bulk_error(index, exc, logger)
+
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+    async def write(index: int, status_code: int, write_user: _UserWrite) -> None:
+        async with semaphore:
+            try:
+                user = await write_user()
+            except Exception as exc:
+                results[index] = _bulk_error(index, exc, logger)
+            else:
+                results[index] = BulkUserResult(index=index, status_code=status_code, user=user)
+
+    await asyncio.gather(*(write(*args) for args in writes))
+    return results
+
+
 @router.delete("/{username}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete(
     username: str,
@@ -1413,13 +1580,13 @@ async def delete(
 
 async def set_password_hashes(dn: str, kelvin_password_hashes: PasswordsHashes) -> None:
     logger: logging.Logger = get_logger()
-    uldap = uldap_admin_write_primary()
     pw_hashes = kelvin_password_hashes.dict_with_ldap_attr_names()
     pw_hashes["krb5Key"] = kelvin_password_hashes.krb_5_key_as_bytes
     for key, value in pw_hashes.items():
         pw_hashes[key] = value if isinstance(value, list) else [value]
     try:
-        uldap.modify(dn, pw_hashes)
+        # connecting and writing block, so both run in the LDAP thread pool
+        await run_in_ldap_executor(lambda: uldap_admin_write_primary().modify(dn, pw_hashes))
         logger.info("Successfully set password hashes of %r.", dn)
     except (UModifyError, UNoObject) as exc:
         logger.error("Error modifiying password hashes of %r: %s", dn, exc)
@@ -75,12 +75,13 @@ class WorkGroupCreateModel(UcsSchoolBaseModel):
         ]
         return kwargs
 
-    def _as_lib_model_kwargs(self, request: Request) -> Dict[str, Any]:
-        kwargs = super()._as_lib_model_kwargs(request)
+    async def _as_lib_model_kwargs(self, request: Request) -> Dict[str, Any]:
+        kwargs = await super()._as_lib_model_kwargs(request)
         school_name = url_to_name(request, "school", self.unscheme_and_unquote(kwargs["school"]))
         kwargs["name"] = f"{school_name}-{self.name}"
         kwargs["users"] = [
-            url_to_dn(request, "user", self.unscheme_and_unquote(user)) for user in (self.users or [])
+            await url_to_dn(request, "user", self.unscheme_and_unquote(user))
+            for user in (self.users or [])
         ]  # this is expensive :/
         return kwargs
 
@@ -134,7 +135,7 @@ class WorkGroupPatchDocument(BaseModel):
                 del res["users"]
             else:
                 res["users"] = [
-                    url_to_dn(request, "user", UcsSchoolBaseModel.unscheme_and_unquote(user))
+                    await url_to_dn(request, "user", UcsSchoolBaseModel.unscheme_and_unquote(user))
                     for user in (self.users or [])
                 ]  # this is expensive :/
         return res
@@ -233,7 +234,7 @@ async def create(
             "allowed_email_senders_groups": []
         }
     """
-    sc: WorkGroup = workgroup.as_lib_model(request)
+    sc: WorkGroup = await workgroup.as_lib_model(request)
     if await sc.exists(udm):
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="school workgroup exists.")
     else:
@@ -391,7 +392,7 @@ async def complete_update(
         _validate_change("school")
     sc_current = await get_lib_obj(udm, WorkGroup, f"{school}-{workgroup_name}", school)
     changed = False
-    sc_request: WorkGroup = workgroup.as_lib_model(request)
+    sc_request: WorkGroup = await workgroup.as_lib_model(request)
     sc_current.udm_properties = sc_request.udm_properties
     for attr in WorkGroup._attributes.keys():
         current_value = getattr(sc_current, attr)
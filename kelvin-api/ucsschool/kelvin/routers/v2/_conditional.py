@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Entity tags and conditional requests of the v2 routes.
+
+The entity tag of a user or group is built from its ``public_id`` and its
+version in the Kelvin DB, which changes with every change of the object's
+representation. Reading the version is one indexed lookup, so a matching
+``If-None-Match`` is answered with ``304 Not Modified`` without loading the
+object, and ``If-Match`` on ``PATCH`` and ``PUT`` rejects changes based on
+an outdated state with ``412 Precondition Failed``.
+"""
+
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from ucsschool_objects import VersionRow
+
+
+def entity_tag(version: VersionRow) -> str:
+    return f'"{version.public_id.hex}-{version.version}"'
+
+
+def _entity_tags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def not_modified_response(request: Request, version: VersionRow) -> Optional[Response]:
+    """``304 Not Modified`` if ``If-None-Match`` matches the current entity tag, else ``None``."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    tag = entity_tag(version)
+    # If-None-Match uses the weak comparison, which ignores a "W/" prefix
+    if header.strip() == "*" or tag in (
+        candidate.removeprefix("W/") for candidate in _entity_tags(header)
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag})
+    return None
+
+
+def check_if_match(request: Request, version: Optional[VersionRow]) -> None:
+    """Raise ``412 Precondition Failed`` unless ``If-Match`` is absent or matches."""
+    header = request.headers.get("if-match")
+    if header is None:
+        return
+    # If-Match uses the strong comparison, a weak tag never matches
+    if version is not None and (header.strip() == "*" or entity_tag(version) in _entity_tags(header)):
+        return
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="The object was changed or deleted since it was read (If-Match).",
+    )
+
+
+def with_entity_tag(result: Any, response: Response, version: VersionRow) -> Any:
+    """Add the ``ETag`` header to the response of a route returning ``result``."""
+    # a route's Response parameter only applies if it does not return a Response itself
+    target = result if isinstance(result, Response) else response
+    target.headers["ETag"] = entity_tag(version)
+    return result
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from functools import lru_cache
+from typing import Any, Iterable, List, Type, Union
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from ucsschool.lib.models.utils import env_or_ucr
+
+FAST_SERIALIZATION = (env_or_ucr("ucsschool/kelvin/v2/fast_serialization") or "").lower() in (
+    "1",
+    "enabled",
+    "on",
+    "true",
+    "yes",
+)
+
+
+@lru_cache(maxsize=None)
+def _response_fields(model_class: Type[BaseModel]) -> tuple:
+    return tuple((field.name, field.alias) for field in model_class.__fields__.values())
+
+
+def response_dict(model_class: Type[BaseModel], values: dict[str, Any]) -> dict[str, Any]:
+    """``values`` keyed and ordered as FastAPI would serialise ``model_class(**values)``.
+
+    Missing fields get the model's default. The values are used as they are:
+    they must already have their JSON form (URLs as ``str``, dates as ``date``).
+    """
+    fields = model_class.__fields__
+    return {
+        alias: values[name] if name in values else fields[name].get_default()
+        for name, alias in _response_fields(model_class)
+    }
+
+
+def v2_response(
+    model_class: Type[BaseModel], values: dict[str, Any]
+) -> Union[ORJSONResponse, BaseModel]:
+    """Response for one object built by a v2 router, see ``v2_list_response``."""
+    if FAST_SERIALIZATION:
+        return ORJSONResponse(response_dict(model_class, values))
+    return model_class(**values)
+
+
+def v2_list_response(
+    model_class: Type[BaseModel], values: Iterable[dict[str, Any]]
+) -> Union[ORJSONResponse, List[BaseModel]]:
+    """Response for a list of objects built by a v2 router.
+
+    By default the values are turned into ``model_class`` objects, which
+    FastAPI validates again against the route's ``response_model``. The data
+    was produced by the server itself, so with
+    ``ucsschool/kelvin/v2/fast_serialization`` enabled both validations are
+    skipped and the dicts are serialised directly.
+    """
+    if FAST_SERIALIZATION:
+        return ORJSONResponse([response_dict(model_class, value) for value in values])
+    return [model_class(**value) for value in values]
@@ -0,0 +1,304 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Changes feeds of the v2 collections.
+
+Instead of listing a whole collection again, a client that mirrors Kelvin
+data follows the changes made since its last sync: it keeps the
+``next_cursor`` of a page and passes it as ``cursor`` of the next request.
+The first sync starts with a full listing, or with ``modified_since``.
+
+The feeds read the change log the kelvin-connector writes while it applies
+the changes to the Kelvin DB, in the order it applied them. Each page lists
+every changed object once, with its current state, or as deleted with only
+its ``url`` (a tombstone). Entries carry the ``public_id`` of the object,
+which stays the same when the object is renamed: a mirror keys its objects
+by it, an update under a new ``url`` then replaces the object at the old one.
+The role of a deleted group is not known any more, so the tombstones of all
+groups are listed in both the classes and the workgroups feed.
+"""
+
+import datetime
+import logging
+from functools import lru_cache
+from typing import Annotated, Awaitable, Callable, Dict, List, Optional, Type
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request
+from pydantic import BaseModel
+from ucsschool_objects import (
+    ChangeAction,
+    ChangeRow,
+    Filter,
+    KelvinStorageSession,
+    ObjectType,
+    Operator,
+    SearchQuery,
+)
+from ucsschool_objects.core.adapters.sqlalchemy import sqlalchemy_mapper_factory
+
+from ...ldap import LdapUser
+from ...service.dependency import get_storage_session
+from ...token_auth import get_kelvin_reader
+from ...urls import https_url_for
+from ..v1.school_class import SchoolClassModel
+from ..v1.user import UserModel
+from ..v1.workgroup import WorkGroupModel
+from .school_class import SCHOOL_CLASS_LOAD_SPEC_V2, _group_to_school_class_dict, _is_school_class
+from .user import _user_row_to_dict
+from .workgroup import WORKGROUP_LOAD_SPEC_V2, _group_to_workgroup_model, _is_workgroup
+
+router = APIRouter()
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+@lru_cache(maxsize=1)
+def get_logger() -> logging.Logger:
+    return logging.getLogger(__name__)
+
+
+class _ChangeModel(BaseModel):
+    cursor: int
+    action: ChangeAction
+    changed_at: datetime.datetime
+    public_id: UUID
+    url: str
+
+
+class UserChangeModel(_ChangeModel):
+    object: Optional[UserModel] = None
+
+
+class SchoolClassChangeModel(_ChangeModel):
+    object: Optional[SchoolClassModel] = None
+
+
+class WorkGroupChangeModel(_ChangeModel):
+    object: Optional[WorkGroupModel] = None
+
+
+class _ChangesModel(BaseModel):
+    next_cursor: int
+    has_more: bool
+
+
+class UserChangesModel(_ChangesModel):
+    changes: List[UserChangeModel]
+
+
+class SchoolClassChangesModel(_ChangesModel):
+    changes: List[SchoolClassChangeModel]
+
+
+class WorkGroupChangesModel(_ChangesModel):
+    changes: List[WorkGroupChangeModel]
+
+
+class _Page:
+    """One page of the change log, each changed object once, at its last change."""
+
+    def __init__(self, rows: List[ChangeRow], cursor: int, limit: int):
+        self.has_more = len(rows) > limit
+        rows = rows[:limit]
+        self.next_cursor = rows[-1].cursor if rows else cursor
+        self.latest: Dict[UUID, ChangeRow] = {}
+        self._created = set()
+        for row in rows:
+            if row.action == ChangeAction.CREATED:
+                self._created.add(row.public_id)
+            # moved to the end, the objects are listed in the order of their last change
+            self.latest.pop(row.public_id, None)
+            self.latest[row.public_id] = row
+
+    def action(self, row: ChangeRow) -> ChangeAction:
+        if row.action != ChangeAction.DELETED and row.public_id in self._created:
+            return ChangeAction.CREATED
+        return row.action
+
+    @property
+    def changed_ids(self) -> List[UUID]:
+        return [row.public_id for row in self.latest.values() if row.action != ChangeAction.DELETED]
+
+
+def _public_id_query(public_ids: List[UUID]) -> SearchQuery:
+    return SearchQuery(where=Filter(field="public_id", op=Operator.IN, value=public_ids))
+
+
+async def _page(
+    read: Callable[..., Awaitable[List[ChangeRow]]],
+    cursor: Optional[int],
+    modified_since: Optional[datetime.datetime],
+    limit: int,
+) -> _Page:
+    after = cursor or 0
+    rows = await read(after=after, since=modified_since, limit=limit + 1)
+    return _Page(rows, after, limit)
+
+
+def _changes(
+    page: _Page,
+    change_model: Type[_ChangeModel],
+    objects: Dict[UUID, BaseModel],
+    tombstone_url: Callable[[ChangeRow], str],
+) -> List[_ChangeModel]:
+    changes = []
+    for row in page.latest.values():
+        if row.action == ChangeAction.DELETED:
+            obj, url = None, tombstone_url(row)
+        elif row.public_id in objects:
+            obj = objects[row.public_id]
+            url = obj.url
+        else:
+            # deleted or not part of this collection, a later page lists a deletion
+            continue
+        changes.append(
+            change_model(
+                cursor=row.cursor,
+                action=page.action(row),
+                changed_at=row.changed_at,
+                public_id=row.public_id,
+                url=url,
+                object=obj,
+            )
+        )
+    return changes
+
+
+def _relative_name(row: ChangeRow) -> str:
+    return row.name.removeprefix(f"{row.school_name}-")
+
+
+_CURSOR_QUERY = Query(
+    ge=0, description="``next_cursor`` of the previous page. Lists the changes made after it."
+)
+_MODIFIED_SINCE_QUERY = Query(
+    description="Only list changes made at or after this time (ISO 8601), e.g. for the first sync."
+)
+_LIMIT_QUERY = Query(ge=1, le=MAX_LIMIT, description="Number of changes per page.")
+
+
+@router.get("/users", response_model=UserChangesModel)
+async def user_changes(
+    request: Request,
+    logger: Annotated[logging.Logger, Depends(get_logger)],
+    session: Annotated[KelvinStorageSession, Depends(get_storage_session)],
+    _kelvin_reader: Annotated[LdapUser, Depends(get_kelvin_reader)],
+    cursor: Annotated[Optional[int], _CURSOR_QUERY] = None,
+    modified_since: Annotated[Optional[datetime.datetime], _MODIFIED_SINCE_QUERY] = None,
+    limit: Annotated[int, _LIMIT_QUERY] = DEFAULT_LIMIT,
+) -> UserChangesModel:
+    """
+    List the users created, changed or deleted since **cursor** or **modified_since**.
+
+    Pass the returned **next_cursor** as **cursor** to get the next page, also once
+    **has_more** is false, to get the changes made after this request.
+    """
+    page = await _page(session.changes.users, cursor, modified_since, limit)
+    logger.debug("v2 user changes after %r: %d objects", cursor, len(page.latest))
+    objects: Dict[UUID, BaseModel] = {}
+    if page.changed_ids:
+        rows = await session.user_rows.search(_public_id_query(page.changed_ids))
+        mapper = sqlalchemy_mapper_factory(session)
+        dn_map = await mapper.public_ids_to_dns(ObjectType.USER, [row.public_id for row in rows])
+        objects = {
+            row.public_id: UserModel(**_user_row_to_dict(row, request, dn_map[row.public_id]))
+            for row in rows
+        }
+    return UserChangesModel(
+        changes=_changes(
+            page,
+            UserChangeModel,
+            objects,
+            lambda row: https_url_for(request, "get", username=row.name),
+        ),
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+    )
+
+
+@router.get("/classes", response_model=SchoolClassChangesModel)
+async def school_class_changes(
+    request: Request,
+    logger: Annotated[logging.Logger, Depends(get_logger)],
+    session: Annotated[KelvinStorageSession, Depends(get_storage_session)],
+    _kelvin_reader: Annotated[LdapUser, Depends(get_kelvin_reader)],
+    cursor: Annotated[Optional[int], _CURSOR_QUERY] = None,
+    modified_since: Annotated[Optional[datetime.datetime], _MODIFIED_SINCE_QUERY] = None,
+    limit: Annotated[int, _LIMIT_QUERY] = DEFAULT_LIMIT,
+) -> SchoolClassChangesModel:
+    """
+    List the school classes created, changed or deleted since **cursor** or **modified_since**.
+
+    Pass the returned **next_cursor** as **cursor** to get the next page, also once
+    **has_more** is false, to get the changes made after this request.
+    """
+    page = await _page(session.changes.groups, cursor, modified_since, limit)
+    logger.debug("v2 school_class changes after %r: %d objects", cursor, len(page.latest))
+    objects: Dict[UUID, BaseModel] = {}
+    if page.changed_ids:
+        groups = await session.groups.search(
+            _public_id_query(page.changed_ids), load=SCHOOL_CLASS_LOAD_SPEC_V2
+        )
+        objects = {
+            group.public_id: SchoolClassModel(
+                **await _group_to_school_class_dict(group, request, session)
+            )
+            for group in groups
+            if _is_school_class(group)
+        }
+    return SchoolClassChangesModel(
+        changes=_changes(
+            page,
+            SchoolClassChangeModel,
+            objects,
+            lambda row: https_url_for(
+                request, "get", class_name=_relative_name(row), school=row.school_name
+            ),
+        ),
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+    )
+
+
+@router.get("/workgroups", response_model=WorkGroupChangesModel)
+async def workgroup_changes(
+    request: Request,
+    logger: Annotated[logging.Logger, Depends(get_logger)],
+    session: Annotated[KelvinStorageSession, Depends(get_storage_session)],
+    _kelvin_reader: Annotated[LdapUser, Depends(get_kelvin_reader)],
+    cursor: Annotated[Optional[int], _CURSOR_QUERY] = None,
+    modified_since: Annotated[Optional[datetime.datetime], _MODIFIED_SINCE_QUERY] = None,
+    limit: Annotated[int, _LIMIT_QUERY] = DEFAULT_LIMIT,
+) -> WorkGroupChangesModel:
+    """
+    List the workgroups created, changed or deleted since **cursor** or **modified_since**.
+
+    Pass the returned **next_cursor** as **cursor** to get the next page, also once
+    **has_more** is false, to get the changes made after this request.
+    """
+    page = await _page(session.changes.groups, cursor, modified_since, limit)
+    logger.debug("v2 workgroup changes after %r: %d objects", cursor, len(page.latest))
+    objects: Dict[UUID, BaseModel] = {}
+    if page.changed_ids:
+        groups = await session.groups.search(
+            _public_id_query(page.changed_ids), load=WORKGROUP_LOAD_SPEC_V2
+        )
+        objects = {
+            group.public_id: await _group_to_workgroup_model(group, request, session)
+            for group in groups
+            if _is_workgroup(group)
+        }
+    return WorkGroupChangesModel(
+        changes=_changes(
+            page,
+            WorkGroupChangeModel,
+            objects,
+            lambda row: https_url_for(
+                request, "get", workgroup_name=_relative_name(row), school=row.school_name
+            ),
+        ),
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+    )
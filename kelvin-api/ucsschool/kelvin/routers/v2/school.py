@@ -21,7 +21,7 @@ from ucsschool_objects.core.domain.ports.dn_mapper import ObjectType
 from ...ldap import LdapUser
 from ...service.dependency import get_storage_session
 from ...token_auth import get_kelvin_reader
-from ...urls import cached_url_for
+from ...urls import https_url_for
 from ..v1.school import (
     SchoolModel,
     school_create,
@@ -56,9 +56,7 @@ async def _school_to_model(
         else [],
         class_share_file_server=school.class_share_file_server,
         home_share_file_server=school.home_share_file_server,
-        url=SchoolModel.scheme_and_quote(
-            str(cached_url_for(request, "school_get", school_name=school.name))
-        ),
+        url=https_url_for(request, "school_get", school_name=school.name),
         dn=dn,
         ucsschool_roles=[f"school:school:{school.name}"],
         udm_properties=mapped_udm_properties(school.udm_properties, "school"),
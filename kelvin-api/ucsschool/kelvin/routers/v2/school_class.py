@@ -3,9 +3,9 @@
 
 import logging
 from functools import lru_cache
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from ucsschool_objects import (
     And,
     Filter,
@@ -23,7 +23,7 @@ from ucsschool_objects.core.domain.ports.dn_mapper import ObjectType
 from ...ldap import LdapUser
 from ...service.dependency import get_storage_session
 from ...token_auth import get_kelvin_reader
-from ...urls import cached_url_for
+from ...urls import https_url_for
 from ..v1.school_class import (
     SchoolClassModel,
     complete_update,
@@ -33,7 +33,9 @@ from ..v1.school_class import (
     partial_update,
     search as v1_search,
 )
+from ._conditional import check_if_match, not_modified_response, with_entity_tag
 from ._filters import str_filter as _str_filter
+from ._serialize import v2_list_response, v2_response
 from .udm_properties import mapped_udm_properties
 
 router = APIRouter()
@@ -68,9 +70,9 @@ def _is_school_class(group: Group) -> bool:
     return _SCHOOL_CLASS_ROLE in {role.name for role in group.roles}
 
 
-async def _group_to_school_class_model(
+async def _group_to_school_class_dict(
     group: Group, request: Request, session: KelvinStorageSession
-) -> SchoolClassModel:
+) -> dict[str, Any]:
     mapper = sqlalchemy_mapper_factory(session)
     dn_map = await mapper.public_ids_to_dns(ObjectType.GROUP, [group.public_id])
     dn = dn_map.get(group.public_id, "")
@@ -78,25 +80,18 @@ async def _group_to_school_class_model(
     relative_name = _get_relative_name(group)
     school_name = group.school.name
 
-    users = sorted(
-        SchoolClassModel.scheme_and_quote(str(cached_url_for(request, "get", username=user.name)))
-        for user in group.members
-    )
+    users = sorted(https_url_for(request, "get", username=user.name) for user in group.members)
 
     ucsschool_roles = sorted(f"{role.name}:school:{school_name}" for role in group.roles)
 
-    return SchoolClassModel(
+    return dict(
         name=relative_name,
-        school=SchoolClassModel.scheme_and_quote(
-            str(cached_url_for(request, "school_get", school_name=school_name))
-        ),
+        school=https_url_for(request, "school_get", school_name=school_name),
         description=group.description,
         users=users,
         create_share=group.create_share,
         ucsschool_roles=ucsschool_roles,
-        url=SchoolClassModel.scheme_and_quote(
-            str(cached_url_for(request, "get", class_name=relative_name, school=school_name))
-        ),
+        url=https_url_for(request, "get", class_name=relative_name, school=school_name),
         dn=dn,
         udm_properties=mapped_udm_properties(group.udm_properties, "school_class"),
     )
@@ -142,34 +137,70 @@ async def search(
         if _is_school_class(g)
     ]
     groups.sort(key=lambda g: g.name)
-    return [await _group_to_school_class_model(g, request, session) for g in groups]
+    return v2_list_response(
+        SchoolClassModel, [await _group_to_school_class_dict(g, request, session) for g in groups]
+    )
+
+
+def _name_query(school: str, class_name: str) -> SearchQuery:
+    return SearchQuery(
+        where=And(
+            clauses=(
+                Filter(field="name", op=Operator.MATCHES_CI, value=f"{school}-{class_name}"),
+                Filter(field="roles.name", op=Operator.EQ, value=_SCHOOL_CLASS_ROLE),
+            )
+        )
+    )
+
+
+def _not_found(class_name: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"No object with name={class_name!r} found or not authorized.",
+    )
+
+
+async def check_school_class_if_match(
+    request: Request,
+    class_name: Annotated[str, Path()],
+    school: Annotated[str, Path()],
+    session: Annotated[KelvinStorageSession, Depends(get_storage_session)],
+) -> None:
+    if "if-match" in request.headers:
+        versions = await session.versions.groups(_name_query(school, class_name))
+        check_if_match(request, versions[0] if versions else None)
 
 
 @router.get("/{school}/{class_name}", response_model=SchoolClassModel)
 async def get(
     request: Request,
+    response: Response,
     class_name: Annotated[str, Path(description="Name of the school class to fetch.")],
     school: Annotated[str, Path(description="Name of the school (OU).")],
     logger: Annotated[logging.Logger, Depends(get_logger)],
     session: Annotated[KelvinStorageSession, Depends(get_storage_session)],
     _kelvin_reader: Annotated[LdapUser, Depends(get_kelvin_reader)],
 ) -> SchoolClassModel:
-    full_name = f"{school}-{class_name}"
+    # read before the group, see the v2 user get
+    versions = await session.versions.groups(_name_query(school, class_name))
+    if not versions:
+        raise _not_found(class_name)
+    if (not_modified := not_modified_response(request, versions[0])) is not None:
+        return not_modified
     results = [
         g
         for g in await session.groups.search(
-            SearchQuery(where=Filter(field="name", op=Operator.MATCHES_CI, value=full_name)),
-            load=SCHOOL_CLASS_LOAD_SPEC_V2,
+            _name_query(school, class_name), load=SCHOOL_CLASS_LOAD_SPEC_V2
         )
         if _is_school_class(g)
     ]
     if not results:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No object with name={class_name!r} found or not authorized.",
-        )
+        raise _not_found(class_name)
     logger.debug("v2 school_class get: %r in school %r", class_name, school)
-    return await _group_to_school_class_model(results[0], request, session)
+    result = v2_response(
+        SchoolClassModel, await _group_to_school_class_dict(results[0], request, session)
+    )
+    return with_entity_tag(result, response, versions[0])
 
 
 router.add_api_route(
@@ -185,6 +216,7 @@ router.add_api_route(
     methods=["PATCH"],
     status_code=status.HTTP_200_OK,
     response_model=SchoolClassModel,
+    dependencies=[Depends(check_school_class_if_match)],
 )
 router.add_api_route(
     "/{school}/{class_name}",
@@ -192,6 +224,7 @@ router.add_api_route(
     methods=["PUT"],
     status_code=status.HTTP_200_OK,
     response_model=SchoolClassModel,
+    dependencies=[Depends(check_school_class_if_match)],
 )
 router.add_api_route(
     "/{school}/{class_name}",
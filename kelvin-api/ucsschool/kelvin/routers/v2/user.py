@@ -4,10 +4,10 @@
 import datetime
 import logging
 from functools import lru_cache
-from typing import List, Optional
+from typing import Any, Collection, Iterable, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from ucsschool_objects import (
     And,
     Filter,
@@ -19,6 +19,7 @@ from ucsschool_objects import (
     QueryExpr,
     SearchQuery,
     User,
+    UserRow,
     make_wildcard_filter,
 )
 from ucsschool_objects.core.adapters.sqlalchemy import (
@@ -29,7 +30,7 @@ from ...config import UDM_MAPPING_CONFIG
 from ...ldap import LdapUser
 from ...service.dependency import get_storage_session
 from ...token_auth import get_kelvin_reader
-from ...urls import cached_url_for
+from ...urls import https_url_for
 from ..v1.role import SchoolUserRole
 from ..v1.user import (
     UserModel,
@@ -40,7 +41,9 @@ from ..v1.user import (
     partial_update,
     search as v1_search,
 )
+from ._conditional import check_if_match, not_modified_response, with_entity_tag
 from ._filters import str_filter as _str_filter
+from ._serialize import v2_list_response, v2_response
 from .udm_properties import mapped_udm_properties
 
 router = APIRouter()
@@ -163,24 +166,24 @@ def _build_query(
     return SearchQuery(where=And(clauses=tuple(clauses)))
 
 
-def _school_classes_and_workgroups(
-    user: User,
+def _group_names_by_role(
+    groups: Iterable[tuple[str, str, Collection[str]]],
 ) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Sort ``(group name, school name, role names)`` into classes and workgroups per school."""
     # Only schools that actually have a class/workgroup get an entry, matching
     # v1 — do not pre-seed every membership's school with an empty list.
     school_classes: dict[str, list[str]] = {}
     workgroups: dict[str, list[str]] = {}
 
-    for group in user.groups:
-        role_names = [role.name for role in group.roles]
-        relative_name = group.name.removeprefix(f"{group.school.name}-")
+    for group_name, school_name, role_names in groups:
+        relative_name = group_name.removeprefix(f"{school_name}-")
         if "school_class" in role_names:
-            school_classes.setdefault(group.school.name, []).append(relative_name)
+            school_classes.setdefault(school_name, []).append(relative_name)
         if "workgroup" in role_names:
-            workgroups.setdefault(group.school.name, []).append(relative_name)
+            workgroups.setdefault(school_name, []).append(relative_name)
 
-    # user.groups is a set, so the per-school lists are built in arbitrary
-    # order; sort them for deterministic, v1-equivalent output.
+    # The groups may come in arbitrary order (user.groups is a set); sort
+    # the per-school lists for deterministic, v1-equivalent output.
     for names in school_classes.values():
         names.sort()
     for names in workgroups.values():
@@ -189,14 +192,32 @@ def _school_classes_and_workgroups(
     return school_classes, workgroups
 
 
-async def _user_to_model(
+def _school_classes_and_workgroups(
+    user: User,
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    return _group_names_by_role(
+        (group.name, group.school.name, [role.name for role in group.roles]) for group in user.groups
+    )
+
+
+def _school_user_roles(role_names: Iterable[str]) -> list[SchoolUserRole]:
+    roles: set[SchoolUserRole] = set()
+    for role_name in role_names:
+        try:
+            roles.add(SchoolUserRole(role_name))
+        except ValueError:
+            logger.error(f"Unknown role name: {role_name=}. Omitting role.")
+    return sorted(roles)
+
+
+async def _user_to_dict(
     user: User,
     request: Request,
     session: KelvinStorageSession,
     dn_map: dict[UUID, str] | None = None,
-) -> UserModel:
+) -> dict[str, Any]:
     def url(name: str, **kwargs) -> str:
-        return UserModel.scheme_and_quote(str(cached_url_for(request, name, **kwargs)))
+        return https_url_for(request, name, **kwargs)
 
     if dn_map is None:
         mapper = sqlalchemy_mapper_factory(session)
@@ -213,24 +234,18 @@ async def _user_to_model(
         for role in membership.roles:
             ucsschool_roles.append(f"{role.name}:school:{membership.school.name}")
 
-    roles: set[SchoolUserRole] = set()
-
-    for role in user.roles:
-        try:
-            roles.add(SchoolUserRole(role.name))
-        except ValueError:
-            logger.error(f"Unknown role name: {role.name=}. Omitting role.")
-
     school_classes, workgroups = _school_classes_and_workgroups(user)
 
-    role_urls = [url("get", role_name=role.value) for role in sorted(roles)]
+    role_urls = [
+        url("get", role_name=role.value) for role in _school_user_roles(role.name for role in user.roles)
+    ]
 
     legal_guardian_urls = [url("get", username=guardian.name) for guardian in user.legal_guardians]
     legal_ward_urls = [url("get", username=ward.name) for ward in user.legal_wards]
 
     school = url("school_get", school_name=user.primary_school.name)
 
-    return UserModel(
+    return dict(
         school=school,
         dn=dn,
         name=user.name,
@@ -254,6 +269,48 @@ async def _user_to_model(
     )
 
 
+def _user_row_to_dict(row: UserRow, request: Request, dn: str) -> dict[str, Any]:
+    """Response values for a projection row; same output as ``_user_to_dict``."""
+
+    def url(name: str, **kwargs) -> str:
+        return https_url_for(request, name, **kwargs)
+
+    school_classes, workgroups = _group_names_by_role(
+        (group.name, group.school_name, group.role_names) for group in row.groups
+    )
+    role_names = {name for membership in row.school_memberships for name in membership.role_names}
+
+    return dict(
+        school=url("school_get", school_name=row.primary_school_name),
+        dn=dn,
+        name=row.name,
+        firstname=row.firstname,
+        lastname=row.lastname,
+        birthday=row.birthday,
+        disabled=not row.active,
+        email=row.email,
+        expiration_date=row.expiration_date,
+        record_uid=row.record_uid,
+        source_uid=row.source_uid,
+        url=url("get", username=row.name),
+        schools=sorted(
+            url("school_get", school_name=membership.school_name)
+            for membership in row.school_memberships
+        ),
+        roles=[url("get", role_name=role.value) for role in _school_user_roles(role_names)],
+        school_classes=school_classes,
+        workgroups=workgroups,
+        ucsschool_roles=[
+            f"{role_name}:school:{membership.school_name}"
+            for membership in row.school_memberships
+            for role_name in membership.role_names
+        ],
+        legal_guardians=[url("get", username=name) for name in row.legal_guardian_names],
+        legal_wards=[url("get", username=name) for name in row.legal_ward_names],
+        udm_properties=mapped_udm_properties(row.udm_properties, "user"),
+    )
+
+
 @router.get("/", response_model=List[UserModel])
 async def search(
     request: Request,
@@ -292,33 +349,59 @@ async def search(
         extra_clauses=_udm_property_filters(request),
     )
     logger.debug("v2 user search query: %r", query)
-    users = list(await session.users.search(query, load=USER_LOAD_SPEC_V2))
-    users.sort(key=lambda u: u.name)
+    # Lists use the read-only row projection: no ORM instances or domain
+    # objects are built for what is only serialised into the response.
+    rows = await session.user_rows.search(query)
+    rows.sort(key=lambda row: row.name)
     mapper = sqlalchemy_mapper_factory(session)
-    dn_map = await mapper.public_ids_to_dns(ObjectType.USER, [user.public_id for user in users])
-    return [await _user_to_model(u, request, session, dn_map=dn_map) for u in users]
+    dn_map = await mapper.public_ids_to_dns(ObjectType.USER, [row.public_id for row in rows])
+    return v2_list_response(
+        UserModel, (_user_row_to_dict(row, request, dn_map[row.public_id]) for row in rows)
+    )
+
+
+def _name_query(username: str) -> SearchQuery:
+    return SearchQuery(where=Filter(field="name", op=Operator.EQ, value=username))
+
+
+def _not_found(username: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"No object with name={username!r} found or not authorized.",
+    )
+
+
+async def check_user_if_match(
+    request: Request,
+    username: str = Path(...),
+    session: KelvinStorageSession = Depends(get_storage_session),
+) -> None:
+    if "if-match" in request.headers:
+        versions = await session.versions.users(_name_query(username))
+        check_if_match(request, versions[0] if versions else None)
 
 
 @router.get("/{username}", response_model=UserModel)
 async def get(
     request: Request,
+    response: Response,
     username: str = Path(..., description="Name of the school user to fetch."),
     logger: logging.Logger = Depends(get_logger),
     session: KelvinStorageSession = Depends(get_storage_session),
     kelvin_reader: LdapUser = Depends(get_kelvin_reader),
 ) -> UserModel:
-    results = list(
-        await session.users.search(
-            SearchQuery(where=Filter(field="name", op=Operator.EQ, value=username)),
-            load=USER_LOAD_SPEC_V2,
-        )
-    )
+    # The version is read before the user: if the user changes in between,
+    # the response carries the older tag and the next request fetches it again.
+    versions = await session.versions.users(_name_query(username))
+    if not versions:
+        raise _not_found(username)
+    if (not_modified := not_modified_response(request, versions[0])) is not None:
+        return not_modified
+    results = list(await session.users.search(_name_query(username), load=USER_LOAD_SPEC_V2))
     if not results:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No object with name={username!r} found or not authorized.",
-        )
-    return await _user_to_model(results[0], request, session, dn_map=None)
+        raise _not_found(username)
+    result = v2_response(UserModel, await _user_to_dict(results[0], request, session, dn_map=None))
+    return with_entity_tag(result, response, versions[0])
 
 
 router.add_api_route(
@@ -334,6 +417,7 @@ router.add_api_route(
     methods=["PATCH"],
     status_code=status.HTTP_200_OK,
     response_model=UserModel,
+    dependencies=[Depends(check_user_if_match)],
 )
 router.add_api_route(
     "/{username}",
@@ -341,6 +425,7 @@ router.add_api_route(
     methods=["PUT"],
     status_code=status.HTTP_200_OK,
     response_model=UserModel,
+    dependencies=[Depends(check_user_if_match)],
 )
 router.add_api_route(
     "/{username}",
@@ -5,7 +5,7 @@ import logging
 from functools import lru_cache
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
 from ucsschool_objects import (
     And,
     Filter,
@@ -23,7 +23,7 @@ from ucsschool_objects.core.domain.ports.dn_mapper import ObjectType
 from ...ldap import LdapUser
 from ...service.dependency import get_storage_session
 from ...token_auth import get_kelvin_reader
-from ...urls import cached_url_for
+from ...urls import https_url_for
 from ..v1.workgroup import (
     WorkGroupModel,
     complete_update,
@@ -33,6 +33,7 @@ from ..v1.workgroup import (
     partial_update,
     search as v1_search,
 )
+from ._conditional import check_if_match, not_modified_response, with_entity_tag
 from ._filters import str_filter as _str_filter
 from .udm_properties import mapped_udm_properties
 
@@ -93,18 +94,13 @@ async def _group_to_workgroup_model(
     relative_name = _get_relative_name(group)
     school_name = group.school.name
 
-    users = sorted(
-        WorkGroupModel.scheme_and_quote(str(cached_url_for(request, "get", username=user.name)))
-        for user in group.members
-    )
+    users = sorted(https_url_for(request, "get", username=user.name) for user in group.members)
 
     ucsschool_roles = sorted(f"{role.name}:school:{school_name}" for role in group.roles)
 
     return WorkGroupModel(
         name=relative_name,
-        school=WorkGroupModel.scheme_and_quote(
-            str(cached_url_for(request, "school_get", school_name=school_name))
-        ),
+        school=https_url_for(request, "school_get", school_name=school_name),
         description=group.description,
         users=users,
         create_share=group.create_share,
@@ -112,9 +108,7 @@ async def _group_to_workgroup_model(
         allowed_email_senders_users=allowed_email_senders_users,
         allowed_email_senders_groups=allowed_email_senders_groups,
         ucsschool_roles=ucsschool_roles,
-        url=WorkGroupModel.scheme_and_quote(
-            str(cached_url_for(request, "get", workgroup_name=relative_name, school=school_name))
-        ),
+        url=https_url_for(request, "get", workgroup_name=relative_name, school=school_name),
         dn=dn,
         udm_properties=mapped_udm_properties(group.udm_properties, "workgroup"),
     )
@@ -161,31 +155,63 @@ async def search(
     return [await _group_to_workgroup_model(g, request, session) for g in groups]
 
 
+def _name_query(school: str, workgroup_name: str) -> SearchQuery:
+    return SearchQuery(
+        where=And(
+            clauses=(
+                Filter(field="name", op=Operator.MATCHES_CI, value=f"{school}-{workgroup_name}"),
+                Filter(field="roles.name", op=Operator.EQ, value=_WORKGROUP_ROLE),
+            )
+        )
+    )
+
+
+def _not_found(workgroup_name: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"No object with name={workgroup_name!r} found or not authorized.",
+    )
+
+
+async def check_workgroup_if_match(
+    request: Request,
+    workgroup_name: Annotated[str, Path()],
+    school: Annotated[str, Path()],
+    session: Annotated[KelvinStorageSession, Depends(get_storage_session)],
+) -> None:
+    if "if-match" in request.headers:
+        versions = await session.versions.groups(_name_query(school, workgroup_name))
+        check_if_match(request, versions[0] if versions else None)
+
+
 @router.get("/{school}/{workgroup_name}", response_model=WorkGroupModel)
 async def get(
     request: Request,
+    response: Response,
     workgroup_name: Annotated[str, Path(description="Name of the workgroup to fetch.")],
     school: Annotated[str, Path(description="Name of the school (OU).")],
     logger: Annotated[logging.Logger, Depends(get_logger)],
     session: Annotated[KelvinStorageSession, Depends(get_storage_session)],
     _kelvin_reader: Annotated[LdapUser, Depends(get_kelvin_reader)],
 ) -> WorkGroupModel:
-    full_name = f"{school}-{workgroup_name}"
+    # read before the group, see the v2 user get
+    versions = await session.versions.groups(_name_query(school, workgroup_name))
+    if not versions:
+        raise _not_found(workgroup_name)
+    if (not_modified := not_modified_response(request, versions[0])) is not None:
+        return not_modified
     results = [
         g
         for g in await session.groups.search(
-            SearchQuery(where=Filter(field="name", op=Operator.MATCHES_CI, value=full_name)),
-            load=WORKGROUP_LOAD_SPEC_V2,
+            _name_query(school, workgroup_name), load=WORKGROUP_LOAD_SPEC_V2
         )
         if _is_workgroup(g)
     ]
     if not results:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No object with name={workgroup_name!r} found or not authorized.",
-        )
+        raise _not_found(workgroup_name)
     logger.debug("v2 workgroup get: %r in school %r", workgroup_name, school)
-    return await _group_to_workgroup_model(results[0], request, session)
+    result = await _group_to_workgroup_model(results[0], request, session)
+    return with_entity_tag(result, response, versions[0])
 
 
 router.add_api_route(
@@ -201,6 +227,7 @@ router.add_api_route(
     methods=["PATCH"],
     status_code=status.HTTP_200_OK,
     response_model=WorkGroupModel,
+    dependencies=[Depends(check_workgroup_if_match)],
 )
 router.add_api_route(
     "/{school}/{workgroup_name}",
@@ -208,6 +235,7 @@ router.add_api_route(
     methods=["PUT"],
     status_code=status.HTTP_200_OK,
     response_model=WorkGroupModel,
+    dependencies=[Depends(check_workgroup_if_match)],
 )
 router.add_api_route(
     "/{school}/{workgroup_name}",
@@ -17,23 +17,25 @@ from ucsschool.lib.models.base import NoObject
 from udm_rest_client import UdmError
 
 
-async def udm_exception_handler(
-    request: Request, exc: UdmError, logger: logging.Logger
-) -> ORJSONResponse:
-    """Format unhandled UDM exceptions and return in a standard JSON format."""
-
+def udm_error_details(exc: UdmError) -> List[Dict[str, Any]]:
+    """``detail`` of the response to a UDM exception, in the format of validation errors."""
     error_type = f"UdmError:{exc.__class__.__name__}"
-    errors: List[Dict[str, Any]]
     if exc.error is not None:
-        errors = [
+        return [
             {"loc": (location,), "msg": message, "type": error_type}
             for (location, message) in exc.error.items()
         ]
-    elif exc.reason is not None:
-        errors = [{"loc": (), "msg": exc.reason, "type": error_type}]
-    else:
-        errors = [{"loc": (), "msg": str(exc), "type": error_type}]
+    if exc.reason is not None:
+        return [{"loc": (), "msg": exc.reason, "type": error_type}]
+    return [{"loc": (), "msg": str(exc), "type": error_type}]
+
+
+async def udm_exception_handler(
+    request: Request, exc: UdmError, logger: logging.Logger
+) -> ORJSONResponse:
+    """Format unhandled UDM exceptions and return in a standard JSON format."""
 
+    errors = udm_error_details(exc)
     status_code = exc.status or 500
 
     logger.error(f"Encountered exception {exc} responding with {errors}")
@@ -6,15 +6,14 @@ from contextlib import asynccontextmanager
 from typing import AsyncIterator, Callable
 
 from fastapi import FastAPI
-from ucsschool_objects.core.adapters.sqlalchemy import (
-    DatabaseSettings,
-    build_engine,
-    build_kelvin_storage_session_factory,
-)
+from ucsschool_objects.core.adapters.sqlalchemy import build_engine, build_kelvin_storage_session_factory
+
+from ucsschool.importer.utils.ldap_connection import reset_connections
 
 from ..config import UDM_MAPPING_CONFIG, load_configurations
-from ..database import get_database_url
+from ..database import get_database_settings
 from ..import_config import get_import_config
+from ..ldap import shutdown_ldap_executor, use_ldap_executor_in_lib
 from .log import setup_logging
 
 
@@ -23,6 +22,20 @@ def load_configs(logger: logging.Logger) -> None:
     logger.info("UDM mapping configuration: %s", UDM_MAPPING_CONFIG)
 
 
+def warm_up() -> None:
+    """
+    Load the configurations and initialize the import framework in the
+    gunicorn master process, see ``ucsschool.kelvin.gunicorn_conf``.
+
+    Logging is not set up yet, each worker does that in its lifespan. The
+    LDAP connections opened by the configuration checks are dropped, so the
+    workers do not share them.
+    """
+    load_configurations()
+    get_import_config()
+    reset_connections()
+
+
 def log_version(app: FastAPI, logger: logging.Logger) -> None:
     logger.info("Started %s version %s.", app.title, app.version)
 
@@ -34,10 +47,12 @@ def build_app_lifespan(logger: logging.Logger) -> Callable[[FastAPI], AsyncItera
         load_configs(logger)
         get_import_config()
         log_version(app, logger)
-        settings = DatabaseSettings(url=get_database_url())
-        engine = build_engine(settings)
+        engine = build_engine(get_database_settings())
+        app.state.db_engine = engine
         app.state.storage_session_factory = build_kelvin_storage_session_factory(engine)
+        use_ldap_executor_in_lib()
         yield
         await engine.dispose()
+        shutdown_ldap_executor()
 
     return lifespan
@@ -2,49 +2,71 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 import logging
-from typing import Any, Dict
+import time
 
 from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi import FastAPI
-from starlette.routing import Match, Mount, Route
-from timing_asgi import TimingClient, TimingMiddleware
-from timing_asgi.integrations import StarletteScopeToName
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ucsschool_objects.core.adapters.sqlalchemy import pool_status
 
+from ..metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS, observe_db_pool
 
-class PrintTimings(TimingClient):
-    def __init__(self, logger: logging.Logger):
-        self._logger = logger
+UNMATCHED_ROUTE = "unmatched"
 
-    def timing(self, metric_name: str, timing: float, tags: Dict[str, Any]) -> None:
-        log = self._logger.debug if metric_name.endswith(".health") else self._logger.warning
-        log(f"{metric_name} - {timing:.3f} s - {tags}")
 
-
-class StarletteScopeToNamePatched(StarletteScopeToName):
+class MetricsMiddleware:
     """
-    timing-asgi throws an error for Mounts
-
-    This is hopefully just a temporary fix:
-    https://github.com/steinnes/timing-asgi/issues/27
+    Record the latency of HTTP requests by method, route template and status,
+    the requests in progress, and the state of the database connection pool.
     """
 
-    def __call__(self, scope: Dict[str, Any]) -> str:
-        route = None
-        for r in self.starlette_app.router.routes:
-            if r.matches(scope)[0] == Match.FULL:
-                route = r
-                break
-        if isinstance(route, Route):
-            return f"{self.prefix}.{route.endpoint.__module__}.{route.name}"
-        if isinstance(route, Mount):
-            return f"{self.prefix}.__mount__.{route.name}"
-        return self.fallback(scope)
+    def __init__(self, app: ASGIApp, fastapi_app: FastAPI, logger: logging.Logger) -> None:
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.logger = logger
+
+    def route_template(self, scope: Scope) -> str:
+        """Path of the matching route, e.g. ``/ucsschool/kelvin/v2/users/{username}``."""
+        partial = None
+        for route in self.fastapi_app.router.routes:
+            match, _child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path  # e.g. wrong HTTP method
+        return partial or UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.route_template(scope)
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(method, route, status).observe(duration)
+            engine = getattr(self.fastapi_app.state, "db_engine", None)
+            if engine is not None and (status_of_pool := pool_status(engine)) is not None:
+                observe_db_pool(status_of_pool)
+            self.logger.debug("%s %s - %.3f s - %s", method, route, duration, status)
 
 
 def add_middlewares(app: FastAPI, logger: logging.Logger) -> None:
     app.add_middleware(CorrelationIdMiddleware)
-    app.add_middleware(
-        TimingMiddleware,
-        client=PrintTimings(logger),
-        metric_namer=StarletteScopeToNamePatched(prefix="kelvin_app", starlette_app=app),
-    )
+    app.add_middleware(MetricsMiddleware, fastapi_app=app, logger=logger)
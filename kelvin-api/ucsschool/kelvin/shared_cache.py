@@ -0,0 +1,226 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""aiocache backend shared by all worker processes of one node.
+
+aiocache's ``SimpleMemoryCache`` lives in a single process: every gunicorn
+worker fills its own copy and a ``delete()`` in one worker leaves stale
+entries in the others. ``SQLiteCache`` keeps the entries in an SQLite file on
+the local file system instead, so a value is computed once per node and a
+deletion is seen by all workers. Entries expire by timestamp, expired rows are
+ignored on read and removed on the next write.
+Connections run in autocommit mode; statements that belong together are
+wrapped in ``BEGIN IMMEDIATE`` transactions.
+
+The SQLite calls are short, but they may wait for a lock held by another
+process, so they are run in a worker thread instead of on the event loop.
+
+Only the school OU cache uses this backend. The class level caches of the
+ucs-school-lib models (``UCSSchoolModel._cache``, ``get_search_base()``) are
+bounded, but still kept and invalidated in each worker process on its own.
+"""
+
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from aiocache import Cache, cached
+from aiocache.base import BaseCache
+from aiocache.serializers import JsonSerializer
+
+from ucsschool.lib.models.utils import env_or_ucr
+
+from .constants import SHARED_CACHE_FILE_DEFAULT
+
+SHARED_CACHE_BACKEND = (env_or_ucr("ucsschool/kelvin/cache/backend") or "memory").lower()
+SHARED_CACHE_FILE = Path(env_or_ucr("ucsschool/kelvin/cache/path") or SHARED_CACHE_FILE_DEFAULT)
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+_SELECT = "SELECT value, expires_at FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)"
+
+
+def _expires_at(ttl: Optional[float]) -> Optional[float]:
+    return time.time() + ttl if ttl else None
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache in an SQLite file, shared by all processes that use the same ``path``.
+
+    Values are serialized with :class:`aiocache.serializers.JsonSerializer` by
+    default, as they are read back by other processes.
+
+    :param path: path of the SQLite file, its directory is created if missing.
+    :param busy_timeout: seconds to wait for a lock held by another process.
+    """
+
+    NAME = "sqlite"
+
+    def __init__(self, path: Union[str, Path], busy_timeout: float = 1.0, serializer=None, **kwargs):
+        super().__init__(serializer=serializer or JsonSerializer(), **kwargs)
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    async def _run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        def run() -> Any:
+            conn = self._connect()
+            try:
+                return func(conn)
+            finally:
+                conn.close()
+
+        return await asyncio.to_thread(run)
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, pairs: List[Tuple[str, Any]], ttl: Optional[float]) -> None:
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                [(key, value, _expires_at(ttl)) for key, value in pairs],
+            )
+
+    async def _get(self, key, encoding="utf-8", _conn=None):
+        def get(conn: sqlite3.Connection):
+            row = conn.execute(_SELECT, (key, time.time())).fetchone()
+            return row[0] if row else None
+
+        return await self._run(get)
+
+    async def _gets(self, key, encoding="utf-8", _conn=None):
+        return await self._get(key, encoding=encoding, _conn=_conn)
+
+    async def _multi_get(self, keys, encoding="utf-8", _conn=None):
+        def multi_get(conn: sqlite3.Connection):
+            now = time.time()
+            values = {}
+            for key in keys:
+                row = conn.execute(_SELECT, (key, now)).fetchone()
+                values[key] = row[0] if row else None
+            return [values[key] for key in keys]
+
+        return await self._run(multi_get)
+
+    async def _set(self, key, value, ttl=None, _cas_token=None, _conn=None):
+        if _cas_token is not None and _cas_token != await self._get(key):
+            return 0
+        await self._run(lambda conn: self._write(conn, [(key, value)], ttl))
+        return True
+
+    async def _multi_set(self, pairs, ttl=None, _conn=None):
+        await self._run(lambda conn: self._write(conn, list(pairs), ttl))
+        return True
+
+    async def _add(self, key, value, ttl=None, _conn=None):
+        def add(conn: sqlite3.Connection) -> bool:
+            now = time.time()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, _expires_at(ttl)),
+                )
+            return cursor.rowcount == 1
+
+        if not await self._run(add):
+            raise ValueError("Key {} already exists, use .set to update the value".format(key))
+        return True
+
+    async def _exists(self, key, _conn=None):
+        return await self._get(key) is not None
+
+    async def _increment(self, key, delta, _conn=None):
+        def increment(conn: sqlite3.Connection) -> int:
+            now = time.time()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(_SELECT, (key, now)).fetchone()
+                try:
+                    value = int(row[0]) + delta if row else delta
+                except ValueError:
+                    raise TypeError("Value is not an integer") from None
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, str(value), row[1] if row else None),
+                )
+            return value
+
+        return await self._run(increment)
+
+    async def _expire(self, key, ttl, _conn=None):
+        def expire(conn: sqlite3.Connection) -> bool:
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE cache SET expires_at = ? "
+                    "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (_expires_at(ttl), key, time.time()),
+                )
+            return cursor.rowcount == 1
+
+        return await self._run(expire)
+
+    async def _delete(self, key, _conn=None):
+        def delete(conn: sqlite3.Connection) -> int:
+            with conn:
+                return conn.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount
+
+        return await self._run(delete)
+
+    async def _clear(self, namespace=None, _conn=None):
+        def clear(conn: sqlite3.Connection) -> None:
+            with conn:
+                if namespace:
+                    conn.execute(
+                        "DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(namespace), namespace)
+                    )
+                else:
+                    conn.execute("DELETE FROM cache")
+
+        await self._run(clear)
+        return True
+
+    async def _raw(self, command, *args, encoding="utf-8", _conn=None, **kwargs):
+        raise NotImplementedError("SQLiteCache does not support raw commands.")
+
+    async def _redlock_release(self, key, value):
+        def release(conn: sqlite3.Connection) -> int:
+            with conn:
+                return conn.execute(
+                    "DELETE FROM cache WHERE key = ? AND value = ?", (key, value)
+                ).rowcount
+
+        return await self._run(release)
+
+
+def shared_cached(**kwargs):
+    """
+    ``aiocache.cached`` using the backend configured in ``ucsschool/kelvin/cache/backend``.
+
+    ``memory`` (default) keeps a separate cache in each worker process,
+    ``sqlite`` shares it between the workers of a node through the file in
+    ``ucsschool/kelvin/cache/path``.
+    """
+    if SHARED_CACHE_BACKEND == SQLiteCache.NAME:
+        return cached(cache=SQLiteCache, path=SHARED_CACHE_FILE, **kwargs)
+    if SHARED_CACHE_BACKEND != "memory":
+        raise ValueError(
+            f"Unknown value {SHARED_CACHE_BACKEND!r} for 'ucsschool/kelvin/cache/backend', "
+            f"expected 'memory' or 'sqlite'."
+        )
+    return cached(cache=Cache.MEMORY, **kwargs)
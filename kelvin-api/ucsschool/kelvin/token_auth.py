@@ -3,23 +3,39 @@
 # SPDX-FileCopyrightText: 2020-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from datetime import datetime, timedelta
-from typing import Any
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
 
 import aiofiles
 import jwt
+from cachetools import TLRUCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jwt import PyJWTError
+from jwt import InvalidTokenError, PyJWTError
+from jwt.algorithms import get_default_algorithms, has_crypto, requires_cryptography
 from pydantic import BaseModel
 
-from ucsschool.lib.models.utils import ucr
+from ucsschool.lib.models.utils import env_or_ucr, ucr
 
-from .constants import TOKEN_HASH_ALGORITHM, TOKEN_SIGN_SECRET_FILE, UCRV_TOKEN_TTL, URL_TOKEN_BASE
-from .ldap import LdapUser, get_user
+from .constants import (
+    TOKEN_HASH_ALGORITHM,
+    TOKEN_SIGN_PRIVATE_KEY_FILE,
+    TOKEN_SIGN_SECRET_FILE,
+    TOKEN_VERIFY_KEYS_DIR,
+    UCRV_TOKEN_TTL,
+    URL_TOKEN_BASE,
+)
+from .ldap import LdapUser, get_user, run_in_ldap_executor
 
+TOKEN_SIGN_ALGORITHM = env_or_ucr("ucsschool/kelvin/token/algorithm") or TOKEN_HASH_ALGORITHM
+TOKEN_CACHE_SIZE = int(env_or_ucr("ucsschool/kelvin/token/cache_size") or "10240")
+
+logger = logging.getLogger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=URL_TOKEN_BASE)
-_secret_key = ""  # nosec
 
 
 class Token(BaseModel):
@@ -27,18 +43,122 @@ class Token(BaseModel):
     token_type: str
 
 
-class TokenData(BaseModel):
-    username: str = None
+class TokenKey(NamedTuple):
+    kid: str
+    algorithm: str
+    verification_key: Any
+    signing_key: Any = None
+
+
+class TokenKeyring(NamedTuple):
+    current: TokenKey
+    keys: Dict[str, TokenKey]
+
+
+def _token_expiry(_token: str, claims: Dict[str, Any], _now: float) -> float:
+    return claims["exp"]
+
+
+_token_keyring: Optional[TokenKeyring] = None
+# verified token -> claims, entries are dropped when the token expires
+_verified_tokens: TLRUCache = TLRUCache(maxsize=TOKEN_CACHE_SIZE, ttu=_token_expiry, timer=time.time)
+
+
+def _key_id(key_material: bytes) -> str:
+    return hashlib.sha256(key_material).hexdigest()[:16]
+
+
+def _jwt_algorithm(algorithm: str):
+    try:
+        return get_default_algorithms()[algorithm]
+    except KeyError:
+        if algorithm in requires_cryptography and not has_crypto:
+            raise RuntimeError(
+                f"Token signing algorithm {algorithm!r} requires the 'cryptography' package."
+            ) from None
+        raise RuntimeError(f"Unsupported token signing algorithm {algorithm!r}.") from None
+
+
+def _public_key_id(public_key: Any) -> str:
+    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+    return _key_id(public_key.public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo))
+
+
+def hmac_token_key(secret: str, algorithm: str = TOKEN_HASH_ALGORITHM) -> TokenKey:
+    secret = secret.strip()
+    kid = _key_id(f"{algorithm}:{secret}".encode())
+    return TokenKey(kid=kid, algorithm=algorithm, verification_key=secret, signing_key=secret)
+
+
+def private_token_key(pem: bytes, algorithm: str) -> TokenKey:
+    private_key = _jwt_algorithm(algorithm).prepare_key(pem)
+    public_key = private_key.public_key()
+    return TokenKey(
+        kid=_public_key_id(public_key),
+        algorithm=algorithm,
+        verification_key=public_key,
+        signing_key=private_key,
+    )
+
+
+def public_token_key(pem: bytes, algorithm: str) -> TokenKey:
+    public_key = _jwt_algorithm(algorithm).prepare_key(pem)
+    return TokenKey(kid=_public_key_id(public_key), algorithm=algorithm, verification_key=public_key)
+
 
+async def _read_file(path: Path) -> bytes:
+    async with aiofiles.open(path, "rb") as fp:
+        return await fp.read()
 
-async def get_secret_key() -> str:
-    global _secret_key
 
-    if not _secret_key:
-        async with aiofiles.open(TOKEN_SIGN_SECRET_FILE, "r") as fp:
-            key = await fp.read()
-        _secret_key = key.strip()
-    return _secret_key
+async def load_token_keyring() -> TokenKeyring:
+    """
+    Load the keys used to sign and verify tokens.
+
+    Tokens are signed with the secret in ``tokens.secret`` (HMAC algorithms,
+    the default) or the PEM private key in ``tokens.key`` (asymmetric
+    algorithms). Additional keys to verify tokens of other Kelvin replicas or
+    of previous keys (rotation) are read from ``tokens.d/*.secret`` (HMAC
+    secrets) and ``tokens.d/*.pem`` (public keys). Keys are identified by the
+    ``kid`` header, which is derived from the verification key.
+    """
+    # secrets of previous keys were used with the configured HMAC algorithm
+    hmac_algorithm = TOKEN_HASH_ALGORITHM
+    if TOKEN_SIGN_ALGORITHM.startswith("HS"):
+        hmac_algorithm = TOKEN_SIGN_ALGORITHM
+        secret = await _read_file(TOKEN_SIGN_SECRET_FILE)
+        current = hmac_token_key(secret.decode(), TOKEN_SIGN_ALGORITHM)
+    else:
+        current = private_token_key(await _read_file(TOKEN_SIGN_PRIVATE_KEY_FILE), TOKEN_SIGN_ALGORITHM)
+    keys = {current.kid: current}
+    if TOKEN_VERIFY_KEYS_DIR.is_dir():
+        for path in sorted(TOKEN_VERIFY_KEYS_DIR.iterdir()):
+            if path.suffix == ".secret":
+                key = hmac_token_key((await _read_file(path)).decode(), hmac_algorithm)
+            elif path.suffix == ".pem" and not TOKEN_SIGN_ALGORITHM.startswith("HS"):
+                key = public_token_key(await _read_file(path), TOKEN_SIGN_ALGORITHM)
+            else:
+                logger.warning("Ignoring token verification key file %r.", str(path))
+                continue
+            keys.setdefault(key.kid, key)
+    return TokenKeyring(current=current, keys=keys)
+
+
+async def get_token_keyring() -> TokenKeyring:
+    global _token_keyring
+
+    if _token_keyring is None:
+        _token_keyring = await load_token_keyring()
+    return _token_keyring
+
+
+def reset_token_keyring() -> None:
+    """Drop the loaded keys and all verified tokens, e.g. after a key rotation."""
+    global _token_keyring
+
+    _token_keyring = None
+    _verified_tokens.clear()
 
 
 def get_token_ttl() -> int:
@@ -46,14 +166,43 @@ def get_token_ttl() -> int:
 
 
 async def create_access_token(*, data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
+    key = (await get_token_keyring()).current
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=get_token_ttl())
+    expire = datetime.now(tz=timezone.utc) + (expires_delta or timedelta(minutes=get_token_ttl()))
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, await get_secret_key(), algorithm=TOKEN_HASH_ALGORITHM)
-    return encoded_jwt
+    return jwt.encode(to_encode, key.signing_key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+
+def _decode_token(token: str, keyring: TokenKeyring) -> Dict[str, Any]:
+    kid = jwt.get_unverified_header(token).get("kid")
+    if kid is None:
+        # token issued before the introduction of key IDs
+        key = keyring.current
+    elif isinstance(kid, str) and kid in keyring.keys:
+        key = keyring.keys[kid]
+    else:
+        raise InvalidTokenError(f"Unknown key ID {kid!r}.")
+    return jwt.decode(
+        token, key.verification_key, algorithms=[key.algorithm], options={"require": ["exp"]}
+    )
+
+
+async def verify_token(token: str) -> Dict[str, Any]:
+    """
+    Verify the signature and expiry of `token` and return its claims.
+
+    Verified tokens are cached until they expire, so subsequent requests with
+    the same token cost only a dictionary lookup.
+
+    :raises PyJWTError: if the token is invalid or expired
+    """
+    try:
+        return _verified_tokens[token]
+    except KeyError:
+        pass
+    claims = _decode_token(token, await get_token_keyring())
+    _verified_tokens[token] = claims
+    return claims
 
 
 async def get_token(token: str = Depends(oauth2_scheme)) -> str:
@@ -66,7 +215,7 @@ async def get_token(token: str = Depends(oauth2_scheme)) -> str:
     :raises HTTPException: If the token cannot be decoded or the signature cannot be verified.
     """
     try:
-        jwt.decode(token, await get_secret_key(), algorithms=[TOKEN_HASH_ALGORITHM])
+        await verify_token(token)
     except PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -83,15 +232,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> LdapUser:
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, await get_secret_key(), algorithms=[TOKEN_HASH_ALGORITHM])
-        sub: dict[str, Any] = payload.get("sub")
-        username = sub.get("username", "")
-        if not username:
-            raise credentials_exception
-        token_data = TokenData(username=username)
+        payload = await verify_token(token)
     except PyJWTError as exc:
         raise credentials_exception from exc
-    user = get_user(username=token_data.username, school_only=False)
+    sub: dict[str, Any] = payload.get("sub") or {}
+    username = sub.get("username", "")
+    if not username:
+        raise credentials_exception
+    user = await run_in_ldap_executor(get_user, username=username, school_only=False)
     if user is None:
         raise credentials_exception
     user.kelvin_admin = sub.get("kelvin_admin", False)
@@ -1,19 +1,22 @@
 # SPDX-FileCopyrightText: 2020-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from typing import Any, Union
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import quote
 
 from cachetools import LRUCache, cached
 from cachetools.keys import hashkey
 from fastapi import Request
 from pydantic import HttpUrl
+from starlette.applications import Starlette
+from starlette.convertors import Convertor
 from starlette.datastructures import URL
-from starlette.routing import NoMatchFound, Router
+from starlette.routing import NoMatchFound, Route, Router, WebSocketRoute, replace_params
 
 from ucsschool.lib.models.base import NoObject
 from ucsschool.lib.models.utils import env_or_ucr
 
-from .ldap import get_dn_of_user
+from .ldap import get_dn_of_user, run_in_ldap_executor
 
 
 def _matching_path_segments(path_a: str, path_b: str) -> int:
@@ -28,13 +31,6 @@ def _matching_path_segments(path_a: str, path_b: str) -> int:
     return matching
 
 
-def _request_route_signature(request: Request) -> str:
-    route = request.scope.get("route")
-    if route is not None and getattr(route, "path_format", None):
-        return route.path_format
-    return request.url.path
-
-
 def _url_for_same_api_prefix(request: Request, name: str, **path_params: Any) -> URL:
     request_path = request.url.path
     fallback_url = None
@@ -58,21 +54,82 @@ def _url_for_same_api_prefix(request: Request, name: str, **path_params: Any) ->
     raise NoMatchFound(name, path_params)
 
 
-@cached(
-    cache=LRUCache(maxsize=10240),
-    key=lambda request, name, **path_params: hashkey(
-        name,
-        request.base_url.scheme,
-        request.headers.get("host", None),
-        _request_route_signature(request),
-        tuple(sorted(path_params.items())),
-    ),
-)
+class _RouteTemplate(NamedTuple):
+    path_format: str
+    param_convertors: Dict[str, Convertor]
+
+
+_RouteTemplates = Dict[Tuple[str, FrozenSet[str]], List[_RouteTemplate]]
+
+
+def build_url_templates(app: Starlette) -> _RouteTemplates:
+    """
+    Precompute the URL templates of all routes of `app`, grouped by route
+    name and path parameter names, and store them in `app.state`. Call it
+    once all routes are registered.
+    """
+    templates: _RouteTemplates = {}
+    for route in app.router.routes:
+        if isinstance(route, (Route, WebSocketRoute)):
+            key = (route.name, frozenset(route.param_convertors))
+            templates.setdefault(key, []).append(
+                _RouteTemplate(route.path_format, route.param_convertors)
+            )
+    app.state.url_templates = templates
+    return templates
+
+
+def _url_parts(request: Request, name: str, path_params: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    templates = getattr(request.app.state, "url_templates", None)
+    if templates is None:
+        templates = build_url_templates(request.app)
+    candidates = templates.get((name, frozenset(path_params)))
+    if not candidates:
+        return None
+
+    base_url = request.base_url
+    base_path = base_url.path.rstrip("/")
+    request_path = request.url.path
+    best_path = ""
+    best_score = -1
+    for template in candidates:
+        path, _ = replace_params(template.path_format, template.param_convertors, dict(path_params))
+        path = base_path + path
+        score = _matching_path_segments(request_path, path)
+        if score > best_score:
+            best_score = score
+            best_path = path
+    return base_url.netloc, best_path
+
+
 def cached_url_for(request: Request, name: str, **path_params: Any) -> URL:
-    """Cached drop-in replacement for `request.url_for()`."""
-    # Using `cachetools`, because `lru_cache` does not support dropping a function argument. And we
-    # don't want the `request` object to be part of the cache key.
-    return _url_for_same_api_prefix(request, name, **path_params)
+    """
+    Drop-in replacement for `request.url_for()` that prefers the route under
+    the API prefix (v1, v2, ...) of the current request.
+
+    The URL is built from the precomputed route templates (see
+    `build_url_templates()`), so no per-object cache is needed.
+    """
+    parts = _url_parts(request, name, path_params)
+    if parts is None:
+        # Not a plain route (e.g. a mounted app): let the routes resolve it.
+        return _url_for_same_api_prefix(request, name, **path_params)
+    netloc, path = parts
+    scheme = "https" if request.base_url.scheme in ("https", "wss") else "http"
+    return URL(scheme=scheme, netloc=netloc, path=path)
+
+
+def https_url_for(request: Request, name: str, **path_params: Any) -> str:
+    """
+    `cached_url_for()` as a string with scheme "https" and quoted path, as
+    `LibModelHelperMixin.scheme_and_quote(str(cached_url_for(...)))` returns it.
+    """
+    parts = _url_parts(request, name, path_params)
+    if parts is None:
+        url = _url_for_same_api_prefix(request, name, **path_params)
+        parts = url.netloc, url.path
+    netloc, path = parts
+    return f"https://{netloc}{quote(path)}"
 
 
 @cached(
@@ -117,21 +174,27 @@ def url_to_name(request: Request, obj_type: str, url: Union[str, HttpUrl]) -> st
     return name
 
 
-@cached(
-    cache=LRUCache(maxsize=10240),
-    key=lambda request, obj_type, url: hashkey(obj_type, url),
-)
-def url_to_dn(request: Request, obj_type: str, url: str) -> str:
+_url_to_dn_cache: LRUCache = LRUCache(maxsize=10240)
+
+
+async def url_to_dn(request: Request, obj_type: str, url: str) -> str:
     """
     Guess object ID (e.g. school name or username) from last part of URL. If
-    object is user, search object with UDM HTTP API to retrieve DN.
+    object is user, search object in LDAP to retrieve DN.
     """
+    cache_key = hashkey(obj_type, url)
+    try:
+        return _url_to_dn_cache[cache_key]
+    except KeyError:
+        pass
     name = url_to_name(request, obj_type, url)
     if obj_type == "school":
-        return f"ou={name},{env_or_ucr('ldap/base')}"
+        dn = f"ou={name},{env_or_ucr('ldap/base')}"
     elif obj_type == "user":
-        if dn := get_dn_of_user(name):
-            return dn
-        else:
+        dn = await run_in_ldap_executor(get_dn_of_user, name)
+        if not dn:
             raise NoObject(f"Could not find object of type {obj_type!r} with URL {url!r}.")
-    raise NotImplementedError(f"Don't know how to create DN for obj_type {obj_type!r}.")
+    else:
+        raise NotImplementedError(f"Don't know how to create DN for obj_type {obj_type!r}.")
+    _url_to_dn_cache[cache_key] = dn
+    return dn
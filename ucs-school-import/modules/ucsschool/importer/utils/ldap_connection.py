@@ -111,3 +111,19 @@ def get_readonly_connection() -> Tuple[LoType, PoType]:
         lo_rw = ReadOnlyAccess()
         _read_only_admin_connection, _read_only_admin_position = lo_rw, lo_rw._real_po
     return _read_only_admin_connection, _read_only_admin_position
+
+
+def reset_connections() -> None:
+    """
+    Forget the cached connections, so the next call of a ``get_*_connection()``
+    function opens a new one.
+
+    Used before forking worker processes, which must not share a connection.
+    """
+    global _admin_connection, _admin_position, _machine_connection, _machine_position
+    global _unprivileged_connection, _unprivileged_position
+    global _read_only_admin_connection, _read_only_admin_position
+    _admin_connection = _admin_position = None
+    _machine_connection = _machine_position = None
+    _unprivileged_connection = _unprivileged_position = None
+    _read_only_admin_connection = _read_only_admin_position = None
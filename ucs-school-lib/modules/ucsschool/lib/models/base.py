@@ -4,7 +4,6 @@
 #
 # SPDX-FileCopyrightText: 2014-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
-import inspect
 import time
 from copy import deepcopy
 from functools import lru_cache
@@ -38,9 +37,10 @@ from ..pyhooks.pyhooks_loader import PyHooksLoader
 from ..roles import all_roles, create_ucsschool_role_string
 from ..schoolldap import SchoolSearchBase, name_from_dn
 from .attributes import CommonName, Roles, SchoolAttribute, ValidationError
+from .cache import MODEL_CACHE_MAXSIZE, SCHOOL_CACHE_MAXSIZE, LRUCache
 from .hook import KelvinHook
 from .meta import UCSSchoolHelperMetaClass
-from .utils import _, env_or_ucr, uldap_exists
+from .utils import _, env_or_ucr, uldap_exists_async
 from .validator import validate
 
 SuperOrdinateType = Union[str, UdmObject]
@@ -202,8 +202,8 @@ class UCSSchoolHelperAbstractClass(object):
             # TODO: implement pyhooks
     """
 
-    _cache: Dict[Tuple[str, Tuple[str, str]], UCSSchoolModel] = {}
-    _search_base_cache: Dict[str, SchoolSearchBase] = {}
+    _cache: Dict[str, LRUCache] = {}  # one cache per class, see _class_cache()
+    _search_base_cache = LRUCache("UCSSchoolHelperAbstractClass.search_base", SCHOOL_CACHE_MAXSIZE)
     _initialized_udm_modules: List[str] = []
     _attribute_udm_names: Dict[str, str] = None
 
@@ -227,10 +227,23 @@ class UCSSchoolHelperAbstractClass(object):
             (k, kwargs[k]) for k in sorted(kwargs)
         ]  # TODO: rewrite: sorted(kwargs.items())
         key = tuple(key)
-        if key not in cls._cache:
+        cache = cls._class_cache()
+        try:
+            return cache[key]
+        except KeyError:
             obj = cls(**kwargs)
-            cls._cache[key] = obj
-        return cls._cache[key]
+            cache[key] = obj
+            return obj
+
+    @classmethod
+    def _class_cache(cls) -> LRUCache:
+        """The cache of :py:meth:`cache()` for objects of this class."""
+        try:
+            return cls._cache[cls.__name__]
+        except KeyError:
+            return cls._cache.setdefault(
+                cls.__name__, LRUCache("{}.cache".format(cls.__name__), MODEL_CACHE_MAXSIZE)
+            )
 
     @classmethod
     def invalidate_all_caches(cls) -> None:
@@ -238,7 +251,8 @@ class UCSSchoolHelperAbstractClass(object):
         from ucsschool.lib.models.user import User
         from ucsschool.lib.models.utils import _pw_length_cache
 
-        cls._cache.clear()
+        for cache in list(cls._cache.values()):
+            cache.clear()
         # cls._search_base_cache.clear() # useless to clear
         _pw_length_cache.clear()
         Network._netmask_cache.clear()
@@ -247,9 +261,7 @@ class UCSSchoolHelperAbstractClass(object):
 
     @classmethod
     def invalidate_cache(cls) -> None:
-        keys_to_remove = [key for key in cls._cache.keys() if key[0] == cls.__name__]
-        for key in keys_to_remove:
-            del cls._cache[key]
+        cls._class_cache().clear()
 
     @classmethod
     def supports_school(cls) -> bool:
@@ -422,7 +434,7 @@ class UCSSchoolHelperAbstractClass(object):
         if not name:
             return False
         if self._meta._ldap_filter:
-            return uldap_exists(self._ldap_filter(name=name))
+            return await uldap_exists_async(self._ldap_filter(name=name))
         return await self.get_udm_object(lo) is not None
 
     async def exists_outside_school(self, lo: UDM) -> bool:
@@ -446,24 +458,23 @@ class UCSSchoolHelperAbstractClass(object):
         :return: None
         :rtype: None
         """
-        self._in_hook = True
         lo, _ = self.get_admin_connection()
-        all_hooks = _pyhook_loader.get_hook_objects(udm=udm, lo=lo)
         meth_name = "{}_{}".format(hook_time, func_name)
+        hooks = _pyhook_loader.get_model_hooks(self.__class__, meth_name, udm=udm, lo=lo)
+        if not hooks:
+            return
+        self._in_hook = True
         try:
-            for func in all_hooks.get(meth_name, []):  # type: Callable[..., Any]
-                if issubclass(self.__class__, func.__self__.model):
-                    func_py_name = f"{func.__self__.__class__.__name__}.{func.__name__}"
-                    self.logger.debug(
-                        "Running %s hook %s for %s...",
-                        meth_name,
-                        func_py_name,
-                        self,
-                    )
-                    if not inspect.iscoroutinefunction(func):
-                        raise TypeError(f"Hook method {func_py_name} must be an async function.")
-                    func.__self__.udm = udm  # update UDM instance to the current one
-                    await func(self)
+            for func in hooks:  # type: Callable[..., Any]
+                self.logger.debug(
+                    "Running %s hook %s.%s for %s...",
+                    meth_name,
+                    func.__self__.__class__.__name__,
+                    func.__name__,
+                    self,
+                )
+                func.__self__.udm = udm  # update UDM instance to the current one
+                await func(self)
         finally:
             self._in_hook = False
 
@@ -961,10 +972,13 @@ class UCSSchoolHelperAbstractClass(object):
     def get_search_base(cls, school_name: str) -> SchoolSearchBase:
         from ucsschool.lib.models.school import School
 
-        if school_name not in cls._search_base_cache:
+        try:
+            return cls._search_base_cache[school_name]
+        except KeyError:
             school = School(name=school_name)
-            cls._search_base_cache[school_name] = SchoolSearchBase([school.name], dn=school.dn)
-        return cls._search_base_cache[school_name]
+            search_base = SchoolSearchBase([school.name], dn=school.dn)
+            cls._search_base_cache[school_name] = search_base
+            return search_base
 
     @classmethod
     async def get_all(
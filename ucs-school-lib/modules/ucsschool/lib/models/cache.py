@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# UCS@school python lib: models
+#
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Bounded caches for the class level caches of the models.
+
+The models keep their caches for the lifetime of the process. In a long
+running process (e.g. a Kelvin worker) plain dicts grow with every school,
+network and user path ever looked up. :py:class:`LRUCache` limits the number
+of entries, optionally expires them after a TTL and counts hits and misses,
+which :py:func:`cache_info` reports for all caches.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+MODEL_CACHE_MAXSIZE = 1024
+SCHOOL_CACHE_MAXSIZE = 4096
+POLICY_CACHE_TTL = 300  # policies can change without the cache being invalidated
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+_caches: Dict[str, "LRUCache"] = {}
+
+
+class LRUCache(object):
+    """
+    Dict-like cache with a maximum size and an optional TTL (in seconds).
+
+    When full, the least recently used entry is removed. Reading an entry with
+    ``cache[key]`` or ``cache.get(key)`` counts a hit or a miss; ``key in cache``
+    does not. The cache is registered under ``name`` for :py:func:`cache_info`.
+    It may be used from several threads.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: Optional[float] = None) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        _caches[name] = self
+
+    def __repr__(self) -> str:
+        return "{}({!r}, maxsize={!r}, ttl={!r})".format(
+            self.__class__.__name__, self.name, self.maxsize, self.ttl
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _lookup(self, key: Hashable) -> Tuple[Any, Optional[float]]:
+        value, expires_at = self._data[key]
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            raise KeyError(key)
+        return value, expires_at
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            try:
+                self._lookup(key)
+            except KeyError:
+                return False
+            return True
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            try:
+                value, _expires_at = self._lookup(key)
+            except KeyError:
+                self.misses += 1
+                raise
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value, _expires_at = self._data.pop(key, (default, None))
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    """Hits, misses, evictions and sizes of all caches, by cache name."""
+    return {name: cache.cache_info() for name, cache in list(_caches.items())}
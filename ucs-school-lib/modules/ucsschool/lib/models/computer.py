@@ -28,7 +28,7 @@ from .base import MultipleObjectsError, RoleSupportMixin, SuperOrdinateType, UCS
 from .dhcp import AnyDHCPService, DHCPServer
 from .group import BasicGroup
 from .network import Network
-from .utils import _, ucr, uldap_exists
+from .utils import _, ucr, uldap_exists_async
 
 
 class AnyComputer(UCSSchoolHelperAbstractClass):
@@ -291,7 +291,7 @@ class SchoolComputer(UCSSchoolHelperAbstractClass):
             filter_s = filter_format(
                 "(&(objectClass=univentionHost)(!(cn=%s))(ip=%s))", (self.name, ip_address)
             )
-            if uldap_exists(filter_s):
+            if await uldap_exists_async(filter_s):
                 self.add_error(
                     "ip_address",
                     _(
@@ -303,7 +303,7 @@ class SchoolComputer(UCSSchoolHelperAbstractClass):
             filter_s = filter_format(
                 "(&(objectClass=univentionHost)(!(cn=%s))(mac=%s))", (self.name, mac_address)
             )
-            if uldap_exists(filter_s):
+            if await uldap_exists_async(filter_s):
                 self.add_error(
                     "mac_address",
                     _(
@@ -28,7 +28,7 @@ from .base import (
 from .misc import OU, Container
 from .policy import UMCPolicy
 from .share import ClassShare, WorkGroupShare
-from .utils import _, ucr, uldap_exists
+from .utils import _, ucr, uldap_exists_async
 
 
 class _MayHaveSchoolPrefix(object):
@@ -175,7 +175,9 @@ class BasicGroup(Group):
 
     async def container_exists(self, lo: UDM) -> bool:
         filter_s, base = self.get_own_container().split(",", 1)
-        return uldap_exists(f"(&(univentionObjectType=container/cn)({filter_s}))", search_base=base)
+        return await uldap_exists_async(
+            f"(&(univentionObjectType=container/cn)({filter_s}))", search_base=base
+        )
 
     def build_hook_line(self, hook_time: str, func_name: str) -> Optional[str]:
         return None
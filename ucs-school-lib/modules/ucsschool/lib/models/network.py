@@ -5,7 +5,7 @@
 # SPDX-FileCopyrightText: 2014-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
-from typing import Dict, Optional
+from typing import Optional
 
 from ipaddr import AddressValueError, IPv4Network, NetmaskValueError
 
@@ -14,6 +14,7 @@ from univention.admin.uexceptions import noObject
 
 from .attributes import Netmask, NetworkAttribute, NetworkBroadcastAddress, SubnetName
 from .base import UCSSchoolHelperAbstractClass
+from .cache import SCHOOL_CACHE_MAXSIZE, LRUCache
 from .dhcp import DHCPSubnet
 from .utils import _, ucr
 
@@ -23,7 +24,7 @@ class Network(UCSSchoolHelperAbstractClass):
     network: str = NetworkAttribute(_("Network"))
     broadcast: str = NetworkBroadcastAddress(_("Broadcast"))
 
-    _netmask_cache: Dict[str, str] = {}
+    _netmask_cache = LRUCache("Network.netmask", SCHOOL_CACHE_MAXSIZE)
 
     @classmethod
     def get_container(cls, school: str) -> str:
@@ -97,7 +98,9 @@ class Network(UCSSchoolHelperAbstractClass):
 
     @classmethod
     async def get_netmask(cls, dn: str, school: str, lo: UDM) -> Optional[str]:
-        if dn not in cls._netmask_cache:
+        try:
+            return cls._netmask_cache[dn]
+        except KeyError:
             try:
                 network = await cls.from_dn(dn, school, lo)
             except noObject:
@@ -112,7 +115,7 @@ class Network(UCSSchoolHelperAbstractClass):
                 netmask = str(ipv4_network.netmask)  # e.g. '255.255.255.0'
             cls.logger.debug("Network mask: %r is %r", dn, netmask)
             cls._netmask_cache[dn] = netmask
-        return cls._netmask_cache[dn]
+            return netmask
 
     class Meta:
         udm_module = "networks/network"
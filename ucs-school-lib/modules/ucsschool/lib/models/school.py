@@ -5,10 +5,11 @@
 # SPDX-FileCopyrightText: 2014-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import asyncio
 import socket
 import subprocess
 import time
-from typing import Dict, Iterable, List, Optional, Set, Union
+from typing import Awaitable, Iterable, List, Optional, Set, Tuple, TypeVar, Union
 
 import ldap
 from ldap.dn import escape_dn_chars
@@ -37,13 +38,61 @@ from ..roles import (
 )
 from .attributes import Attribute, DCName, DisplayName, SchoolName, ShareFileServer
 from .base import RoleSupportMixin, UCSSchoolHelperAbstractClass
+from .cache import SCHOOL_CACHE_MAXSIZE, LRUCache
 from .computer import AnyComputer, SchoolDC, SchoolDCSlave
 from .dhcp import DHCPService
 from .group import BasicGroup, BasicSchoolGroup, Group
 from .misc import OU, Container
 from .policy import DHCPDNSPolicy
 from .share import MarketplaceShare
-from .utils import _, flatten, ucr, uldap_admin_read_primary, uldap_exists
+from .utils import _, flatten, ucr, uldap_admin_read_primary, uldap_exists_async
+
+# number of containers or groups created in parallel when creating a school
+OU_BOOTSTRAP_CONCURRENCY = 8
+
+T = TypeVar("T")
+
+
+async def _gather_bounded(aws: Iterable[Awaitable[T]], limit: int = OU_BOOTSTRAP_CONCURRENCY) -> List[T]:
+    """
+    Await ``aws`` concurrently, at most ``limit`` at a time, and return their results in order.
+
+    Like awaiting them one after another, the exception of the first failed one (in the
+    order of ``aws``) is raised: when one fails, the ones after it that have not finished
+    yet are cancelled, the ones before it are still awaited.
+    """
+    aws = list(aws)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    tasks = [asyncio.ensure_future(_run(aw)) for aw in aws]
+    first_failed = len(tasks)
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+            failed = [
+                index
+                for index, task in enumerate(tasks)
+                if task in done and not task.cancelled() and task.exception() is not None
+            ]
+            if failed and failed[0] < first_failed:
+                first_failed = failed[0]
+                for task in tasks[first_failed + 1 :]:
+                    task.cancel()
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+    for aw, task in zip(aws, tasks):
+        if task.cancelled() and asyncio.iscoroutine(aw):
+            aw.close()  # never started
+    if first_failed < len(tasks):
+        raise tasks[first_failed].exception()
+    return [task.result() for task in tasks]
 
 
 class School(RoleSupportMixin, UCSSchoolHelperAbstractClass):
@@ -63,7 +112,7 @@ class School(RoleSupportMixin, UCSSchoolHelperAbstractClass):
 
     default_roles = [role_school]
     _school_in_name = True
-    _school_obj_cache: Dict[str, "School"] = {}
+    _school_obj_cache = LRUCache("School.school_obj", SCHOOL_CACHE_MAXSIZE)
 
     def __init__(self, name: str = None, school: str = None, alter_dhcpd_base: bool = None, **kwargs):
         super(School, self).__init__(name=name, **kwargs)
@@ -94,7 +143,7 @@ class School(RoleSupportMixin, UCSSchoolHelperAbstractClass):
                 f"(cn=%s){role_filter})",
                 [self.dc_name.lower()],
             )
-            if uldap_exists(ldap_filter_str):
+            if await uldap_exists_async(ldap_filter_str):
                 self.add_error("dc_name", err_msg)
 
     def get_district(self) -> str:
@@ -141,25 +190,34 @@ class School(RoleSupportMixin, UCSSchoolHelperAbstractClass):
             "share_path": ["shares", [cn_classes]],
         }
 
-        async def _add_container(name: str, last_dn: str, base_dn: str, path: str, lo: UDM) -> str:
-            if isinstance(name, (list, tuple)):
-                base_dn = last_dn
-                for cn in name:
-                    last_dn = await _add_container(cn, last_dn, base_dn, path, lo)
-            else:
+        # A nested list holds the children of the container preceding it. Containers
+        # are created level by level, the containers of one level concurrently.
+        levels: List[List[Container]] = []
+
+        def _add_containers(names: list, base_dn: str, last_dn: str, path: str, depth: int) -> str:
+            for name in names:
+                if isinstance(name, (list, tuple)):
+                    last_dn = _add_containers(name, last_dn, last_dn, path, depth + 1)
+                    continue
                 container = Container(name=name, school=self.name)
                 setattr(container, path, True)
                 container.position = base_dn
+                if len(levels) <= depth:
+                    levels.append([])
+                levels[depth].append(container)
                 last_dn = container.dn
-                if not await container.exists(lo):
-                    last_dn = await container.create(lo, False)
             return last_dn
 
         last_dn = self.dn
-        path = None
         for path, containers in containers_with_path.items():
-            for cn in containers:
-                last_dn = await _add_container(cn, last_dn, self.dn, path, lo)
+            last_dn = _add_containers(containers, self.dn, last_dn, path, 0)
+
+        async def _create_container(container: Container) -> None:
+            if not await container.exists(lo):
+                await container.create(lo, False)
+
+        for level in levels:
+            await _gather_bounded(_create_container(container) for container in level)
 
     def group_name(self, prefix_var: str, default_prefix: str) -> str:
         ucr_var = "ucsschool/ldap/default/groupprefix/%s" % prefix_var
@@ -190,21 +248,73 @@ class School(RoleSupportMixin, UCSSchoolHelperAbstractClass):
                     "administrative", domain_controller="both", ou_specific="both"
                 )
             )  # same with Verwaltungsnetz
-        for administrative_group_name in administrative_group_names:
-            group = BasicGroup.cache(
-                name=administrative_group_name, container=administrative_group_container
-            )
-            await group.create(lo)
-
         # cn=ouadmins
         admin_group_container = Container(name="ouadmins", school="")
         admin_group_container.position = "cn=groups,{}".format(ucr["ldap/base"])
         if not await admin_group_container.exists(lo):
             await admin_group_container.create(lo, False)
 
+        # all parent containers exist now, create the groups concurrently
+        group_coros = [
+            BasicGroup.cache(
+                name=administrative_group_name, container=administrative_group_container
+            ).create(lo)
+            for administrative_group_name in administrative_group_names
+        ]
+        group_coros.append(self._create_ou_admin_group(admin_group_container.dn, lo))
+        group_coros.extend(
+            self._create_school_group(name, role, umc_policy, lo)
+            for name, role, umc_policy in self._default_school_groups()
+        )
+        await _gather_bounded(group_coros)
+
+    def _default_school_groups(self) -> List[Tuple[str, str, Optional[str]]]:
+        """Name, role and UMC policy DN of the default groups in the school's group container."""
+        groups = [
+            (
+                self.group_name("pupils", "schueler-"),
+                role_school_student_group,
+                self.get_umc_policy_dn("pupils"),
+            ),
+            (
+                self.group_name("teachers", "lehrer-"),
+                role_school_teacher_group,
+                self.get_umc_policy_dn("teachers"),
+            ),
+            (
+                self.group_name("legal_guardians", "sorgeberechtigte-"),
+                role_school_legal_guardian_group,
+                self.get_umc_policy_dn("legal_guardians"),
+            ),
+        ]
+        if self.shall_create_administrative_objects():
+            groups.append(
+                (
+                    self.group_name("staff", "mitarbeiter-"),
+                    role_school_staff_group,
+                    self.get_umc_policy_dn("staff"),
+                )
+            )
+        if ucr.is_true("ucsschool/import/attach/policy/default-umc-users", True):
+            umc_policy = "cn=default-umc-users,cn=UMC,cn=policies,%s" % (ucr.get("ldap/base"),)
+        else:
+            umc_policy = None
+        groups.append(("Domain Users %s" % (self.name,), role_school_domain_group, umc_policy))
+        return groups
+
+    async def _create_school_group(
+        self, name: str, role: str, umc_policy: Optional[str], lo: UDM
+    ) -> None:
+        group = Group.cache(name, self.name)
+        group.ucsschool_roles = [create_ucsschool_role_string(role, self.name)]
+        await group.create(lo)
+        if umc_policy:
+            await group.add_umc_policy(umc_policy, lo)
+
+    async def _create_ou_admin_group(self, container: str, lo: UDM) -> None:
         # admins-%s
         group = BasicSchoolGroup.cache(
-            self.group_name("admins", "admins-"), self.name, container=admin_group_container.dn
+            self.group_name("admins", "admins-"), self.name, container=container
         )
         group.ucsschool_roles = [create_ucsschool_role_string(role_school_admin_group, self.name)]
         await group.create(lo)
@@ -220,42 +330,6 @@ class School(RoleSupportMixin, UCSSchoolHelperAbstractClass):
             udm_obj.props.school = [self.name]
             await udm_obj.save()
 
-        # cn=schueler
-        group = Group.cache(self.group_name("pupils", "schueler-"), self.name)
-        group.ucsschool_roles = [create_ucsschool_role_string(role_school_student_group, self.name)]
-        await group.create(lo)
-        await group.add_umc_policy(self.get_umc_policy_dn("pupils"), lo)
-
-        # cn=lehrer
-        group = Group.cache(self.group_name("teachers", "lehrer-"), self.name)
-        group.ucsschool_roles = [create_ucsschool_role_string(role_school_teacher_group, self.name)]
-        await group.create(lo)
-        await group.add_umc_policy(self.get_umc_policy_dn("teachers"), lo)
-
-        # cn=sorgeberechtigte
-        group = Group.cache(self.group_name("legal_guardians", "sorgeberechtigte-"), self.name)
-        group.ucsschool_roles = [
-            create_ucsschool_role_string(role_school_legal_guardian_group, self.name)
-        ]
-        await group.create(lo)
-        await group.add_umc_policy(self.get_umc_policy_dn("legal_guardians"), lo)
-
-        # cn=mitarbeiter
-        if self.shall_create_administrative_objects():
-            group = Group.cache(self.group_name("staff", "mitarbeiter-"), self.name)
-            group.ucsschool_roles = [create_ucsschool_role_string(role_school_staff_group, self.name)]
-            await group.create(lo)
-            await group.add_umc_policy(self.get_umc_policy_dn("staff"), lo)
-
-        # cn=Domain Users %s
-        group = Group.cache("Domain Users %s" % (self.name,), self.name)
-        group.ucsschool_roles = [create_ucsschool_role_string(role_school_domain_group, self.name)]
-        await group.create(lo)
-        if ucr.is_true("ucsschool/import/attach/policy/default-umc-users", True):
-            await group.add_umc_policy(
-                "cn=default-umc-users,cn=UMC,cn=policies,%s" % (ucr.get("ldap/base"),), lo
-            )
-
     def get_dc_name_fallback(self, administrative: bool = False) -> str:
         if administrative:
             # this is the naming convention, a trailing v for Verwaltungsnetz DC
@@ -366,7 +440,7 @@ class School(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         if self.dc_name:
             dc_name_l = self.dc_name.lower()
             dc_udm_obj = None
-            if uldap_exists(
+            if await uldap_exists_async(
                 filter_format(
                     "(&"
                     "(objectClass=univentionDomainController)"
@@ -694,9 +768,12 @@ class School(RoleSupportMixin, UCSSchoolHelperAbstractClass):
             t0 = time.time()
             for entry in uldap.search(str(complete_filter), attributes=["ou"]):
                 ou = entry["ou"].value
-                if ou.lower() not in cls._school_obj_cache:
-                    cls._school_obj_cache[ou.lower()] = await School.from_dn(entry.entry_dn, None, lo)
-                schools.append(cls._school_obj_cache[ou.lower()])
+                try:
+                    school = cls._school_obj_cache[ou.lower()]
+                except KeyError:
+                    school = await School.from_dn(entry.entry_dn, None, lo)
+                    cls._school_obj_cache[ou.lower()] = school
+                schools.append(school)
             cls.logger.debug(
                 "Timings: retrieved %d schools in %.3f sec.", len(schools), time.time() - t0
             )
@@ -9,7 +9,9 @@ import copy
 import logging
 import os.path
 import time
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional, Set, Tuple, Type, TypeVar, Union
 
 from ldap.dn import escape_dn_chars, explode_dn
@@ -49,17 +51,23 @@ from .attributes import (
     WorkgroupsAttribute,
 )
 from .base import RoleSupportMixin, UCSSchoolHelperAbstractClass, UnknownModel, WrongModel
+from .cache import SCHOOL_CACHE_MAXSIZE, LRUCache
 from .computer import AnyComputer
 from .group import BasicGroup, Group, SchoolClass, SchoolGroup, WorkGroup
 from .misc import MailDomain
 from .school import School
-from .utils import _, create_passwd, env_or_ucr, ucr, uldap_exists
+from .utils import _, create_passwd, env_or_ucr, ucr, uldap_exists_async
 
 SuperOrdinateType = Union[str, UdmObject]
 unicode_s = str  # py3
 
 logger = logging.getLogger(__name__)
 
+# (school, group DN) -> SchoolClass, WorkGroup or None, shared while converting a batch of users
+_group_classification: ContextVar[Optional[Dict[Tuple[str, str], Optional[Type[SchoolClass]]]]] = (
+    ContextVar("_group_classification", default=None)
+)
+
 
 def log_retry_attempt(retry_state: RetryCallState) -> None:
     logger.warning(
@@ -98,8 +106,8 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         "(objectClass=ucsschoolStaff)(objectClass=ucsschoolStudent))"
     )
 
-    _profile_path_cache: Dict[str, str] = {}
-    _samba_home_path_cache: Dict[str, str] = {}
+    _profile_path_cache = LRUCache("User.profile_path", SCHOOL_CACHE_MAXSIZE)
+    _samba_home_path_cache = LRUCache("User.samba_home_path", SCHOOL_CACHE_MAXSIZE)
     # _samba_home_path_cache is invalidated in School.invalidate_cache()
 
     roles: List[str] = []
@@ -139,17 +147,18 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         elif ucr.is_true("ucsschool/singlemaster", False):
             # in single server environments the master is always the fileserver
             samba_home_path = r"\\%s" % ucr.get("ldap/server/name").split(".")[0]
-        # if there's a cached result then use it
-        elif school.dn not in self._samba_home_path_cache:
-            samba_home_path = None
-            # get windows home server from OU object
-            school = await self.get_school_obj(lo)
-            home_share_file_server = school.home_share_file_server
-            if home_share_file_server:
-                samba_home_path = r"\\%s" % self.get_name_from_dn(home_share_file_server)
-            self._samba_home_path_cache[school.dn] = samba_home_path
         else:
-            samba_home_path = self._samba_home_path_cache[school.dn]
+            # if there's a cached result then use it
+            try:
+                samba_home_path = self._samba_home_path_cache[school.dn]
+            except KeyError:
+                samba_home_path = None
+                # get windows home server from OU object
+                school = await self.get_school_obj(lo)
+                home_share_file_server = school.home_share_file_server
+                if home_share_file_server:
+                    samba_home_path = r"\\%s" % self.get_name_from_dn(home_share_file_server)
+                self._samba_home_path_cache[school.dn] = samba_home_path
         if samba_home_path is not None:
             return r"%s\%s" % (samba_home_path, self.name)
 
@@ -157,7 +166,9 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         if ucr_variable := ucr.get("ucsschool/import/set/serverprofile/path"):
             return ucr_variable
         school = School.cache(self.school)
-        if school.dn not in self._profile_path_cache:
+        try:
+            return self._profile_path_cache[school.dn]
+        except KeyError:
             profile_path = r"%s\%%USERNAME%%\windows-profiles\default"
             for computer in await AnyComputer.get_all(
                 lo, self.school, "univentionService=Windows Profile Server"
@@ -167,7 +178,7 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
             else:
                 profile_path = profile_path % "%LOGONSERVER%"
             self._profile_path_cache[school.dn] = profile_path
-        return self._profile_path_cache[school.dn]
+            return profile_path
 
     async def is_student(self, lo: UDM) -> bool:
         return await self.__check_object_class(lo, "ucsschoolStudent")
@@ -220,10 +231,53 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         # cls.logger.debug("**** udm_obj=%r school=%r", udm_obj, school)
         obj = await super(User, cls).from_udm_obj(udm_obj, school, lo)
         obj.password = None
-        obj.school_classes = await cls.get_school_classes(udm_obj, obj)
-        obj.workgroups = await cls.get_workgroups(udm_obj, obj)
+        # both classify the same groups
+        with cls.batch_conversion():
+            obj.school_classes = await cls.get_school_classes(udm_obj, obj)
+            obj.workgroups = await cls.get_workgroups(udm_obj, obj)
         return obj
 
+    @classmethod
+    @contextmanager
+    def batch_conversion(cls) -> Iterator[None]:
+        """
+        Context manager to share the classification of group DNs between all
+        :py:meth:`from_udm_obj()` calls made inside it, e.g. while converting
+        the result of a search. Then the group memberships of all users are
+        classified once per group and school, instead of once per user.
+        Nested, it shares the classification of the outer one.
+        """
+        if _group_classification.get() is not None:
+            yield
+            return
+        token = _group_classification.set({})
+        try:
+            yield
+        finally:
+            _group_classification.reset(token)
+
+    @classmethod
+    def _classify_group(cls, school: str, group_dn: str) -> Optional[Type[SchoolClass]]:
+        """
+        Returns `SchoolClass` if `group_dn` is a school class of `school`,
+        `WorkGroup` if it is a work group of it and `None` otherwise.
+
+        The group is classified by its container, it is not read from LDAP.
+        """
+        cache = _group_classification.get()
+        key = (school, group_dn)
+        if cache is not None and key in cache:
+            return cache[key]
+        if Group.is_school_class(school, group_dn):
+            kind = SchoolClass
+        elif Group.is_school_workgroup(school, group_dn):
+            kind = WorkGroup
+        else:
+            kind = None
+        if cache is not None:
+            cache[key] = kind
+        return kind
+
     async def create(
         self, lo: UDM, validate: bool = True, check_password_policies: bool = False
     ) -> bool:
@@ -308,25 +362,17 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         # ignore all others (global groups and $OU-groups)
         mandatory_groups = await self.groups_used(lo)
         for group_dn in [dn for dn in udm_obj.props.groups if dn not in mandatory_groups]:
-            try:
-                school_class = await SchoolClass.from_dn(group_dn, None, lo)
-                classes = self.school_classes.get(school_class.school, [])
-                if school_class.name not in classes and school_class.get_relative_name() not in classes:
-                    self.logger.debug("Removing %r from SchoolClass %r.", self, group_dn)
-                    udm_obj.props.groups.remove(group_dn)
-            # it's not a class but could be a workgroup
-            except noObject:
-                try:
-                    workgroup = await WorkGroup.from_dn(group_dn, None, lo)
-                    workgroups = self.workgroups.get(workgroup.school, [])
-                    if (
-                        workgroup.name not in workgroups
-                        and workgroup.get_relative_name() not in workgroups
-                    ):
-                        self.logger.debug("Removing %r from WorkGroup %r.", self, group_dn)
-                        udm_obj.props.groups.remove(group_dn)
-                except noObject:
-                    continue
+            school = self.get_school_from_dn(group_dn)
+            if school is None:
+                continue
+            kind = self._classify_group(school, group_dn)
+            if kind is None:
+                continue
+            group = kind.cache(self.get_name_from_dn(group_dn), school)
+            wanted = (self.school_classes if kind is SchoolClass else self.workgroups).get(school, [])
+            if group.name not in wanted and group.get_relative_name() not in wanted:
+                self.logger.debug("Removing %r from %s %r.", self, type(group).__name__, group_dn)
+                udm_obj.props.groups.remove(group_dn)
 
         # make sure user is in all mandatory groups and school classes
         current_groups = set(grp_dn.lower() for grp_dn in udm_obj.props.groups)
@@ -458,7 +504,7 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
                 "(&(univentionObjectType=users/user)(!(uid=%s))(mailPrimaryAddress=%s))",
                 (self.name, self.email),
             )
-            if uldap_exists(filter_s):
+            if await uldap_exists_async(filter_s):
                 self.add_error(
                     "email",
                     _(
@@ -644,7 +690,7 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         """
         filter_s, search_base = group_dn.split(",", 1)
         filter_s = f"({filter_s})"
-        if uldap_exists(search_filter=filter_s, search_base=search_base):
+        if await uldap_exists_async(search_filter=filter_s, search_base=search_base):
             return
         name = cls.get_name_from_dn(group_dn)
         school = cls.get_school_from_dn(group_dn)
@@ -710,7 +756,7 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         school_classes = {}
         for group in udm_obj.props.groups:
             for school in obj.schools:
-                if Group.is_school_class(school, group):
+                if cls._classify_group(school, group) is SchoolClass:
                     school_class_name = cls.get_name_from_dn(group)
                     school_classes.setdefault(school, []).append(school_class_name)
         return school_classes
@@ -720,7 +766,7 @@ class User(RoleSupportMixin, UCSSchoolHelperAbstractClass):
         workgroups = {}
         for group in udm_obj.props.groups:
             for school in obj.schools:
-                if Group.is_school_workgroup(school, group):
+                if cls._classify_group(school, group) is WorkGroup:
                     workgroup_name = cls.get_name_from_dn(group)
                     workgroups.setdefault(school, []).append(workgroup_name)
         return workgroups
@@ -5,6 +5,8 @@
 # SPDX-FileCopyrightText: 2014-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import asyncio
+import contextvars
 import copy
 import grp
 import logging
@@ -15,14 +17,15 @@ import subprocess
 import sys
 from collections import OrderedDict
 from collections.abc import Mapping
+from concurrent.futures import Executor
 from contextlib import contextmanager
-from functools import lru_cache
+from functools import lru_cache, partial
 from importlib.resources import files
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 from random import shuffle
 from secrets import choice
-from typing import IO, Any, Dict, List, Sequence, Tuple, Union
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import colorlog
 import lazy_object_proxy
@@ -37,6 +40,8 @@ from univention.config_registry import ConfigRegistry, handler_set
 # from univention.lib.policy_result import policy_result
 from univention.lib.i18n import Translation
 
+from .cache import POLICY_CACHE_TTL, SCHOOL_CACHE_MAXSIZE, LRUCache
+
 # "global" translation for ucsschool.lib.models
 _ = Translation("python-ucs-school").translate
 
@@ -101,7 +106,7 @@ MACHINE_PASSWORD_FILE = "/etc/machine.secret"  # noqa: S105
 DEFAULT_UCS_SSL_CA_CERT = "/usr/local/share/ca-certificates/ucs.crt"
 
 _handler_cache: Dict[str, logging.Handler] = {}
-_pw_length_cache: Dict[str, int] = {}
+_pw_length_cache = LRUCache("utils.pw_length", SCHOOL_CACHE_MAXSIZE, ttl=POLICY_CACHE_TTL)
 _udm_kwargs: Dict[str, str] = {}
 ucr: ConfigRegistry = lazy_object_proxy.Proxy(_ucr)  # "global" ucr for ucsschool.lib.models
 ucr_username_max_length: int = lazy_object_proxy.Proxy(
@@ -617,3 +622,30 @@ def uldap_exists(search_filter: str, search_base: str = None) -> bool:
     uldap = uldap_admin_read_primary() if not on_primary else uldap_admin_read_local()
     search_base = search_base or uldap.settings.ldap_base
     return bool(uldap.search_dn(search_filter=search_filter, search_base=search_base))
+
+
+_uldap_executor: Optional[Executor] = None
+
+
+def set_uldap_executor(executor: Optional[Executor]) -> None:
+    """
+    Run the LDAP searches of `uldap_exists_async()` in `executor`, e.g. the
+    LDAP thread pool of the application, which also shuts it down.
+
+    Without one (`None`), the default executor of the event loop is used.
+    """
+    global _uldap_executor
+    _uldap_executor = executor
+
+
+async def uldap_exists_async(search_filter: str, search_base: str = None) -> bool:
+    """
+    Like `uldap_exists()`, but the blocking LDAP search runs in the executor
+    set with `set_uldap_executor()`, so the event loop can serve other
+    requests in the meantime.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _uldap_executor, partial(ctx.run, uldap_exists, search_filter, search_base)
+    )
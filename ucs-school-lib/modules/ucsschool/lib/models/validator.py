@@ -5,12 +5,19 @@
 # SPDX-FileCopyrightText: 2021-2026 Univention GmbH
 # SPDX-License-Identifier: AGPL-3.0-only
 
+import atexit
 import logging
 import os
+import queue
 import re
+import threading
+import time
 import traceback
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from collections import OrderedDict
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type, Union
 
 import lazy_object_proxy
 import ldap
@@ -40,23 +47,120 @@ from udm_rest_client import UdmObject
 
 LOG_FILE = "/var/log/univention/ucsschool-kelvin-rest-api/ucs-school-validation.log"
 VALIDATION_LOGGER = "UCSSchool-Validation"
+REPORT_CACHE_SIZE = 10240
+DEFAULT_REPORT_DEDUP_SECONDS = 3600
+DEFAULT_REPORTS_PER_MINUTE = 600
 
 
 def get_private_data_logger():
+    """
+    Logger for sensitive data. The (blocking) file handler is fed through a
+    queue by a background thread, so validating objects never waits for I/O.
+    """
     _private_data_logger = None
     if os.geteuid() == 0:
         _private_data_logger = logging.getLogger(VALIDATION_LOGGER)
         _private_data_logger.setLevel("DEBUG")
         backup_count = int(ucr.get("ucsschool/validation/logging/backupcount", "").strip() or 60)
-        _private_data_logger.addHandler(
-            get_file_handler("DEBUG", LOG_FILE, uid=0, gid=0, backupCount=backup_count)
-        )
+        file_handler = get_file_handler("DEBUG", LOG_FILE, uid=0, gid=0, backupCount=backup_count)
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        _private_data_logger.addHandler(QueueHandler(log_queue))
     return _private_data_logger
 
 
 private_data_logger = lazy_object_proxy.Proxy(get_private_data_logger)
 
 
+def _ucr_int(key: str, default: int) -> int:
+    try:
+        return int(ucr.get(key, "").strip() or default)
+    except ValueError:
+        return default
+
+
+class ValidationReport(NamedTuple):
+    """Decision of :py:meth:`ValidationReportLimiter.report` about one report."""
+
+    uuid: Optional[str]  # of the private report with the details, None if there is none
+    write: bool  # write this report (with `uuid`) to the private data logger
+    suppressed: int  # reports of the same object and errors suppressed before this one
+
+
+class _ReportState(object):
+    __slots__ = ("reported_at", "uuid", "suppressed")
+
+    def __init__(self) -> None:
+        self.reported_at: Optional[float] = None
+        self.uuid: Optional[str] = None
+        self.suppressed = 0
+
+
+class ValidationReportLimiter(object):
+    """
+    Deduplicates and rate-limits the reports written to the private data logger.
+
+    The same validation errors of the same object are written only once per
+    `dedup_seconds`. Independent of that, not more than `per_minute` reports are
+    written per minute. Suppressed reports are counted per object and errors and
+    the count is added to the next report of them that is written. A suppressed
+    report refers to the UUID of the written one, so the public log can still be
+    correlated with the private one.
+    """
+
+    def __init__(self, dedup_seconds: int, per_minute: int, maxsize: int = REPORT_CACHE_SIZE) -> None:
+        self.dedup_seconds = dedup_seconds
+        self.per_minute = per_minute
+        self.maxsize = maxsize
+        self._reports: "OrderedDict[Tuple[str, Tuple[str, ...]], _ReportState]" = OrderedDict()
+        self._window_start = 0.0
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+            self._window_start = 0.0
+            self._window_count = 0
+
+    def report(self, dn: str, errors: List[str]) -> ValidationReport:
+        key = (dn.lower(), tuple(errors))
+        now = time.monotonic()
+        with self._lock:
+            state = self._reports.get(key)
+            if state is None:
+                state = self._reports[key] = _ReportState()
+                while len(self._reports) > self.maxsize:
+                    self._reports.popitem(last=False)
+            self._reports.move_to_end(key)
+            if state.reported_at is not None and now - state.reported_at < self.dedup_seconds:
+                state.suppressed += 1
+                return ValidationReport(state.uuid, False, 0)
+            if now - self._window_start >= 60:
+                self._window_start = now
+                self._window_count = 0
+            if self.per_minute and self._window_count >= self.per_minute:
+                state.suppressed += 1
+                return ValidationReport(state.uuid, False, 0)
+            self._window_count += 1
+            suppressed, state.suppressed = state.suppressed, 0
+            state.reported_at = now
+            state.uuid = str(uuid.uuid4())
+            return ValidationReport(state.uuid, True, suppressed)
+
+
+report_limiter: ValidationReportLimiter = lazy_object_proxy.Proxy(
+    lambda: ValidationReportLimiter(
+        dedup_seconds=_ucr_int(
+            "ucsschool/validation/logging/dedup_seconds", DEFAULT_REPORT_DEDUP_SECONDS
+        ),
+        per_minute=_ucr_int("ucsschool/validation/logging/max_per_minute", DEFAULT_REPORTS_PER_MINUTE),
+    )
+)
+
+
 def get_position_from(dn: str) -> Optional[str]:
     # note: obj.position does not have a position
     return ldap.dn.dn2str(ldap.dn.str2dn(dn)[1:])
@@ -449,31 +553,40 @@ class MarketplaceShareValidator(GroupAndShareValidator):
     )
 
 
+_OPTION_VALIDATORS: Tuple[Tuple[Tuple[str, ...], Type[SchoolValidator]], ...] = (
+    (("ucsschoolExam",), ExamStudentValidator),
+    (("ucsschoolTeacher", "ucsschoolStaff"), TeachersAndStaffValidator),
+    (("ucsschoolStudent",), StudentValidator),
+    (("ucsschoolTeacher",), TeacherValidator),
+    (("ucsschoolLegalGuardian",), LegalGuardianValidator),
+    (("ucsschoolStaff",), StaffValidator),
+    (("ucsschoolAdministrator",), SchoolAdminValidator),
+)
+_POSITION_VALIDATORS: Tuple[Type[GroupAndShareValidator], ...] = (
+    SchoolClassValidator,
+    WorkGroupValidator,
+    ComputerroomValidator,
+    ClassShareValidator,
+)
+
+
+@lru_cache(maxsize=1024)
+def _get_class_for_position(position: str) -> Optional[Type[GroupAndShareValidator]]:
+    for validator_class in _POSITION_VALIDATORS:
+        if validator_class.position_regex.match(position):
+            return validator_class
+    return None
+
+
 def get_class(obj: Dict[str, Any]) -> Optional[Type[SchoolValidator]]:
     options = obj["options"]
+    for required_options, validator_class in _OPTION_VALIDATORS:
+        if all(options.get(option, False) for option in required_options):
+            return validator_class
     position = obj["position"]
-    if options.get("ucsschoolExam", False):
-        return ExamStudentValidator
-    if options.get("ucsschoolTeacher", False) and options.get("ucsschoolStaff", False):
-        return TeachersAndStaffValidator
-    if options.get("ucsschoolStudent", False):
-        return StudentValidator
-    if options.get("ucsschoolTeacher", False):
-        return TeacherValidator
-    if options.get("ucsschoolLegalGuardian", False):
-        return LegalGuardianValidator
-    if options.get("ucsschoolStaff", False):
-        return StaffValidator
-    if options.get("ucsschoolAdministrator", False):
-        return SchoolAdminValidator
-    if SchoolClassValidator.position_regex.match(position):
-        return SchoolClassValidator
-    if WorkGroupValidator.position_regex.match(position):
-        return WorkGroupValidator
-    if ComputerroomValidator.position_regex.match(position):
-        return ComputerroomValidator
-    if ClassShareValidator.position_regex.match(position):
-        return ClassShareValidator
+    validator_class = _get_class_for_position(position)
+    if validator_class:
+        return validator_class
     if MarketplaceShareValidator.dn_regex.match(obj["dn"]):
         # note: MarketplaceShares have the same position as WorkgroupShares,
         # but are unique for ous.
@@ -494,24 +607,38 @@ def validate(obj: Union[UdmObject, Dict[str, Any]], logger: logging.Logger = Non
         errors = validation_class.validate(dict_obj)
         errors = list(filter(None, errors))
         if errors:
-            validation_uuid = str(uuid.uuid4())
-            errors_str = "{} UCS@school Object {} with options {} has validation errors: {}".format(
-                validation_uuid,
-                dict_obj.get("dn", ""),
-                "{!r}".format(options),
-                ", ".join(errors),
-            )
             # ucrvs get copied from the host. In this process variables that are not
             # set on the host get set as empty strings in the container (instead of being not set).
             # Therefore I had to use this workaround of handling empty strings.
             # TODO fix workaround when 00_sync_to_docker has been improved.
             varname = "ucsschool/validation/logging/enabled"
-            if ucr.is_true(varname, True) or ucr.get(varname) in (
-                "",
-                None,
+            if not (
+                ucr.is_true(varname, True) or ucr.get(varname) in ("", None)
             ):  # tests: 00_validation_log_enabled
-                if logger:
+                return
+            dn = dict_obj.get("dn", "")
+            if private_data_logger:
+                report = report_limiter.report(dn, errors)
+            else:
+                report = ValidationReport(str(uuid.uuid4()), False, 0)
+            errors_str = "{} UCS@school Object {} with options {} has validation errors: {}".format(
+                report.uuid or str(uuid.uuid4()),
+                dn,
+                "{!r}".format(options),
+                ", ".join(errors),
+            )
+            if logger:
+                if report.uuid is None:
+                    # suppressed by the rate limit before a report of it was written
+                    logger.warning("%s (details not logged, too many reports)", errors_str)
+                else:
                     logger.warning(errors_str)
-                if private_data_logger:
-                    stack_trace = " ".join(traceback.format_stack()[:-2]).replace("\n", " ")
-                    private_data_logger.warning("\t".join([errors_str, str(dict_obj), stack_trace]))
+            if report.write:
+                # formatting the stack and the object is expensive, so only do it for
+                # reports that have not been seen recently
+                stack_trace = " ".join(traceback.format_stack()[:-2]).replace("\n", " ")
+                if report.suppressed:
+                    errors_str = "{} ({} similar reports suppressed)".format(
+                        errors_str, report.suppressed
+                    )
+                private_data_logger.warning("\t".join([errors_str, str(dict_obj), stack_trace]))
@@ -31,6 +31,7 @@ class PyHooksLoader(object):
     Loader for PyHooks.
 
     Use get_hook_objects() to get initialized and sorted objects.
+    Use get_model_hooks() to get the methods for one model class.
     Use get_hook_classes() if you want to initialize them yourself.
     """
 
@@ -69,6 +70,7 @@ class PyHooksLoader(object):
             raise TypeError("Argument 'filter_func' must be a callable, got {!r}.".format(filter_func))
         self._filter_func = filter_func
         self._pyhook_obj_cache: Dict[str, List[Callable[..., Any]]] = None
+        self._dispatch_table: Dict[Tuple[type, str], List[Callable[..., Any]]] = {}
 
     def drop_cache(self) -> None:
         """
@@ -79,6 +81,7 @@ class PyHooksLoader(object):
         :return: None
         """
         self._pyhook_obj_cache = None
+        self._dispatch_table = {}
         if self.base_class_name in self._hook_classes:
             del self._hook_classes[self.base_class_name]
 
@@ -168,6 +171,7 @@ class PyHooksLoader(object):
                     else:
                         self.logger.warning("Ignoring invalid priority item (%r : %r).", meth_name, prio)
             # sort by priority
+            self._dispatch_table = {}
             self._pyhook_obj_cache = dict()
             for meth_name, meth_list in iteritems(methods):
                 self._pyhook_obj_cache[meth_name] = [
@@ -188,6 +192,46 @@ class PyHooksLoader(object):
             )
         return self._pyhook_obj_cache
 
+    def get_model_hooks(
+        self, model: type, meth_name: str, *args: Any, **kwargs: Any
+    ) -> List[Callable[..., Any]]:
+        """
+        Get the methods `meth_name` of the initialized hook objects, whose
+        `model` attribute is `model` or one of its base classes, sorted by
+        priority.
+
+        The list is computed once per model class and method name, so models
+        without hooks are skipped with a single dict lookup. All methods are
+        checked to be coroutine functions when the list is computed.
+
+        :param type model: class of the object the hooks are run for
+        :param str meth_name: name of the hook method, e.g. `pre_create`
+        :param tuple args: arguments to pass to __init__ of hooks
+        :param dict kwargs: arguments to pass to __init__ of hooks
+        :return: list of methods of initialized hook objects, sorted by priority
+        :rtype: List[Callable]
+        :raises TypeError: if a method is not a coroutine function
+        """
+        key = (model, meth_name)
+        try:
+            return self._dispatch_table[key]
+        except KeyError:
+            pass
+        hooks = [
+            func
+            for func in self.get_hook_objects(*args, **kwargs).get(meth_name, [])
+            if inspect.isclass(getattr(func.__self__, "model", None))
+            and issubclass(model, func.__self__.model)
+        ]
+        for func in hooks:
+            if not inspect.iscoroutinefunction(func):
+                raise TypeError(
+                    f"Hook method {func.__self__.__class__.__name__}.{func.__name__} must be an async "
+                    f"function."
+                )
+        self._dispatch_table[key] = hooks
+        return hooks
+
     @staticmethod
     def _load_hook_class(
         module_name: str, info: Tuple[IO, str, Tuple[str, str, int]], super_class: Type[PyHookTV]
@@ -29,6 +29,7 @@ from ucsschool.lib.models.utils import (
     uldap_admin_read_primary,
     uldap_conf,
 )
+from ucsschool.lib.models.validator import report_limiter
 from ucsschool.lib.roles import (
     create_ucsschool_role_string,
     role_school_admin,
@@ -65,6 +66,14 @@ def event_loop(request):
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_validation_report_limiter():
+    """Tests expect every validation error to be written to the private data log."""
+    report_limiter.clear()
+    yield
+    report_limiter.clear()
+
+
 @pytest.fixture(scope="session")
 def docker_host_name():
     return env_or_ucr("docker_host_name")
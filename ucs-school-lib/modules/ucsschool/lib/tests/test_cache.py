@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import time
+
+import pytest
+
+from ucsschool.lib.models.cache import CacheInfo, LRUCache, cache_info
+from ucsschool.lib.models.group import SchoolClass, WorkGroup
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache("test_cache.lru", maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" is now the least recently used entry
+    cache["c"] = 3
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache["a"] == 1
+    assert cache["c"] == 3
+    assert cache.cache_info() == CacheInfo(hits=3, misses=1, evictions=1, maxsize=2, currsize=2)
+    assert cache_info()["test_cache.lru"] == cache.cache_info()
+
+
+def test_lru_cache_expires_entries(monkeypatch):
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = LRUCache("test_cache.ttl", maxsize=10, ttl=60)
+    cache["a"] = None
+    assert "a" in cache
+    assert cache["a"] is None
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert "a" not in cache
+    with pytest.raises(KeyError):
+        cache["a"]
+    assert len(cache) == 0
+
+
+def test_invalidate_cache_is_per_class():
+    SchoolClass.invalidate_all_caches()
+    before = SchoolClass._class_cache().cache_info()
+    school_class = SchoolClass.cache("DEMOSCHOOL-1a", "DEMOSCHOOL")
+    workgroup = WorkGroup.cache("DEMOSCHOOL-chess", "DEMOSCHOOL")
+    assert SchoolClass.cache("DEMOSCHOOL-1a", "DEMOSCHOOL") is school_class
+
+    SchoolClass.invalidate_cache()
+
+    assert SchoolClass.cache("DEMOSCHOOL-1a", "DEMOSCHOOL") is not school_class
+    assert WorkGroup.cache("DEMOSCHOOL-chess", "DEMOSCHOOL") is workgroup
+    after = cache_info()["SchoolClass.cache"]
+    assert (after.hits - before.hits, after.misses - before.misses, after.currsize) == (1, 2, 1)
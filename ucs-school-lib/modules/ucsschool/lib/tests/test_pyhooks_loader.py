@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+import pytest
+
+from ucsschool.lib.pyhooks import PyHook, PyHooksLoader
+
+HOOK_TEXT = """
+from ucsschool.lib.pyhooks import PyHook
+
+
+class {name}(PyHook):
+    model = {model}
+    priority = {{"pre_create": {prio}, "post_create": None}}
+
+    {async_}def pre_create(self, obj):
+        pass
+"""
+
+
+@pytest.fixture
+def hooks_loader(tmp_path):
+    def _func(*hooks):
+        for name, model, prio, async_ in hooks:
+            (tmp_path / f"{name.lower()}.py").write_text(
+                HOOK_TEXT.format(name=name, model=model, prio=prio, async_=async_)
+            )
+        loader = PyHooksLoader(str(tmp_path), PyHook)
+        loader.drop_cache()
+        return loader
+
+    yield _func
+    PyHooksLoader._hook_classes.clear()
+
+
+def test_get_model_hooks_dispatches_by_model(hooks_loader):
+    loader = hooks_loader(
+        ("BaseHook", "LookupError", 10, "async "),
+        ("ChildHook", "KeyError", 20, "async "),
+        ("OtherHook", "ValueError", 30, "async "),
+    )
+
+    hooks = loader.get_model_hooks(KeyError, "pre_create")
+
+    assert [func.__self__.__class__.__name__ for func in hooks] == ["ChildHook", "BaseHook"]
+    assert loader.get_model_hooks(KeyError, "pre_create") is hooks
+    assert loader.get_model_hooks(KeyError, "post_create") == []
+    assert loader.get_model_hooks(TypeError, "pre_create") == []
+
+
+def test_get_model_hooks_requires_coroutine_functions(hooks_loader):
+    loader = hooks_loader(("SyncHook", "LookupError", 10, ""))
+
+    with pytest.raises(TypeError, match="SyncHook.pre_create must be an async function"):
+        loader.get_model_hooks(KeyError, "pre_create")
@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""The concurrent creation of the default containers of a school."""
+
+import asyncio
+from typing import Hashable, List, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from ucsschool.lib.models.misc import Container
+from ucsschool.lib.models.school import OU_BOOTSTRAP_CONCURRENCY, School, _gather_bounded
+
+
+class _Recorder:
+    """Records when fake creates start and end, and how many run at the same time."""
+
+    def __init__(self, fail: Tuple[Hashable, ...] = ()) -> None:
+        self.fail = fail
+        self.events: List[Tuple[str, Hashable]] = []
+        self.running = 0
+        self.max_running = 0
+
+    def started(self) -> List[Hashable]:
+        return [key for event, key in self.events if event == "start"]
+
+    def finished(self) -> List[Hashable]:
+        return [key for event, key in self.events if event == "end"]
+
+    async def __call__(self, key: Hashable, delay: float = 0.01) -> Hashable:
+        self.events.append(("start", key))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(delay)
+            if key in self.fail:
+                raise ValueError(key)
+        finally:
+            self.running -= 1
+        self.events.append(("end", key))
+        return key
+
+
+@pytest.fixture
+def fake_container_create(monkeypatch):
+    def _patch(fail: Tuple[str, ...] = ()) -> _Recorder:
+        recorder = _Recorder(fail)
+
+        async def exists(self, lo) -> bool:
+            return False
+
+        async def create(self, lo, validate: bool = True) -> bool:
+            await recorder(self.dn)
+            return True
+
+        monkeypatch.setattr(Container, "exists", exists)
+        monkeypatch.setattr(Container, "create", create)
+        return recorder
+
+    return _patch
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_limits_concurrency():
+    recorder = _Recorder()
+    keys = list(range(3 * OU_BOOTSTRAP_CONCURRENCY))
+
+    assert await _gather_bounded(recorder(key) for key in keys) == keys
+    assert recorder.max_running == OU_BOOTSTRAP_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_raises_first_failure_in_order():
+    recorder = _Recorder(fail=(2, 4))
+    delays = {2: 0.1, 4: 0.01}
+    keys = range(3 * OU_BOOTSTRAP_CONCURRENCY)
+
+    with pytest.raises(ValueError) as exc_info:
+        await _gather_bounded(recorder(key, delays.get(key, 0.05)) for key in keys)
+
+    assert exc_info.value.args == (2,)
+    # the ones after the first failure that had not finished were cancelled
+    assert sorted(recorder.finished()) == [0, 1, 3]
+    assert len(recorder.started()) < len(keys)
+
+
+@pytest.mark.asyncio
+async def test_default_containers_are_created_level_by_level(fake_container_create):
+    recorder = fake_container_create()
+    school = School(name="demo")
+
+    await school.create_default_containers(Mock())
+
+    created = recorder.started()
+    assert f"cn=dc,cn=server,cn=computers,{school.dn}" in created
+    for dn in created:
+        parent = dn.split(",", 1)[1]
+        if parent != school.dn:
+            assert recorder.events.index(("end", parent)) < recorder.events.index(("start", dn))
+    assert recorder.max_running <= OU_BOOTSTRAP_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_default_containers_stop_at_first_failure(fake_container_create):
+    school = School(name="demo")
+    users = f"cn=users,{school.dn}"
+    recorder = fake_container_create(fail=(users, f"cn=shares,{school.dn}"))
+
+    with pytest.raises(ValueError) as exc_info:
+        await school.create_default_containers(Mock())
+
+    assert exc_info.value.args == (users,)
+    assert not [dn for dn in recorder.started() if dn.endswith(f",{users}")]
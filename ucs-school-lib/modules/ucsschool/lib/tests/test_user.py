@@ -172,6 +172,26 @@ async def test_from_udm_obj(create_ou_using_python, new_udm_user, udm_kwargs, ro
             compare_attr_and_lib_user(attr, user)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("role", USER_ROLES, ids=role_id)
+async def test_batch_conversion(create_ou_using_python, new_udm_user, udm_kwargs, role: Role):
+    ou = await create_ou_using_python()
+    dn1, attr1 = await new_udm_user(ou, role.name)
+    dn2, attr2 = await new_udm_user(ou, role.name)
+    async with UDM(**udm_kwargs) as udm:
+        udm_mod = udm.get(User._meta.udm_module)
+        udm_objs = [await udm_mod.get(dn1), await udm_mod.get(dn2)]
+        with User.batch_conversion():
+            users = [await User.from_udm_obj(udm_obj, ou, udm) for udm_obj in udm_objs]
+        assert len(users) == 2
+        for attr, user in zip((attr1, attr2), users):
+            assert isinstance(user, role.klass)
+            compare_attr_and_lib_user(attr, user)
+            single_user = await User.from_udm_obj(await udm_mod.get(user.dn), ou, udm)
+            assert user.school_classes == single_user.school_classes
+            assert user.workgroups == single_user.workgroups
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("role", USER_ROLES, ids=role_id)
 async def test_get_all(create_ou_using_python, new_udm_user, udm_kwargs, role: Role):
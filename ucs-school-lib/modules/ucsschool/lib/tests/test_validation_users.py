@@ -9,6 +9,7 @@ except ImportError:
     pass
 
 import tempfile
+from unittest import mock
 
 import pytest
 from faker import Faker
@@ -25,6 +26,7 @@ from ucsschool.lib.models.validator import (
     StudentValidator,
     TeachersAndStaffValidator,
     TeacherValidator,
+    ValidationReportLimiter,
     get_class,
     validate,
 )
@@ -936,3 +938,66 @@ def test_role_and_context_variations(validator, user_generator):
     # conversion for the validator result is needed here, as the validator creates duplicate
     # error strings --> Bug #55401
     assert expected_errstr == [*set(validator_result)]
+
+
+def test_repeated_validation_errors_are_logged_privately_once(caplog, random_logger):
+    user_dict = student_user()
+    user_dict["props"]["school"] = []
+    validate(user_dict, logger=random_logger)
+    validate(user_dict, logger=random_logger)
+    public_logs = [m for n, _, m in caplog.record_tuples if n == random_logger.name]
+    secret_logs = [m for n, _, m in caplog.record_tuples if n == VALIDATION_LOGGER]
+    assert len(public_logs) == 2
+    assert len(secret_logs) == 1
+
+
+def test_repeated_validation_errors_refer_to_the_private_report(caplog, random_logger):
+    user_dict = student_user()
+    user_dict["props"]["school"] = []
+    validate(user_dict, logger=random_logger)
+    validate(user_dict, logger=random_logger)
+    public_logs = [m for n, _, m in caplog.record_tuples if n == random_logger.name]
+    secret_logs = [m for n, _, m in caplog.record_tuples if n == VALIDATION_LOGGER]
+    uuids = {re.search(r"^([0-9a-f\-]+)", log).group(1) for log in public_logs + secret_logs}
+    assert len(uuids) == 1
+
+
+def test_report_limiter_dedup():
+    limiter = ValidationReportLimiter(dedup_seconds=3600, per_minute=0)
+    first = limiter.report("uid=a,ou=x", ["error 1"])
+    assert first.write and first.uuid
+    assert limiter.report("UID=A,OU=X", ["error 1"]) == (first.uuid, False, 0)
+    assert limiter.report("uid=a,ou=x", ["error 2"]).write
+    assert limiter.report("uid=b,ou=x", ["error 1"]) == (mock.ANY, True, 0)
+    limiter.clear()
+    assert limiter.report("uid=a,ou=x", ["error 1"]).write
+
+
+def test_report_limiter_dedup_expires():
+    limiter = ValidationReportLimiter(dedup_seconds=0, per_minute=0)
+    first = limiter.report("uid=a,ou=x", ["error 1"])
+    second = limiter.report("uid=a,ou=x", ["error 1"])
+    assert second.write
+    assert second.uuid != first.uuid
+
+
+def test_report_limiter_rate_limit():
+    limiter = ValidationReportLimiter(dedup_seconds=0, per_minute=2)
+    assert limiter.report("uid=a,ou=x", ["error"]).write
+    assert limiter.report("uid=b,ou=x", ["error"]).write
+    # no report of "c" was written, so there is nothing to refer to
+    assert limiter.report("uid=c,ou=x", ["error"]) == (None, False, 0)
+    assert limiter.report("uid=a,ou=x", ["error"]).write is False
+    limiter._window_start -= 60
+    # the suppressed reports are counted per object and errors
+    assert limiter.report("uid=b,ou=x", ["error"]) == (mock.ANY, True, 0)
+    assert limiter.report("uid=a,ou=x", ["error"]) == (mock.ANY, True, 1)
+    assert limiter.report("uid=a,ou=x", ["error"]).write is False
+
+
+def test_report_limiter_is_bounded():
+    limiter = ValidationReportLimiter(dedup_seconds=3600, per_minute=0, maxsize=2)
+    for name in ("a", "b", "c"):
+        assert limiter.report(f"uid={name},ou=x", ["error"]).write
+    # the oldest entry was evicted, so it is reported again
+    assert limiter.report("uid=a,ou=x", ["error"]).write
@@ -0,0 +1,460 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark the managers (and optionally the Kelvin v2 routes) on a synthetic district.
+
+Seeds a database with the schools, school classes, workgroups and users of
+``to_domain.py`` and times search, get, create and modify of users and
+groups through a ``KelvinStorageSessionFactory``, one storage session per
+call, as a request would. For each operation the latency percentiles, the
+SQL statements per call and the peak memory of one call are reported.
+
+Without ``--url`` an in-memory SQLite database is used. A PostgreSQL
+database given with ``--url`` (or ``BENCHMARK_DATABASE_URL``) must have no
+tables: they are created before and dropped after the run. ``--force`` uses a
+database with tables anyway, and drops all tables of the Kelvin DB schema
+afterwards, with their data.
+
+With ``--v2`` the read routes of the Kelvin v2 API are measured in-process
+through an ASGI client as well. This needs the Kelvin API and its
+dependencies to be importable (e.g. inside the Kelvin container).
+
+``--save-baseline FILE`` stores the results as JSON. ``--baseline FILE``
+compares against stored results and exits with 1 if the p95 latency of an
+operation exceeds the baseline by more than ``--tolerance`` or an operation
+executes more SQL statements per call than before.
+
+Run with::
+
+    uv run python benchmarks/district.py [--users 10000] [--schools 20] [--groups 5] [--calls 50]
+    uv run python benchmarks/district.py --url postgresql+psycopg://bench@localhost/bench
+    uv run python benchmarks/district.py --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event, inspect, make_url
+from to_domain import build_users
+from ucsschool_objects import (
+    Filter,
+    Group,
+    KelvinStorageSessionFactory,
+    LoadSpec,
+    Operator,
+    SearchQuery,
+    User,
+)
+from ucsschool_objects.core.adapters.sqlalchemy import (
+    DatabaseSettings,
+    build_engine,
+    build_kelvin_storage_session_factory,
+)
+from ucsschool_objects.database_models import Base
+
+USER_LOAD_SPEC = LoadSpec.from_attributes(
+    "record_uid",
+    "source_uid",
+    "name",
+    "firstname",
+    "lastname",
+    "email",
+    "birthday",
+    "expiration_date",
+    "active",
+    "udm_properties",
+    "school_memberships",
+    "legal_guardians",
+    "legal_wards",
+)
+GROUP_LOAD_SPEC = LoadSpec.from_attributes(
+    "record_uid",
+    "source_uid",
+    "name",
+    "display_name",
+    "create_share",
+    "roles",
+    "members",
+    "school",
+    "description",
+    "udm_properties",
+)
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass(slots=True)
+class District:
+    storage: KelvinStorageSessionFactory
+    school_names: list[str]
+    user_ids: list[uuid.UUID]
+    user_names: list[str]
+    group_ids: list[uuid.UUID]
+    group_paths: list[str]
+    template_user: User
+    template_group: Group
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    calls: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    queries_per_call: float
+    peak_kib: float
+
+
+Operation = Callable[[District, int], Awaitable[object]]
+
+
+class QueryCounter:
+    """Counts the SQL statements executed by an engine."""
+
+    def __init__(self, engine: Any) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *_args: object) -> None:
+        self.count += 1
+
+
+def percentile(sorted_values: list[float], percent: int) -> float:
+    index = round(percent / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+# --- manager operations ---------------------------------------------------------------------------
+
+
+def _school_query(district: District, index: int, field: str) -> SearchQuery:
+    school = district.school_names[index % len(district.school_names)]
+    return SearchQuery(where=Filter(field=field, op=Operator.EQ, value=school))
+
+
+async def search_users(district: District, index: int) -> object:
+    async with district.storage.session_scope() as storage:
+        query = _school_query(district, index, "schools.name")
+        return list(await storage.users.search(query, load=USER_LOAD_SPEC))
+
+
+async def search_user_rows(district: District, index: int) -> object:
+    async with district.storage.session_scope() as storage:
+        return await storage.user_rows.search(_school_query(district, index, "schools.name"))
+
+
+async def get_user(district: District, index: int) -> object:
+    async with district.storage.session_scope() as storage:
+        user_id = district.user_ids[index % len(district.user_ids)]
+        return await storage.users.get(user_id, load=USER_LOAD_SPEC)
+
+
+async def create_user(district: District, index: int) -> object:
+    template = district.template_user
+    user = User(
+        public_id=uuid.uuid4(),
+        record_uid=f"bench-user{index}",
+        source_uid="bench",
+        name=f"bench-user{index}",
+        firstname="Bench",
+        lastname=f"User{index}",
+        active=True,
+        school_memberships=template.school_memberships,
+        legal_wards=set(),
+        legal_guardians=set(),
+        udm_properties={},
+    )
+    async with district.storage.transaction_scope() as storage:
+        await storage.users.create(user)
+    return user
+
+
+async def modify_user(district: District, index: int) -> object:
+    async with district.storage.transaction_scope() as storage:
+        user_id = district.user_ids[index % len(district.user_ids)]
+        return await storage.users.modify(
+            user_id, [{"op": "replace", "path": "/lastname", "value": f"Modified{index}"}]
+        )
+
+
+async def search_groups(district: District, index: int) -> object:
+    async with district.storage.session_scope() as storage:
+        query = _school_query(district, index, "school.name")
+        return list(await storage.groups.search(query, load=GROUP_LOAD_SPEC))
+
+
+async def get_group(district: District, index: int) -> object:
+    async with district.storage.session_scope() as storage:
+        group_id = district.group_ids[index % len(district.group_ids)]
+        return await storage.groups.get(group_id, load=GROUP_LOAD_SPEC)
+
+
+async def create_group(district: District, index: int) -> object:
+    template = district.template_group
+    group = Group(
+        public_id=uuid.uuid4(),
+        record_uid=f"{template.school.name}-bench{index}",
+        source_uid="bench",
+        name=f"{template.school.name}-bench{index}",
+        display_name=f"Bench {index}",
+        create_share=False,
+        roles=template.roles,
+        allowed_email_senders_users=set(),
+        allowed_email_senders_groups=set(),
+        members=set(),
+        member_roles=set(),
+        school=template.school,
+        email=None,
+        description=None,
+        udm_properties={},
+    )
+    async with district.storage.transaction_scope() as storage:
+        await storage.groups.create(group)
+    return group
+
+
+async def modify_group(district: District, index: int) -> object:
+    async with district.storage.transaction_scope() as storage:
+        group_id = district.group_ids[index % len(district.group_ids)]
+        return await storage.groups.modify(
+            group_id, [{"op": "replace", "path": "/display_name", "value": f"Modified {index}"}]
+        )
+
+
+MANAGER_OPERATIONS: dict[str, Operation] = {
+    "users.search": search_users,
+    "user_rows.search": search_user_rows,
+    "users.get": get_user,
+    "users.create": create_user,
+    "users.modify": modify_user,
+    "groups.search": search_groups,
+    "groups.get": get_group,
+    "groups.create": create_group,
+    "groups.modify": modify_group,
+}
+
+
+# --- Kelvin v2 routes -----------------------------------------------------------------------------
+
+
+def v2_operations(district: District) -> dict[str, Operation]:
+    """GET requests to the v2 read routes, sent in-process through an ASGI client."""
+    import httpx
+    from fastapi import APIRouter, FastAPI
+
+    from ucsschool.kelvin.constants import URL_API_V2_PREFIX
+    from ucsschool.kelvin.routers import v2
+    from ucsschool.kelvin.token_auth import get_kelvin_reader
+
+    app = FastAPI()
+    router = APIRouter(prefix=URL_API_V2_PREFIX)
+    for prefix, module in (
+        ("/classes", v2.school_class),
+        ("/workgroups", v2.workgroup),
+        ("/schools", v2.school),
+        ("/users", v2.user),
+    ):
+        router.include_router(module.router, prefix=prefix)
+    app.include_router(router)
+    app.state.storage_session_factory = district.storage
+    app.dependency_overrides[get_kelvin_reader] = lambda: None
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="https://kelvin.bench")
+
+    def _get(url: Callable[[int], str]) -> Operation:
+        async def _request(_district: District, index: int) -> object:
+            response = await client.get(f"{URL_API_V2_PREFIX}{url(index)}")
+            response.raise_for_status()
+            return response.content
+
+        return _request
+
+    def _school(index: int) -> str:
+        return district.school_names[index % len(district.school_names)]
+
+    def _group(index: int) -> str:
+        return district.group_paths[index % len(district.group_paths)]
+
+    return {
+        "v2 GET /users/?school": _get(lambda index: f"/users/?school={_school(index)}"),
+        "v2 GET /users/{name}": _get(
+            lambda index: f"/users/{district.user_names[index % len(district.user_names)]}"
+        ),
+        "v2 GET /classes/?school": _get(lambda index: f"/classes/?school={_school(index)}"),
+        "v2 GET /workgroups/?school": _get(lambda index: f"/workgroups/?school={_school(index)}"),
+        "v2 GET /{classes,workgroups}/{school}/{name}": _get(_group),
+        "v2 GET /schools/{name}": _get(lambda index: f"/schools/{_school(index)}"),
+    }
+
+
+# --- harness --------------------------------------------------------------------------------------
+
+
+async def measure(operation: Operation, district: District, counter: QueryCounter, calls: int) -> Result:
+    await operation(district, -1)  # warm up caches and compiled statements
+    timings = []
+    queries = counter.count
+    for index in range(calls):
+        start = time.perf_counter()
+        await operation(district, index)
+        timings.append(time.perf_counter() - start)
+    queries = counter.count - queries
+
+    gc.collect()
+    tracemalloc.start()
+    await operation(district, calls)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    p50, p95, p99 = (percentile(timings, percent) * 1000 for percent in PERCENTILES)
+    return Result(
+        calls=calls,
+        p50_ms=round(p50, 3),
+        p95_ms=round(p95, 3),
+        p99_ms=round(p99, 3),
+        max_ms=round(timings[-1] * 1000, 3),
+        queries_per_call=round(queries / calls, 2),
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+async def seed(storage: KelvinStorageSessionFactory, args: argparse.Namespace) -> District:
+    models = build_users(args.users, args.schools, args.groups)
+    async with storage.transaction_scope() as scope:
+        scope.session.add_all(models)
+    school_names = sorted(
+        {membership.school.name for user in models for membership in user.school_memberships}
+    )
+    groups = {
+        group.public_id: group for user in models for m in user.school_memberships for group in m.groups
+    }
+    routes = {"school_class": "classes", "workgroup": "workgroups"}
+    async with storage.session_scope() as scope:
+        template_user = await scope.users.get(models[0].public_id, load=USER_LOAD_SPEC)
+        template_group = await scope.groups.get(next(iter(groups)), load=GROUP_LOAD_SPEC)
+    shuffled = random.Random(0).sample(models, len(models))  # noqa: S311
+    return District(
+        storage=storage,
+        school_names=school_names,
+        user_ids=[user.public_id for user in shuffled],
+        user_names=[user.name for user in shuffled],
+        group_ids=list(groups),
+        # v2 paths of the groups: /{classes,workgroups}/{school}/{name without school prefix}
+        group_paths=[
+            f"/{routes[group.roles[0].name]}/{group.school.name}/{group.name.split('-', 1)[1]}"
+            for group in groups.values()
+        ],
+        template_user=template_user,
+        template_group=template_group,
+    )
+
+
+def compare(
+    results: dict[str, Result], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """Descriptions of the operations that are slower or run more queries than in ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        allowed_ms = baseline[name]["p95_ms"] * (1 + tolerance)
+        if result.p95_ms > allowed_ms:
+            regressions.append(f"{name}: p95 {result.p95_ms:.1f} ms > {allowed_ms:.1f} ms")
+        if result.queries_per_call > baseline[name]["queries_per_call"]:
+            regressions.append(
+                f"{name}: {result.queries_per_call} queries per call > "
+                f"{baseline[name]['queries_per_call']}"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = build_engine(DatabaseSettings(url=make_url(args.url)))
+    async with engine.begin() as connection:
+        tables = await connection.run_sync(lambda sync: inspect(sync).get_table_names())
+        if tables and not args.force:
+            print(
+                f"Database {args.url!r} has tables ({', '.join(sorted(tables))}), not using it."
+                " The benchmark drops the tables after the run, use --force to do that anyway.",
+                file=sys.stderr,
+            )
+            await engine.dispose()
+            return 2
+        await connection.run_sync(Base.metadata.create_all)
+    try:
+        storage = build_kelvin_storage_session_factory(engine)
+        start = time.perf_counter()
+        district = await seed(storage, args)
+        print(
+            f"{args.users} users, {args.schools} schools, {len(district.group_ids)} groups,"
+            f" {args.groups} groups per user, seeded in {time.perf_counter() - start:.1f} s"
+        )
+
+        operations = dict(MANAGER_OPERATIONS)
+        if args.v2:
+            operations.update(v2_operations(district))
+        counter = QueryCounter(engine)
+        results = {}
+        columns = ("p50 ms", "p95 ms", "p99 ms", "max ms", "queries")
+        print(f"{'operation':<44}", *(f"{column:>8}" for column in columns), f"{'peak KiB':>9}")
+        for name, operation in operations.items():
+            result = results[name] = await measure(operation, district, counter, args.calls)
+            print(
+                f"{name:<44} {result.p50_ms:>8.1f} {result.p95_ms:>8.1f} {result.p99_ms:>8.1f}"
+                f" {result.max_ms:>8.1f} {result.queries_per_call:>8.1f} {result.peak_kib:>9.0f}"
+            )
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+    if args.save_baseline:
+        args.save_baseline.write_text(
+            json.dumps({name: asdict(result) for name, result in results.items()}, indent=2) + "\n"
+        )
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument(
+        "--url", default=os.environ.get("BENCHMARK_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    )
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--schools", type=int, default=20)
+    parser.add_argument("--groups", type=int, default=5, help="groups per user")
+    parser.add_argument("--calls", type=int, default=50, help="calls per operation")
+    parser.add_argument("--v2", action="store_true", help="also measure the Kelvin v2 read routes")
+    parser.add_argument("--baseline", type=Path, help="fail if results are worse than this file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", type=Path, help="write the results to this file")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="use a database that has tables, they are dropped after the run",
+    )
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
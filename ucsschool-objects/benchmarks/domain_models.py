@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Measure the memory used by domain objects of a realistic search result.
+
+Builds users with one school membership each (one role, several groups) and
+the groups and schools they reference, and reports the memory allocated
+for them as traced by ``tracemalloc``.
+
+Run with::
+
+    uv run python benchmarks/domain_models.py [--users 10000] [--groups 500] [--schools 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+import uuid
+from datetime import date
+
+from ucsschool_objects.core.domain.models import Group, Role, School, SchoolMembership, User
+
+
+def build_objects(users: int, groups: int, schools: int, groups_per_user: int) -> list[User]:
+    roles = [
+        Role(public_id=uuid.uuid4(), name=name, display_name={"en": name})
+        for name in ("student", "teacher", "staff", "school_class", "workgroup")
+    ]
+    school_objects = [
+        School(
+            public_id=uuid.uuid4(),
+            record_uid=f"school{index}",
+            source_uid="bench",
+            name=f"school{index}",
+            display_name=f"School {index}",
+            educational_servers={f"dc{index}"},
+            administrative_servers=set(),
+            class_share_file_server=f"dc{index}",
+            home_share_file_server=f"dc{index}",
+            udm_properties={},
+        )
+        for index in range(schools)
+    ]
+    group_objects = [
+        Group(
+            public_id=uuid.uuid4(),
+            record_uid=f"group{index}",
+            source_uid="bench",
+            name=f"group{index}",
+            display_name=f"Group {index}",
+            create_share=True,
+            roles={roles[3 + index % 2]},
+            email=None,
+            description=None,
+            school=school_objects[index % schools],
+            udm_properties={},
+        )
+        for index in range(groups)
+    ]
+    result = []
+    for index in range(users):
+        school = school_objects[index % schools]
+        user_groups = {
+            group_objects[(index + offset * schools) % groups] for offset in range(groups_per_user)
+        }
+        membership = SchoolMembership(
+            school=school,
+            is_primary=True,
+            roles={roles[index % 3]},
+            groups=user_groups,
+        )
+        result.append(
+            User(
+                public_id=uuid.uuid4(),
+                record_uid=f"user{index}",
+                source_uid="bench",
+                name=f"user{index}",
+                firstname="First",
+                lastname=f"Last{index}",
+                active=True,
+                email=None,
+                birthday=date(2010, 1, 1),
+                expiration_date=None,
+                udm_properties={},
+                school_memberships={school.public_id: membership},
+                legal_wards=set(),
+                legal_guardians=set(),
+            )
+        )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--groups", type=int, default=500)
+    parser.add_argument("--schools", type=int, default=10)
+    parser.add_argument("--groups-per-user", type=int, default=5)
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    objects = build_objects(args.users, args.groups, args.schools, args.groups_per_user)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{len(objects)} users, {args.groups} groups, {args.schools} schools, "
+        f"{args.groups_per_user} groups per user"
+    )
+    print(f"allocated: {current / 1024 / 1024:.1f} MiB (peak {peak / 1024 / 1024:.1f} MiB)")
+    print(f"per user:  {current / len(objects) / 1024:.2f} KiB")
+    print(f"User instance: {sys.getsizeof(objects[0])} bytes", end="")
+    if hasattr(objects[0], "__dict__"):
+        print(f" + {sys.getsizeof(objects[0].__dict__)} bytes __dict__", end="")
+    print()
+
+
+if __name__ == "__main__":
+    main()
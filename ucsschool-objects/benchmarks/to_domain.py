@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark the ORM to domain conversion of users.
+
+Builds a synthetic, fully loaded search result in memory (no database
+needed) and converts it once per user (each user in its own
+``ConversionContext``, as before the introduction of the context) and once
+with a context shared by the whole result (as ``UserManager.search()`` does).
+
+Run with::
+
+    uv run python benchmarks/to_domain.py [--users 1000] [--schools 10] [--groups 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import date
+
+from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_domain import ConversionContext, to_user
+from ucsschool_objects.core.domain.models import Group, Role, School, User
+from ucsschool_objects.database_models import (
+    Group as GroupModel,
+    Role as RoleModel,
+    School as SchoolModel,
+    SchoolMembership as SchoolMembershipModel,
+    User as UserModel,
+)
+
+GROUPS_PER_SCHOOL = 50
+
+
+def _school(index: int) -> SchoolModel:
+    return SchoolModel(
+        public_id=uuid.uuid4(),
+        record_uid=f"school{index}",
+        source_uid="bench",
+        name=f"school{index}",
+        display_name=f"School {index}",
+        educational_servers=[f"dc{index}"],
+        administrative_servers=[],
+        class_share_file_server=f"dc{index}",
+        home_share_file_server=f"dc{index}",
+        udm_properties={},
+    )
+
+
+def _role(name: str) -> RoleModel:
+    return RoleModel(public_id=uuid.uuid4(), name=name, display_name={"en": name})
+
+
+def _group(index: int, school: SchoolModel, role: RoleModel) -> GroupModel:
+    return GroupModel(
+        public_id=uuid.uuid4(),
+        record_uid=f"{school.name}-group{index}",
+        source_uid="bench",
+        name=f"{school.name}-group{index}",
+        display_name=f"Group {index}",
+        has_share=True,
+        email=None,
+        description=None,
+        udm_properties={},
+        school=school,
+        roles=[role],
+    )
+
+
+def build_users(users: int, schools: int, groups_per_user: int) -> list[UserModel]:
+    roles = [_role(name) for name in ("student", "teacher", "staff", "school_class", "workgroup")]
+    school_models = [_school(index) for index in range(schools)]
+    groups = {
+        school.name: [_group(index, school, roles[3 + index % 2]) for index in range(GROUPS_PER_SCHOOL)]
+        for school in school_models
+    }
+    result = []
+    for index in range(users):
+        school = school_models[index % schools]
+        user = UserModel(
+            public_id=uuid.uuid4(),
+            record_uid=f"user{index}",
+            source_uid="bench",
+            name=f"user{index}",
+            firstname="First",
+            lastname=f"Last{index}",
+            email=None,
+            birthday=date(2010, 1, 1),
+            expiration_date=None,
+            active=True,
+            udm_properties={},
+            legal_wards=[],
+            legal_guardians=[],
+        )
+        user.school_memberships = [
+            SchoolMembershipModel(
+                is_primary=True,
+                school=school,
+                roles=[roles[index % 3]],
+                groups=[
+                    groups[school.name][(index + offset) % GROUPS_PER_SCHOOL]
+                    for offset in range(groups_per_user)
+                ],
+            )
+        ]
+        result.append(user)
+    return result
+
+
+def convert_per_user(models: list[UserModel]) -> list[User]:
+    return [to_user(model) for model in models]
+
+
+def convert_shared(models: list[UserModel]) -> list[User]:
+    context = ConversionContext()
+    return [to_user(model, context) for model in models]
+
+
+def count_related_objects(users: list[User]) -> int:
+    seen: set[int] = set()
+    for user in users:
+        for membership in user.school_memberships.values():
+            related: list[School | Role | Group] = [membership.school, *membership.roles]
+            for group in membership.groups:
+                related.extend((group, group.school, *group.roles))
+            seen.update(id(obj) for obj in related)
+    return len(seen)
+
+
+def measure(convert: Callable[[list[UserModel]], list[User]], models: list[UserModel], repeat: int):
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        convert(models)
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    users = convert(models)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, count_related_objects(users)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--schools", type=int, default=10)
+    parser.add_argument("--groups", type=int, default=5, help="groups per user")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    models = build_users(args.users, args.schools, args.groups)
+    per_1000 = 1000 / args.users
+    print(f"{args.users} users, {args.schools} schools, {args.groups} groups per user")
+    print(f"{'conversion':<12} {'ms/1000 users':>14} {'peak KiB/1000 users':>20} {'objects':>8}")
+    for label, convert in (("per user", convert_per_user), ("shared", convert_shared)):
+        seconds, peak, related = measure(convert, models, args.repeat)
+        milliseconds = seconds * 1000 * per_1000
+        kib = peak / 1024 * per_1000
+        print(f"{label:<12} {milliseconds:>14.1f} {kib:>20.0f} {related:>8}")
+
+
+if __name__ == "__main__":
+    main()
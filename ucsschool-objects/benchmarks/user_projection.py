@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""
+Benchmark listing users through the manager versus the row projection.
+
+Stores the synthetic users of ``to_domain.py`` in an in-memory SQLite
+database and lists all of them once with ``SQLAlchemyUserManager.search()``
+(ORM instances, identity map, domain conversion) and once with
+``SQLAlchemyUserProjection.search()`` (plain rows). Each run uses a fresh
+session, as a request would.
+
+Run with::
+
+    uv run python benchmarks/user_projection.py [--users 1000] [--schools 10] [--groups 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from to_domain import build_users
+from ucsschool_objects import LoadSpec
+from ucsschool_objects.core.adapters.sqlalchemy import (
+    DatabaseSettings,
+    SQLAlchemyUserManager,
+    SQLAlchemyUserProjection,
+    build_engine,
+    build_session_factory,
+)
+from ucsschool_objects.database_models import Base
+
+LOAD_SPEC = LoadSpec.from_attributes(
+    "record_uid",
+    "source_uid",
+    "name",
+    "firstname",
+    "lastname",
+    "email",
+    "birthday",
+    "expiration_date",
+    "active",
+    "udm_properties",
+    "school_memberships",
+    "legal_guardians",
+    "legal_wards",
+)
+
+
+async def list_with_manager(session: AsyncSession) -> int:
+    return len(list(await SQLAlchemyUserManager(session).search(load=LOAD_SPEC)))
+
+
+async def list_with_projection(session: AsyncSession) -> int:
+    return len(await SQLAlchemyUserProjection(session).search())
+
+
+async def measure(
+    session_factory: async_sessionmaker[AsyncSession],
+    list_users: Callable[[AsyncSession], Awaitable[int]],
+    repeat: int,
+) -> tuple[float, int]:
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        async with session_factory() as session:
+            start = time.perf_counter()
+            count = await list_users(session)
+            timings.append(time.perf_counter() - start)
+    return min(timings), count
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = build_engine(DatabaseSettings(url=make_url("sqlite+aiosqlite:///:memory:")))
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = build_session_factory(engine)
+    async with session_factory() as session, session.begin():
+        session.add_all(build_users(args.users, args.schools, args.groups))
+
+    per_1000 = 1000 / args.users
+    print(f"{args.users} users, {args.schools} schools, {args.groups} groups per user")
+    print(f"{'listing':<12} {'ms/1000 users':>14} {'users':>8}")
+    for label, list_users in (("manager", list_with_manager), ("projection", list_with_projection)):
+        seconds, count = await measure(session_factory, list_users, args.repeat)
+        print(f"{label:<12} {seconds * 1000 * per_1000:>14.1f} {count:>8}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--schools", type=int, default=10)
+    parser.add_argument("--groups", type=int, default=5, help="groups per user")
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
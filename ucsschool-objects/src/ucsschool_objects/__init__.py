@@ -44,10 +44,23 @@ from ucsschool_objects.core.domain.models import (
 from ucsschool_objects.core.domain.patch import track_changes
 from ucsschool_objects.core.domain.ports.dn_mapper import DNIDMapper, ObjectType
 from ucsschool_objects.core.domain.ports.manager import Manager
+from ucsschool_objects.core.domain.ports.projection import (
+    ChangeProjection,
+    UserProjection,
+    VersionProjection,
+)
 from ucsschool_objects.core.domain.ports.unit_of_work import (
     KelvinStorageSession,
     KelvinStorageSessionFactory,
 )
+from ucsschool_objects.core.domain.projections import (
+    ChangeAction,
+    ChangeRow,
+    GroupRow,
+    SchoolMembershipRow,
+    UserRow,
+    VersionRow,
+)
 from ucsschool_objects.core.domain.query import (
     And,
     Filter,
@@ -75,6 +88,13 @@ __all__ = [
     "UNSET",
     "UnsetType",
     "User",
+    # Read projections
+    "ChangeAction",
+    "ChangeRow",
+    "GroupRow",
+    "SchoolMembershipRow",
+    "UserRow",
+    "VersionRow",
     # Query DSL
     "And",
     "Filter",
@@ -105,9 +125,12 @@ __all__ = [
     "UnsupportedOperation",
     "UnsupportedSortField",
     # Ports
+    "ChangeProjection",
     "KelvinStorageSession",
     "KelvinStorageSessionFactory",
     "Manager",
+    "UserProjection",
+    "VersionProjection",
     # DN Mapping
     "DNIDMapper",
     "ObjectType",
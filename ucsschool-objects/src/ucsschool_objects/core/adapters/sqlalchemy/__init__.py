@@ -18,6 +18,12 @@ from .managers.group_manager import SQLAlchemyGroupManager
 from .managers.role_manager import SQLAlchemyRoleManager
 from .managers.school_manager import SQLAlchemySchoolManager
 from .managers.user_manager import SQLAlchemyUserManager
+from .pool import PoolStatus, pool_status
+from .projections import (
+    SQLAlchemyChangeProjection,
+    SQLAlchemyUserProjection,
+    SQLAlchemyVersionProjection,
+)
 from .session import (
     DatabaseSettings,
     KelvinSqlAlchemySession,
@@ -26,6 +32,7 @@ from .session import (
     build_kelvin_storage_session_factory,
     build_session_factory,
     build_settings,
+    database_settings,
 )
 
 __all__ = [
@@ -35,12 +42,19 @@ __all__ = [
     "SQLAlchemyRoleManager",
     "SQLAlchemySchoolManager",
     "SQLAlchemyUserManager",
+    # Projections
+    "SQLAlchemyChangeProjection",
+    "SQLAlchemyUserProjection",
+    "SQLAlchemyVersionProjection",
     # Session / engine helpers
     "build_engine",
     "build_kelvin_storage_session_factory",
     "build_session_factory",
     "build_settings",
+    "database_settings",
     "DatabaseSettings",
+    "pool_status",
+    "PoolStatus",
     "KelvinSqlAlchemySession",
     "KelvinSqlAlchemySessionFactory",
     # Factory functions
@@ -0,0 +1,166 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Version counters and change log of users and groups.
+
+The managers increment the ``version`` of every user and group they change,
+and of the related objects that show the changed object in their
+representation: a user shows the names of its groups, legal guardians and
+legal wards, a group the names of its members, and both the names of their
+schools. An unchanged version therefore means an unchanged object.
+
+Every increment, creation and deletion is also appended to the change log,
+so the changes since a cursor can be listed without comparing all objects.
+
+Call these helpers after flushing, they query the association tables.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import insert, literal, null, select, union, update
+
+from ucsschool_objects.core.domain.ports.dn_mapper import ObjectType
+from ucsschool_objects.core.domain.projections import ChangeAction
+from ucsschool_objects.database_models import (
+    ChangeLog,
+    Group as GroupModel,
+    GroupMemberAssociation,
+    LegalGuardianAssociation,
+    School as SchoolModel,
+    SchoolMembership,
+    User as UserModel,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Same batch size as the projections, well below the bind parameter limits.
+_BUMP_CHUNK_SIZE = 500
+
+
+async def user_group_ids(session: AsyncSession, user_ids: Collection[int]) -> set[int]:
+    """IDs of the groups the users are members of."""
+    stmt = (
+        select(GroupMemberAssociation.group_id)
+        .join(SchoolMembership, SchoolMembership.id == GroupMemberAssociation.school_membership_id)
+        .where(SchoolMembership.user_id.in_(user_ids))
+    )
+    return set((await session.scalars(stmt)).all())
+
+
+async def user_family_ids(session: AsyncSession, user_ids: Collection[int]) -> set[int]:
+    """IDs of the legal guardians and legal wards of the users."""
+    stmt = union(
+        select(LegalGuardianAssociation.legal_guardian_id).where(
+            LegalGuardianAssociation.legal_ward_id.in_(user_ids)
+        ),
+        select(LegalGuardianAssociation.legal_ward_id).where(
+            LegalGuardianAssociation.legal_guardian_id.in_(user_ids)
+        ),
+    )
+    return {row[0] for row in await session.execute(stmt)}
+
+
+async def group_member_ids(session: AsyncSession, group_ids: Collection[int]) -> set[int]:
+    """IDs of the users that are members of the groups."""
+    stmt = (
+        select(SchoolMembership.user_id)
+        .join(
+            GroupMemberAssociation,
+            GroupMemberAssociation.school_membership_id == SchoolMembership.id,
+        )
+        .where(GroupMemberAssociation.group_id.in_(group_ids))
+    )
+    return set((await session.scalars(stmt)).all())
+
+
+async def school_member_ids(session: AsyncSession, school_ids: Collection[int]) -> set[int]:
+    """IDs of the users that are members of the schools."""
+    stmt = select(SchoolMembership.user_id).where(SchoolMembership.school_id.in_(school_ids))
+    return set((await session.scalars(stmt)).all())
+
+
+async def school_group_ids(session: AsyncSession, school_ids: Collection[int]) -> set[int]:
+    """IDs of the groups of the schools."""
+    stmt = select(GroupModel.id).where(GroupModel.school_id.in_(school_ids))
+    return set((await session.scalars(stmt)).all())
+
+
+async def school_member_group_ids(session: AsyncSession, school_ids: Collection[int]) -> set[int]:
+    """IDs of the groups with members through memberships in the schools."""
+    stmt = (
+        select(GroupMemberAssociation.group_id)
+        .join(SchoolMembership, SchoolMembership.id == GroupMemberAssociation.school_membership_id)
+        .where(SchoolMembership.school_id.in_(school_ids))
+    )
+    return set((await session.scalars(stmt)).all())
+
+
+def changed_ids(before: set[int], after: set[int], *, all_: bool) -> set[int]:
+    """IDs of the related objects whose representation changed.
+
+    Linked and unlinked objects changed. ``all_`` means that what the related
+    objects show of the changed object (e.g. its name) changed, so all of them did.
+    """
+    return before | after if all_ else before ^ after
+
+
+async def bump_versions(
+    session: AsyncSession, model: type[UserModel] | type[GroupModel], ids: Collection[int]
+) -> None:
+    """Increment the version of the objects with the IDs ``ids`` and log the change."""
+    ordered = sorted(ids)
+    for start in range(0, len(ordered), _BUMP_CHUNK_SIZE):
+        chunk = ordered[start : start + _BUMP_CHUNK_SIZE]
+        stmt = (
+            update(model)
+            .where(model.id.in_(chunk))
+            .values(version=model.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
+        await _log_changes(session, model, chunk, ChangeAction.UPDATED)
+
+
+async def log_change(
+    session: AsyncSession, model: type[UserModel] | type[GroupModel], id_: int, action: ChangeAction
+) -> None:
+    """Append the creation or deletion of the object with the ID ``id_`` to the change log.
+
+    Log a deletion before deleting, the entry copies the name of the object.
+    """
+    await _log_changes(session, model, [id_], action)
+
+
+async def _log_changes(
+    session: AsyncSession,
+    model: type[UserModel] | type[GroupModel],
+    ids: Collection[int],
+    action: ChangeAction,
+) -> None:
+    if model is UserModel:
+        source = select(
+            literal(ObjectType.USER.value),
+            UserModel.public_id,
+            literal(action.value),
+            UserModel.name,
+            null(),
+        ).where(UserModel.id.in_(ids))
+    else:
+        source = (
+            select(
+                literal(ObjectType.GROUP.value),
+                GroupModel.public_id,
+                literal(action.value),
+                GroupModel.name,
+                SchoolModel.name,
+            )
+            .join(SchoolModel, SchoolModel.id == GroupModel.school_id)
+            .where(GroupModel.id.in_(ids))
+        )
+    columns = ["object_type", "public_id", "action", "name", "school_name"]
+    await session.execute(insert(ChangeLog).from_select(columns, source.order_by(model.id)))
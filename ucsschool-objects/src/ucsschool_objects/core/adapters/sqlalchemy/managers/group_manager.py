@@ -6,7 +6,6 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, cast
 
 from sqlalchemy import Select, delete, select
-from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm import selectinload
 
 from ucsschool_objects.core.adapters.sqlalchemy.managers._shared import (
@@ -24,7 +23,17 @@ from ucsschool_objects.core.adapters.sqlalchemy.managers._shared import (
     sync_collection,
     sync_scalar_relation,
 )
-from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_domain import group_from_patch, to_group
+from ucsschool_objects.core.adapters.sqlalchemy.managers._versions import (
+    bump_versions,
+    changed_ids,
+    group_member_ids,
+    log_change,
+)
+from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_domain import (
+    ConversionContext,
+    group_from_patch,
+    to_group,
+)
 from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_orm import (
     resolve_group_create_relations,
     to_group_model,
@@ -35,10 +44,12 @@ from ucsschool_objects.core.domain.json import PatchDict, to_json
 from ucsschool_objects.core.domain.load_spec import LoadSpec
 from ucsschool_objects.core.domain.models import Group
 from ucsschool_objects.core.domain.ports.manager import JSONPathOperation, Manager
+from ucsschool_objects.core.domain.projections import ChangeAction
 from ucsschool_objects.core.domain.query import SearchQuery, SortSpec
 from ucsschool_objects.core.domain.validators import GroupValidator
 from ucsschool_objects.database_models import (
     Group as GroupModel,
+    GroupRoleAssociation,
     Role as RoleModel,
     School as SchoolModel,
     SchoolMembership as SchoolMembershipModel,
@@ -153,6 +164,13 @@ class SQLAlchemyGroupManager(Manager[Group]):
             join_type=JoinType.LEFT_OUTER,
             exposed_fields=get_exposed_fields(SchoolModel),
         ),
+        "roles": JoinSpec(
+            relation_name="roles",
+            target_model=RoleModel,
+            join_path=(GroupRoleAssociation, RoleModel),
+            join_type=JoinType.LEFT_OUTER,
+            exposed_fields=get_exposed_fields(RoleModel),
+        ),
     }
     _BASE_FIELD_MAP: dict[str, FieldColumn] = {
         "public_id": GroupModel.public_id,
@@ -294,7 +312,8 @@ class SQLAlchemyGroupManager(Manager[Group]):
             stmt = stmt.limit(limit)
         if offset:
             stmt = stmt.offset(offset)
-        return (to_group(model) for model in (await self._session.execute(stmt)).scalars())
+        context = ConversionContext()
+        return (to_group(model, context) for model in (await self._session.execute(stmt)).scalars())
 
     async def create(
         self,
@@ -332,6 +351,10 @@ class SQLAlchemyGroupManager(Manager[Group]):
 
         self._session.add(group_model)
         await self._session.flush()
+        await log_change(self._session, GroupModel, group_model.id, ChangeAction.CREATED)
+        await bump_versions(
+            self._session, UserModel, await group_member_ids(self._session, [group_model.id])
+        )
 
     async def modify(
         self,
@@ -349,11 +372,32 @@ class SQLAlchemyGroupManager(Manager[Group]):
         patched = apply_patch(operations=operations, current_domain_obj=current_domain)
         GroupValidator.validate(group_from_patch(patched, result.public_id))
 
+        # the members show the name and the roles of the group, e.g. as school class
+        def shown() -> tuple[object, ...]:
+            return result.name, result.school_id, {role.id for role in result.roles}
+
+        shown_before = shown()
+        members_before = {membership.user_id for membership in result.members}
+
         current_dict = to_json(current_domain)
         await _apply_group_patch(result, patched, current_dict, self._session)
+        await self._session.flush()
+
+        members_after = {membership.user_id for membership in result.members}
+        await bump_versions(self._session, GroupModel, [result.id])
+        await bump_versions(
+            self._session,
+            UserModel,
+            changed_ids(members_before, members_after, all_=shown() != shown_before),
+        )
 
     async def delete(self, public_id: UUID) -> None:
-        stmt = delete(GroupModel).where(GroupModel.public_id == public_id)
-        result = cast(CursorResult[None], await self._session.execute(stmt))
-        if result.rowcount == 0:
+        group_id = await self._session.scalar(
+            select(GroupModel.id).where(GroupModel.public_id == public_id)
+        )
+        if group_id is None:
             raise NotFound(object_type="Group", public_id=str(public_id))
+        await bump_versions(self._session, UserModel, await group_member_ids(self._session, [group_id]))
+        await log_change(self._session, GroupModel, group_id, ChangeAction.DELETED)
+        stmt = delete(GroupModel).where(GroupModel.id == group_id)
+        await self._session.execute(stmt)
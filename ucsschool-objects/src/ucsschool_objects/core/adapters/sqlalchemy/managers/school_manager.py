@@ -6,7 +6,6 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, cast
 
 from sqlalchemy import delete, select
-from sqlalchemy.engine import CursorResult
 
 from ucsschool_objects.core.adapters.sqlalchemy.managers._shared import (
     JoinSpec,
@@ -14,6 +13,13 @@ from ucsschool_objects.core.adapters.sqlalchemy.managers._shared import (
     compose_field_map,
     load_requested_scalar_attributes,
 )
+from ucsschool_objects.core.adapters.sqlalchemy.managers._versions import (
+    bump_versions,
+    group_member_ids,
+    school_group_ids,
+    school_member_group_ids,
+    school_member_ids,
+)
 from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_domain import school_from_patch, to_school
 from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_orm import to_school_model
 from ucsschool_objects.core.adapters.sqlalchemy.query_filter import apply_search_query, apply_sort
@@ -23,7 +29,11 @@ from ucsschool_objects.core.domain.models import School
 from ucsschool_objects.core.domain.ports.manager import JSONPathOperation, Manager
 from ucsschool_objects.core.domain.query import SearchQuery, SortSpec
 from ucsschool_objects.core.domain.validators import SchoolValidator
-from ucsschool_objects.database_models import School as SchoolModel
+from ucsschool_objects.database_models import (
+    Group as GroupModel,
+    School as SchoolModel,
+    User as UserModel,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
@@ -145,10 +155,31 @@ class SQLAlchemySchoolManager(Manager[School]):
         current_domain = to_school(result)
         patched = apply_patch(operations=operations, current_domain_obj=current_domain)
         SchoolValidator.validate(school_from_patch(patched, result.public_id))
+        name = result.name
         _apply_school_patch(result, patched)
 
+        if result.name != name:
+            await self._session.flush()
+            # the groups of the school, their members and the members of the school show its name
+            group_ids = await school_group_ids(self._session, [result.id])
+            await bump_versions(self._session, GroupModel, group_ids)
+            await bump_versions(
+                self._session,
+                UserModel,
+                await school_member_ids(self._session, [result.id])
+                | await group_member_ids(self._session, group_ids),
+            )
+
     async def delete(self, public_id: UUID) -> None:
-        stmt = delete(SchoolModel).where(SchoolModel.public_id == public_id)
-        result = cast(CursorResult[None], await self._session.execute(stmt))
-        if result.rowcount == 0:
+        school_id = await self._session.scalar(
+            select(SchoolModel.id).where(SchoolModel.public_id == public_id)
+        )
+        if school_id is None:
             raise NotFound(object_type="School", public_id=str(public_id))
+        # the memberships in the school are deleted with it, and with them group memberships
+        group_ids = await school_member_group_ids(self._session, [school_id])
+        user_ids = await school_member_ids(self._session, [school_id])
+        await bump_versions(self._session, GroupModel, group_ids)
+        await bump_versions(self._session, UserModel, user_ids)
+        stmt = delete(SchoolModel).where(SchoolModel.id == school_id)
+        await self._session.execute(stmt)
@@ -8,7 +8,6 @@ from typing import TYPE_CHECKING, cast
 from uuid import UUID
 
 from sqlalchemy import Select, delete, select
-from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm import selectinload
 
 from ucsschool_objects.core.adapters.sqlalchemy.managers._shared import (
@@ -25,7 +24,18 @@ from ucsschool_objects.core.adapters.sqlalchemy.managers._shared import (
     school_scalar_columns,
     sync_collection,
 )
-from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_domain import to_user, user_from_patch
+from ucsschool_objects.core.adapters.sqlalchemy.managers._versions import (
+    bump_versions,
+    changed_ids,
+    log_change,
+    user_family_ids,
+    user_group_ids,
+)
+from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_domain import (
+    ConversionContext,
+    to_user,
+    user_from_patch,
+)
 from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_orm import (
     resolve_user_create_relations,
     to_user_model,
@@ -36,6 +46,7 @@ from ucsschool_objects.core.domain.json import PatchDict, to_json
 from ucsschool_objects.core.domain.load_spec import LoadSpec
 from ucsschool_objects.core.domain.models import User
 from ucsschool_objects.core.domain.ports.manager import JSONPathOperation, Manager
+from ucsschool_objects.core.domain.projections import ChangeAction
 from ucsschool_objects.core.domain.query import SearchQuery, SortSpec
 from ucsschool_objects.core.domain.validators import UserValidator
 from ucsschool_objects.database_models import (
@@ -195,6 +206,18 @@ async def _apply_user_patch(
         )
 
 
+async def _related_ids(session: AsyncSession, user_id: int) -> tuple[set[int], set[int]]:
+    """IDs of the groups and of the legal guardians and wards of a user."""
+    return await user_group_ids(session, [user_id]), await user_family_ids(session, [user_id])
+
+
+async def _bump_related_versions(session: AsyncSession, user_id: int) -> None:
+    """Increment the versions of the objects showing a user that is created or deleted."""
+    group_ids, family_ids = await _related_ids(session, user_id)
+    await bump_versions(session, GroupModel, group_ids)
+    await bump_versions(session, UserModel, family_ids)
+
+
 def _includes_user_memberships(load: LoadSpec) -> bool:
     return any(
         load.includes(attribute)
@@ -458,7 +481,8 @@ class SQLAlchemyUserManager(Manager[User]):
         if offset:
             stmt = stmt.offset(offset)
 
-        return (to_user(model) for model in (await self._session.execute(stmt)).scalars())
+        context = ConversionContext()
+        return (to_user(model, context) for model in (await self._session.execute(stmt)).scalars())
 
     async def create(
         self,
@@ -474,6 +498,8 @@ class SQLAlchemyUserManager(Manager[User]):
 
         self._session.add(user_model)
         await self._session.flush()
+        await log_change(self._session, UserModel, user_model.id, ChangeAction.CREATED)
+        await _bump_related_versions(self._session, user_model.id)
 
     async def modify(
         self,
@@ -491,11 +517,34 @@ class SQLAlchemyUserManager(Manager[User]):
         target = apply_patch(operations=operations, current_domain_obj=user)
         UserValidator.validate(user_from_patch(target, result.public_id))
 
+        name = result.name
+        relations_before = None
+        if m_memberships or m_guardians or m_wards:
+            relations_before = await _related_ids(self._session, result.id)
+
         source = to_json(user)
         await _apply_user_patch(result, target, source, self._session, operations)
+        await self._session.flush()
+
+        await bump_versions(self._session, UserModel, [result.id])
+        renamed = result.name != name
+        if relations_before is not None or renamed:
+            groups_after, family_after = await _related_ids(self._session, result.id)
+            groups_before, family_before = relations_before or (groups_after, family_after)
+            await bump_versions(
+                self._session, GroupModel, changed_ids(groups_before, groups_after, all_=renamed)
+            )
+            await bump_versions(
+                self._session, UserModel, changed_ids(family_before, family_after, all_=renamed)
+            )
 
     async def delete(self, public_id: UUID) -> None:
-        stmt = delete(UserModel).where(UserModel.public_id == public_id)
-        result = cast(CursorResult[None], await self._session.execute(stmt))
-        if result.rowcount == 0:
+        user_id = await self._session.scalar(
+            select(UserModel.id).where(UserModel.public_id == public_id)
+        )
+        if user_id is None:
             raise NotFound(object_type="User", public_id=str(public_id))
+        await _bump_related_versions(self._session, user_id)
+        await log_change(self._session, UserModel, user_id, ChangeAction.DELETED)
+        stmt = delete(UserModel).where(UserModel.id == user_id)
+        await self._session.execute(stmt)
@@ -5,7 +5,9 @@ from __future__ import annotations
 
 from collections.abc import Collection, Iterable
 from datetime import date, datetime
-from typing import TYPE_CHECKING, TypeVar, cast
+from functools import lru_cache
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, TypeAlias, TypeVar, cast
 from uuid import UUID
 
 from sqlalchemy import inspect
@@ -69,135 +71,204 @@ def _as_udm_properties(value: object) -> dict[str, object]:
     return cast("dict[str, object]", value)
 
 
-def _is_loaded(model: object, attribute: str) -> bool:
+def _unloaded_attributes(model: object) -> frozenset[str]:
+    """Inspect the ORM instance state once and return the names of all unloaded attributes."""
     state = inspect(model, raiseerr=False)
     if state is None:
-        return True
+        return frozenset()
     unloaded = cast(Collection[str] | None, state.unloaded)
-    if unloaded is None:
-        return True
-    return attribute not in unloaded
+    if not unloaded:
+        return frozenset()
+    return frozenset(unloaded)
+
+
+# (domain field name, ORM attribute name, converter)
+_FieldSpec: TypeAlias = tuple[str, str, "Callable[[object], object]"]
+_FieldReader: TypeAlias = "Callable[[object], dict[str, Any]]"
+
+_SCHOOL_FIELDS: tuple[_FieldSpec, ...] = (
+    ("record_uid", "record_uid", _as_str),
+    ("source_uid", "source_uid", _as_str),
+    ("name", "name", _as_str),
+    ("display_name", "display_name", _as_str),
+    ("educational_servers", "educational_servers", _as_set_str),
+    ("administrative_servers", "administrative_servers", _as_set_str),
+    ("class_share_file_server", "class_share_file_server", _as_optional_str),
+    ("home_share_file_server", "home_share_file_server", _as_optional_str),
+    ("udm_properties", "udm_properties", _as_udm_properties),
+)
+_ROLE_FIELDS: tuple[_FieldSpec, ...] = (
+    ("name", "name", _as_str),
+    ("display_name", "display_name", _as_role_display_name),
+)
+_GROUP_FIELDS: tuple[_FieldSpec, ...] = (
+    ("record_uid", "record_uid", _as_str),
+    ("source_uid", "source_uid", _as_str),
+    ("name", "name", _as_str),
+    ("display_name", "display_name", _as_str),
+    ("create_share", "has_share", _as_bool),
+    ("email", "email", _as_optional_str),
+    ("description", "description", _as_optional_str),
+    ("udm_properties", "udm_properties", _as_udm_properties),
+)
+_RELATED_USER_FIELDS: tuple[_FieldSpec, ...] = (
+    ("record_uid", "record_uid", _as_str),
+    ("source_uid", "source_uid", _as_str),
+    ("name", "name", _as_str),
+    ("firstname", "firstname", _as_str),
+    ("lastname", "lastname", _as_str),
+    ("email", "email", _as_optional_str),
+    ("birthday", "birthday", _as_optional_date),
+    ("expiration_date", "expiration_date", _as_optional_date),
+    ("active", "active", _as_bool),
+)
+_USER_FIELDS: tuple[_FieldSpec, ...] = (
+    *_RELATED_USER_FIELDS,
+    ("udm_properties", "udm_properties", _as_udm_properties),
+)
+
 
+@lru_cache(maxsize=256)
+def _field_reader(fields: tuple[_FieldSpec, ...], unloaded: frozenset[str]) -> _FieldReader:
+    """
+    Build a function that reads and converts the loaded `fields` of a model.
+
+    Readers are compiled once per field set (i.e. model class) and set of
+    unloaded attributes (which is determined by the ``LoadSpec`` of the
+    query), so converting an object neither inspects its state per attribute
+    nor looks at attributes that were not loaded.
+    """
+    loaded = tuple(
+        (field, attrgetter(attribute), converter)
+        for field, attribute, converter in fields
+        if attribute not in unloaded
+    )
+    unloaded_fields: dict[str, Any] = {
+        field: UNLOADED for field, attribute, _converter in fields if attribute in unloaded
+    }
 
-def _loaded_value(
-    model: object,
-    attribute: str,
-) -> object | UnloadedType:
-    if not _is_loaded(model, attribute):
-        return UNLOADED
-    return cast(object, getattr(model, attribute))
+    def read(model: object) -> dict[str, Any]:
+        values = unloaded_fields.copy()
+        for field, getter, converter in loaded:
+            values[field] = converter(getter(model))
+        return values
 
+    return read
 
-def _convert_loaded(
-    value: object | UnloadedType,
-    converter: Callable[[object], TConverted],
-) -> TConverted | UnloadedType:
-    if isinstance(value, UnloadedType):
-        return UNLOADED
-    return converter(value)
 
+class ConversionContext:
+    """
+    Memoises converted schools, roles and groups by ORM identity (``public_id``).
 
-def _convert_unloadable(
-    model: object,
-    attribute: str,
-    converter: Callable[[object], TConverted],
-) -> TConverted | UnloadedType:
-    return _convert_loaded(_loaded_value(model, attribute), converter)
+    Use one context per conversion run, e.g. the result of one ``search()``, so
+    users referencing the same school, role or group share one domain object
+    instead of each getting its own copy. Domain objects converted in the same
+    context must therefore not be modified independently of each other.
+    """
 
+    def __init__(self) -> None:
+        self._converted: dict[tuple[type, UUID], object] = {}
 
-def to_school(model: SchoolModel) -> School:
-    return School(
-        public_id=model.public_id,
-        record_uid=_convert_unloadable(model, "record_uid", _as_str),
-        source_uid=_convert_unloadable(model, "source_uid", _as_str),
-        name=_convert_unloadable(model, "name", _as_str),
-        display_name=_convert_unloadable(model, "display_name", _as_str),
-        educational_servers=_convert_unloadable(model, "educational_servers", _as_set_str),
-        administrative_servers=_convert_unloadable(model, "administrative_servers", _as_set_str),
-        class_share_file_server=_convert_unloadable(model, "class_share_file_server", _as_optional_str),
-        home_share_file_server=_convert_unloadable(model, "home_share_file_server", _as_optional_str),
-        udm_properties=_convert_unloadable(model, "udm_properties", _as_udm_properties),
-    )
+    def convert(
+        self,
+        model: TModel,
+        converter: Callable[[TModel, ConversionContext], TConverted],
+    ) -> TConverted:
+        public_id = cast(UUID | None, getattr(model, "public_id", None))
+        if public_id is None:
+            return converter(model, self)
+        key = (type(model), public_id)
+        try:
+            return cast(TConverted, self._converted[key])
+        except KeyError:
+            converted = converter(model, self)
+            self._converted[key] = converted
+            return converted
 
 
-def to_role(model: RoleModel) -> Role:
-    return Role(
-        public_id=model.public_id,
-        name=_convert_unloadable(model, "name", _as_str),
-        display_name=_convert_unloadable(model, "display_name", _as_role_display_name),
-    )
+def _to_school(model: SchoolModel, context: ConversionContext) -> School:
+    read_fields = _field_reader(_SCHOOL_FIELDS, _unloaded_attributes(model))
+    return School(public_id=model.public_id, **read_fields(model))
 
 
-def to_group(model: GroupModel) -> Group:
+def to_school(model: SchoolModel, context: ConversionContext | None = None) -> School:
+    return (context or ConversionContext()).convert(model, _to_school)
+
+
+def _to_role(model: RoleModel, context: ConversionContext) -> Role:
+    read_fields = _field_reader(_ROLE_FIELDS, _unloaded_attributes(model))
+    return Role(public_id=model.public_id, **read_fields(model))
+
+
+def to_role(model: RoleModel, context: ConversionContext | None = None) -> Role:
+    return (context or ConversionContext()).convert(model, _to_role)
+
+
+def _to_group(model: GroupModel, context: ConversionContext) -> Group:
+    unloaded = _unloaded_attributes(model)
+
     school: School | UnloadedType = UNLOADED
-    if _is_loaded(model, "school"):
-        school = to_school(model.school)
+    if "school" not in unloaded:
+        school = to_school(model.school, context)
 
     roles: set[Role] | UnloadedType = UNLOADED
-    if _is_loaded(model, "roles"):
-        roles = {to_role(r) for r in model.roles}
+    if "roles" not in unloaded:
+        roles = {to_role(r, context) for r in model.roles}
 
     allowed_email_senders_users: set[User] | UnloadedType = UNLOADED
-    if _is_loaded(model, "allowed_email_senders_users"):
+    if "allowed_email_senders_users" not in unloaded:
         allowed_email_senders_users = {
             _to_related_user(user) for user in model.allowed_email_senders_users
         }
 
     allowed_email_senders_groups: set[Group] | UnloadedType = UNLOADED
-    if _is_loaded(model, "allowed_email_senders_groups"):
-        allowed_email_senders_groups = {to_group(group) for group in model.allowed_email_senders_groups}
+    if "allowed_email_senders_groups" not in unloaded:
+        allowed_email_senders_groups = {
+            to_group(group, context) for group in model.allowed_email_senders_groups
+        }
 
     members: set[User] | UnloadedType = UNLOADED
-    if _is_loaded(model, "members"):
+    if "members" not in unloaded:
         members = {_to_related_user(membership.user) for membership in model.members}
 
     member_roles: set[Role] | UnloadedType = UNLOADED
-    if _is_loaded(model, "member_roles"):
-        member_roles = {to_role(role) for role in model.member_roles}
+    if "member_roles" not in unloaded:
+        member_roles = {to_role(role, context) for role in model.member_roles}
 
+    read_fields = _field_reader(_GROUP_FIELDS, unloaded)
     return Group(
         public_id=model.public_id,
-        record_uid=_convert_unloadable(model, "record_uid", _as_str),
-        source_uid=_convert_unloadable(model, "source_uid", _as_str),
-        name=_convert_unloadable(model, "name", _as_str),
-        display_name=_convert_unloadable(model, "display_name", _as_str),
-        create_share=_convert_unloadable(model, "has_share", _as_bool),
         roles=roles,
-        email=_convert_unloadable(model, "email", _as_optional_str),
         allowed_email_senders_users=allowed_email_senders_users,
         allowed_email_senders_groups=allowed_email_senders_groups,
         members=members,
         member_roles=member_roles,
         school=school,
-        description=_convert_unloadable(model, "description", _as_optional_str),
-        udm_properties=_convert_unloadable(model, "udm_properties", _as_udm_properties),
+        **read_fields(model),
     )
 
 
-def _to_school_membership(model: SchoolMembershipModel) -> SchoolMembership:
+def to_group(model: GroupModel, context: ConversionContext | None = None) -> Group:
+    return (context or ConversionContext()).convert(model, _to_group)
+
+
+def _to_school_membership(model: SchoolMembershipModel, context: ConversionContext) -> SchoolMembership:
     return SchoolMembership(
-        school=to_school(model.school),
+        school=to_school(model.school, context),
         is_primary=model.is_primary,
-        roles={to_role(role) for role in model.roles},
-        groups={to_group(group) for group in model.groups},
+        roles={to_role(role, context) for role in model.roles},
+        groups={to_group(group, context) for group in model.groups},
     )
 
 
 def _to_related_user(model: UserModel) -> User:
+    read_fields = _field_reader(_RELATED_USER_FIELDS, _unloaded_attributes(model))
     return User(
         public_id=model.public_id,
-        record_uid=_convert_unloadable(model, "record_uid", _as_str),
-        source_uid=_convert_unloadable(model, "source_uid", _as_str),
-        name=_convert_unloadable(model, "name", _as_str),
-        firstname=_convert_unloadable(model, "firstname", _as_str),
-        lastname=_convert_unloadable(model, "lastname", _as_str),
-        email=_convert_unloadable(model, "email", _as_optional_str),
-        birthday=_convert_unloadable(model, "birthday", _as_optional_date),
-        expiration_date=_convert_unloadable(model, "expiration_date", _as_optional_date),
-        active=_convert_unloadable(model, "active", _as_bool),
         school_memberships=UNLOADED,
         legal_wards=UNLOADED,
         legal_guardians=UNLOADED,
+        **read_fields(model),
     )
 
 
@@ -205,40 +276,41 @@ def _optional_user_relation(models: tuple[UserModel, ...] | list[UserModel]) ->
     return {_to_related_user(model) for model in models}
 
 
-def to_user(model: UserModel) -> User:
+def to_user(model: UserModel, context: ConversionContext | None = None) -> User:
+    """
+    Convert a user ORM model to a domain object.
+
+    Pass the same `context` when converting several users (e.g. a search
+    result) to share their schools, roles and groups.
+    """
+    if context is None:
+        context = ConversionContext()
+    unloaded = _unloaded_attributes(model)
     school_memberships: dict[UUID, SchoolMembership] | UnloadedType = UNLOADED
 
-    if _is_loaded(model, "school_memberships"):
+    if "school_memberships" not in unloaded:
         school_memberships = {}
-        for membership in (_to_school_membership(m) for m in model.school_memberships):
+        for membership in (_to_school_membership(m, context) for m in model.school_memberships):
             school_public_id = membership.school.public_id
             if not isinstance(school_public_id, UUID):
                 raise ValueError("Mapped school membership has no UUID school public_id.")
             school_memberships[school_public_id] = membership
 
     legal_wards: set[User] | UnloadedType = UNLOADED
-    if _is_loaded(model, "legal_wards"):
+    if "legal_wards" not in unloaded:
         legal_wards = _optional_user_relation(model.legal_wards)
 
     legal_guardians: set[User] | UnloadedType = UNLOADED
-    if _is_loaded(model, "legal_guardians"):
+    if "legal_guardians" not in unloaded:
         legal_guardians = _optional_user_relation(model.legal_guardians)
 
+    read_fields = _field_reader(_USER_FIELDS, unloaded)
     return User(
         public_id=model.public_id,
-        record_uid=_convert_unloadable(model, "record_uid", _as_str),
-        source_uid=_convert_unloadable(model, "source_uid", _as_str),
-        name=_convert_unloadable(model, "name", _as_str),
-        firstname=_convert_unloadable(model, "firstname", _as_str),
-        lastname=_convert_unloadable(model, "lastname", _as_str),
-        email=_convert_unloadable(model, "email", _as_optional_str),
-        birthday=_convert_unloadable(model, "birthday", _as_optional_date),
-        expiration_date=_convert_unloadable(model, "expiration_date", _as_optional_date),
-        active=_convert_unloadable(model, "active", _as_bool),
         school_memberships=school_memberships,
         legal_wards=legal_wards,
         legal_guardians=legal_guardians,
-        udm_properties=_convert_unloadable(model, "udm_properties", _as_udm_properties),
+        **read_fields(model),
     )
 
 
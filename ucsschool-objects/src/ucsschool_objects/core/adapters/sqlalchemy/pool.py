@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Connection pool with usage counters, and a snapshot of its state for metrics."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.pool import ConnectionPoolEntry
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStatus:
+    """State of a connection pool; the counters are totals since the pool was created."""
+
+    size: int
+    max_overflow: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    wait_seconds: float
+    max_wait_seconds: float
+
+
+class MeasuredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that counts checkouts and the time spent waiting for them."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._checkouts = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self._checkouts += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+    def pool_status(self) -> PoolStatus:
+        return PoolStatus(
+            size=self.size(),
+            max_overflow=self._max_overflow,
+            checked_out=self.checkedout(),
+            # negative while the pool has not yet opened ``size`` connections
+            overflow=max(self.overflow(), 0),
+            checkouts=self._checkouts,
+            wait_seconds=self._wait_seconds,
+            max_wait_seconds=self._max_wait_seconds,
+        )
+
+
+def pool_status(engine: AsyncEngine) -> PoolStatus | None:
+    """State of the engine's pool, ``None`` if it does not use a ``MeasuredAsyncQueuePool``."""
+    pool = engine.sync_engine.pool
+    if isinstance(pool, MeasuredAsyncQueuePool):
+        return pool.pool_status()
+    return None
@@ -0,0 +1,311 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Read-only projection queries that bypass the ORM unit of work.
+
+The projections select plain columns, so no ORM instances are created, added
+to the identity map or converted to domain objects. Each relation is fetched
+with one flat join per batch of users and grouped in Python; this keeps the
+statements portable between SQLite and PostgreSQL instead of relying on
+dialect-specific aggregation such as ``json_agg``.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from ucsschool_objects.core.adapters.sqlalchemy.managers.group_manager import SQLAlchemyGroupManager
+from ucsschool_objects.core.adapters.sqlalchemy.managers.user_manager import SQLAlchemyUserManager
+from ucsschool_objects.core.adapters.sqlalchemy.query_filter import apply_search_query, apply_sort
+from ucsschool_objects.core.domain.ports.dn_mapper import ObjectType
+from ucsschool_objects.core.domain.ports.projection import (
+    ChangeProjection,
+    UserProjection,
+    VersionProjection,
+)
+from ucsschool_objects.core.domain.projections import (
+    ChangeAction,
+    ChangeRow,
+    GroupRow,
+    SchoolMembershipRow,
+    UserRow,
+    VersionRow,
+)
+from ucsschool_objects.database_models import (
+    ChangeLog,
+    Group as GroupModel,
+    GroupMemberAssociation,
+    GroupRoleAssociation,
+    LegalGuardianAssociation,
+    Role as RoleModel,
+    School as SchoolModel,
+    SchoolMembership,
+    SchoolMembershipRoleAssociation,
+    User as UserModel,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from datetime import datetime
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from ucsschool_objects.core.domain.query import SearchQuery, SortSpec
+
+# Same batch size SQLAlchemy uses for selectinload, which keeps the IN lists
+# well below the bind parameter limits of SQLite and asyncpg.
+_IN_BATCH_SIZE = 500
+
+_RelatedNames = dict[int, list[str]]
+
+
+def _batches(ids: Sequence[int]) -> Iterator[Sequence[int]]:
+    for start in range(0, len(ids), _IN_BATCH_SIZE):
+        yield ids[start : start + _IN_BATCH_SIZE]
+
+
+class SQLAlchemyUserProjection(UserProjection):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def search(
+        self,
+        query: SearchQuery | None = None,
+        *,
+        sort_by: Sequence[SortSpec] = (),
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[UserRow]:
+        stmt = select(
+            UserModel.id,
+            UserModel.public_id,
+            UserModel.record_uid,
+            UserModel.source_uid,
+            UserModel.name,
+            UserModel.firstname,
+            UserModel.lastname,
+            UserModel.email,
+            UserModel.birthday,
+            UserModel.expiration_date,
+            UserModel.active,
+            UserModel.udm_properties,
+        )
+        stmt = apply_search_query(
+            stmt,
+            query,
+            SQLAlchemyUserManager._FIELD_MAP,
+            SQLAlchemyUserManager._NESTED_FIELD_REGISTRY,
+            json_field_map=SQLAlchemyUserManager._JSON_FIELD_MAP,
+        )
+        stmt = apply_sort(
+            stmt,
+            sort_by,
+            SQLAlchemyUserManager._FIELD_MAP,
+            default_field="public_id",
+            registry=SQLAlchemyUserManager._NESTED_FIELD_REGISTRY,
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if offset:
+            stmt = stmt.offset(offset)
+        users = (await self._session.execute(stmt)).all()
+
+        memberships: defaultdict[int, list[SchoolMembershipRow]] = defaultdict(list)
+        groups: defaultdict[int, list[GroupRow]] = defaultdict(list)
+        guardians: _RelatedNames = defaultdict(list)
+        wards: _RelatedNames = defaultdict(list)
+        for batch in _batches([user.id for user in users]):
+            await self._load_memberships(batch, memberships)
+            await self._load_groups(batch, groups)
+            await self._load_guardians_and_wards(batch, guardians, wards)
+
+        return [
+            UserRow(
+                public_id=user.public_id,
+                record_uid=user.record_uid,
+                source_uid=user.source_uid,
+                name=user.name,
+                firstname=user.firstname,
+                lastname=user.lastname,
+                email=user.email,
+                birthday=user.birthday,
+                expiration_date=user.expiration_date,
+                active=user.active,
+                udm_properties=user.udm_properties,
+                school_memberships=tuple(memberships[user.id]),
+                groups=tuple(groups[user.id]),
+                legal_guardian_names=tuple(sorted(guardians[user.id])),
+                legal_ward_names=tuple(sorted(wards[user.id])),
+            )
+            for user in users
+        ]
+
+    async def _load_memberships(
+        self, user_ids: Sequence[int], into: defaultdict[int, list[SchoolMembershipRow]]
+    ) -> None:
+        stmt = (
+            select(
+                SchoolMembership.user_id,
+                SchoolMembership.id,
+                SchoolMembership.is_primary,
+                SchoolModel.name,
+            )
+            .join(SchoolModel, SchoolMembership.school_id == SchoolModel.id)
+            .where(SchoolMembership.user_id.in_(user_ids))
+            .order_by(SchoolMembership.user_id, SchoolModel.name)
+        )
+        rows = (await self._session.execute(stmt)).all()
+        roles_stmt = (
+            select(SchoolMembershipRoleAssociation.school_membership_id, RoleModel.name)
+            .join(RoleModel, SchoolMembershipRoleAssociation.role_id == RoleModel.id)
+            .join(
+                SchoolMembership,
+                SchoolMembershipRoleAssociation.school_membership_id == SchoolMembership.id,
+            )
+            .where(SchoolMembership.user_id.in_(user_ids))
+        )
+        role_names: _RelatedNames = defaultdict(list)
+        for membership_id, role_name in await self._session.execute(roles_stmt):
+            role_names[membership_id].append(role_name)
+
+        for user_id, membership_id, is_primary, school_name in rows:
+            into[user_id].append(
+                SchoolMembershipRow(
+                    school_name=school_name,
+                    is_primary=is_primary,
+                    role_names=tuple(sorted(role_names[membership_id])),
+                )
+            )
+
+    async def _load_groups(
+        self, user_ids: Sequence[int], into: defaultdict[int, list[GroupRow]]
+    ) -> None:
+        stmt = (
+            select(
+                SchoolMembership.user_id,
+                GroupModel.id,
+                GroupModel.public_id,
+                GroupModel.name,
+                SchoolModel.name,
+            )
+            .select_from(GroupMemberAssociation)
+            .join(SchoolMembership, GroupMemberAssociation.school_membership_id == SchoolMembership.id)
+            .join(GroupModel, GroupMemberAssociation.group_id == GroupModel.id)
+            .join(SchoolModel, GroupModel.school_id == SchoolModel.id)
+            .where(SchoolMembership.user_id.in_(user_ids))
+            .order_by(SchoolMembership.user_id, SchoolModel.name, GroupModel.name)
+            .distinct()
+        )
+        rows = (await self._session.execute(stmt)).all()
+        roles_stmt = (
+            select(GroupRoleAssociation.group_id, RoleModel.name)
+            .join(RoleModel, GroupRoleAssociation.role_id == RoleModel.id)
+            .join(
+                GroupMemberAssociation,
+                GroupRoleAssociation.group_id == GroupMemberAssociation.group_id,
+            )
+            .join(SchoolMembership, GroupMemberAssociation.school_membership_id == SchoolMembership.id)
+            .where(SchoolMembership.user_id.in_(user_ids))
+            .distinct()
+        )
+        role_names: _RelatedNames = defaultdict(list)
+        for group_id, role_name in await self._session.execute(roles_stmt):
+            role_names[group_id].append(role_name)
+
+        for user_id, group_id, public_id, name, school_name in rows:
+            into[user_id].append(
+                GroupRow(
+                    public_id=public_id,
+                    name=name,
+                    school_name=school_name,
+                    role_names=tuple(sorted(role_names[group_id])),
+                )
+            )
+
+    async def _load_guardians_and_wards(
+        self, user_ids: Sequence[int], guardians: _RelatedNames, wards: _RelatedNames
+    ) -> None:
+        related = aliased(UserModel)
+        guardians_stmt = (
+            select(LegalGuardianAssociation.legal_ward_id, related.name)
+            .join(related, LegalGuardianAssociation.legal_guardian_id == related.id)
+            .where(LegalGuardianAssociation.legal_ward_id.in_(user_ids))
+        )
+        for ward_id, guardian_name in await self._session.execute(guardians_stmt):
+            guardians[ward_id].append(guardian_name)
+        wards_stmt = (
+            select(LegalGuardianAssociation.legal_guardian_id, related.name)
+            .join(related, LegalGuardianAssociation.legal_ward_id == related.id)
+            .where(LegalGuardianAssociation.legal_guardian_id.in_(user_ids))
+        )
+        for guardian_id, ward_name in await self._session.execute(wards_stmt):
+            wards[guardian_id].append(ward_name)
+
+
+class SQLAlchemyVersionProjection(VersionProjection):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def users(self, query: SearchQuery | None = None) -> list[VersionRow]:
+        stmt = apply_search_query(
+            select(UserModel.public_id, UserModel.version),
+            query,
+            SQLAlchemyUserManager._FIELD_MAP,
+            SQLAlchemyUserManager._NESTED_FIELD_REGISTRY,
+            json_field_map=SQLAlchemyUserManager._JSON_FIELD_MAP,
+        )
+        return [VersionRow(*row) for row in await self._session.execute(stmt)]
+
+    async def groups(self, query: SearchQuery | None = None) -> list[VersionRow]:
+        stmt = apply_search_query(
+            select(GroupModel.public_id, GroupModel.version),
+            query,
+            SQLAlchemyGroupManager._FIELD_MAP,
+            SQLAlchemyGroupManager._NESTED_FIELD_REGISTRY,
+            json_field_map=SQLAlchemyGroupManager._JSON_FIELD_MAP,
+        )
+        return [VersionRow(*row) for row in await self._session.execute(stmt)]
+
+
+class SQLAlchemyChangeProjection(ChangeProjection):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def users(
+        self, *, after: int = 0, since: datetime | None = None, limit: int | None = None
+    ) -> list[ChangeRow]:
+        return await self._changes(ObjectType.USER, after, since, limit)
+
+    async def groups(
+        self, *, after: int = 0, since: datetime | None = None, limit: int | None = None
+    ) -> list[ChangeRow]:
+        return await self._changes(ObjectType.GROUP, after, since, limit)
+
+    async def _changes(
+        self, object_type: ObjectType, after: int, since: datetime | None, limit: int | None
+    ) -> list[ChangeRow]:
+        stmt = (
+            select(
+                ChangeLog.id,
+                ChangeLog.action,
+                ChangeLog.public_id,
+                ChangeLog.name,
+                ChangeLog.school_name,
+                ChangeLog.changed_at,
+            )
+            .where(ChangeLog.object_type == object_type, ChangeLog.id > after)
+            .order_by(ChangeLog.id)
+        )
+        if since is not None:
+            stmt = stmt.where(ChangeLog.changed_at >= since)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        rows = await self._session.execute(stmt)
+        return [
+            ChangeRow(cursor, ChangeAction(action), public_id, name, school_name, changed_at)
+            for cursor, action, public_id, name, school_name, changed_at in rows
+        ]
@@ -2,10 +2,11 @@
 # SPDX-License-Identifier: AGPL-3.0-only
 
 import os
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from types import TracebackType
-from typing import Self
+from typing import Any, Self
 
 from sqlalchemy import make_url
 from sqlalchemy.engine.url import URL
@@ -30,20 +31,83 @@ from ucsschool_objects.core.adapters.sqlalchemy.managers.school_manager import (
 from ucsschool_objects.core.adapters.sqlalchemy.managers.user_manager import (
     SQLAlchemyUserManager,
 )
+from ucsschool_objects.core.adapters.sqlalchemy.pool import MeasuredAsyncQueuePool
+from ucsschool_objects.core.adapters.sqlalchemy.projections import (
+    SQLAlchemyChangeProjection,
+    SQLAlchemyUserProjection,
+    SQLAlchemyVersionProjection,
+)
 from ucsschool_objects.core.domain.models import Group, Role, School, User
 from ucsschool_objects.core.domain.ports.manager import Manager
+from ucsschool_objects.core.domain.ports.projection import (
+    ChangeProjection,
+    UserProjection,
+    VersionProjection,
+)
 from ucsschool_objects.core.domain.ports.unit_of_work import (
     KelvinStorageSession,
     KelvinStorageSessionFactory,
 )
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+# Connections all pools of one service (e.g. the Kelvin workers) open together
+# at most, see database_settings().
+DEFAULT_MAX_CONNECTIONS = 60
+
 
 @dataclass(frozen=True, slots=True)
 class DatabaseSettings:
     url: URL
     echo: bool = False
-    pool_size: int = 10
-    max_overflow: int = 20
+    pool_size: int = DEFAULT_POOL_SIZE
+    max_overflow: int = DEFAULT_MAX_OVERFLOW
+    pool_timeout: float = 30.0
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    prepared_statements: bool = True
+
+
+def _is_true(value: str) -> bool:
+    return value.lower() in ("1", "enabled", "on", "true", "yes")
+
+
+def database_settings(
+    url: URL, get_option: Callable[[str], str | None], *, workers: int = 1
+) -> DatabaseSettings:
+    """Build the settings for ``url`` with the pool options returned by ``get_option``.
+
+    ``get_option`` is called with the option names ``max_connections``,
+    ``pool_size``, ``max_overflow``, ``pool_timeout``, ``pool_recycle``,
+    ``pool_pre_ping`` and ``pgbouncer`` and returns ``None`` or an empty string
+    for options that are not set.
+
+    ``max_connections`` is split between the ``workers`` processes that each
+    have their own pool. Unless ``pool_size`` and ``max_overflow`` are set, a
+    third of a worker's share is kept open and the rest is overflow, but never
+    more than the default 10 + 20 connections. ``pgbouncer`` disables
+    prepared statements, which PgBouncer in transaction pooling mode does not
+    support.
+    """
+
+    def option(name: str, convert: Callable[[str], Any], default: Any) -> Any:
+        value = get_option(name)
+        return convert(value) if value else default
+
+    max_connections = option("max_connections", int, DEFAULT_MAX_CONNECTIONS)
+    per_worker = max(
+        1, min(DEFAULT_POOL_SIZE + DEFAULT_MAX_OVERFLOW, max_connections // max(workers, 1))
+    )
+    pool_size = option("pool_size", int, max(per_worker // 3, 1))
+    return DatabaseSettings(
+        url=url,
+        pool_size=pool_size,
+        max_overflow=option("max_overflow", int, max(per_worker - pool_size, 0)),
+        pool_timeout=option("pool_timeout", float, 30.0),
+        pool_recycle=option("pool_recycle", int, -1),
+        pool_pre_ping=option("pool_pre_ping", _is_true, False),
+        prepared_statements=not option("pgbouncer", _is_true, False),
+    )
 
 
 def _read_env_or_file(env_var: str, file_env_var: str) -> str:
@@ -71,7 +135,11 @@ def _get_url() -> URL:  # pragma: no cover
 
 
 def build_settings() -> DatabaseSettings:  # pragma: no cover
-    return DatabaseSettings(url=_get_url())
+    return database_settings(
+        _get_url(),
+        lambda name: os.getenv(f"UCSSCHOOL_KELVIN_DB_{name.upper()}"),
+        workers=int(os.getenv("NUM_WORKERS") or 1),
+    )
 
 
 def build_engine(settings: DatabaseSettings) -> AsyncEngine:  # pragma: no cover
@@ -97,8 +165,14 @@ def build_engine(settings: DatabaseSettings) -> AsyncEngine:  # pragma: no cover
     return create_async_engine(
         settings.url,
         echo=settings.echo,
+        poolclass=MeasuredAsyncQueuePool,
         pool_size=settings.pool_size,
         max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+        # psycopg prepares statements executed repeatedly on a connection
+        connect_args={} if settings.prepared_statements else {"prepare_threshold": None},
     )
 
 
@@ -147,6 +221,9 @@ class KelvinSqlAlchemySession(KelvinStorageSession):
         self._roles: SQLAlchemyRoleManager | None = None
         self._groups: SQLAlchemyGroupManager | None = None
         self._users: SQLAlchemyUserManager | None = None
+        self._user_rows: SQLAlchemyUserProjection | None = None
+        self._versions: SQLAlchemyVersionProjection | None = None
+        self._changes: SQLAlchemyChangeProjection | None = None
 
     async def __aenter__(self) -> Self:
         self._session = self._session_factory()
@@ -177,6 +254,9 @@ class KelvinSqlAlchemySession(KelvinStorageSession):
             self._roles = None
             self._groups = None
             self._users = None
+            self._user_rows = None
+            self._versions = None
+            self._changes = None
 
     @property
     def schools(self) -> Manager[School]:
@@ -202,6 +282,24 @@ class KelvinSqlAlchemySession(KelvinStorageSession):
             self._users = SQLAlchemyUserManager(self._require_session())
         return self._users
 
+    @property
+    def user_rows(self) -> UserProjection:
+        if self._user_rows is None:
+            self._user_rows = SQLAlchemyUserProjection(self._require_session())
+        return self._user_rows
+
+    @property
+    def versions(self) -> VersionProjection:
+        if self._versions is None:
+            self._versions = SQLAlchemyVersionProjection(self._require_session())
+        return self._versions
+
+    @property
+    def changes(self) -> ChangeProjection:
+        if self._changes is None:
+            self._changes = SQLAlchemyChangeProjection(self._require_session())
+        return self._changes
+
     @property
     def session(self) -> AsyncSession:
         """Return the active SQLAlchemy session for adapter-level compatibility layers."""
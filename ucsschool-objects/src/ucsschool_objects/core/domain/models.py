@@ -63,6 +63,8 @@ class School:
         "_home_share_file_server",
         "_udm_properties",
     )
+    # Instances store exactly the serialized fields, without a per-instance __dict__.
+    __slots__ = __serialize_fields__
 
     def __init__(
         self,
@@ -201,6 +203,7 @@ class Role:
         "_name",
         "_display_name",
     )
+    __slots__ = __serialize_fields__
 
     def __init__(
         self,
@@ -253,6 +256,7 @@ class Group:
         "_description",
         "_udm_properties",
     )
+    __slots__ = __serialize_fields__
 
     def __init__(
         self,
@@ -438,6 +442,7 @@ class SchoolMembership:
         "roles",
         "groups",
     )
+    __slots__ = __serialize_fields__
 
     def __init__(
         self,
@@ -488,6 +493,7 @@ class User:
         "_expiration_date",
         "_udm_properties",
     )
+    __slots__ = __serialize_fields__
 
     def __init__(
         self,
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Port definitions for read-only projection queries.
+
+Projections return flat row types instead of domain objects. They accept the
+same query and sort DSL as the managers, so a list endpoint can switch between
+the two without changing how it builds its filters.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
+
+    from ucsschool_objects.core.domain.projections import ChangeRow, UserRow, VersionRow
+    from ucsschool_objects.core.domain.query import SearchQuery, SortSpec
+
+
+class UserProjection(Protocol):
+    """Abstract contract for listing users as flat rows."""
+
+    async def search(
+        self,
+        query: SearchQuery | None = None,
+        *,
+        sort_by: Sequence[SortSpec] = (),
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[UserRow]:  # pragma: no cover
+        """Return rows for the users matching query and pagination/sorting criteria.
+
+        Args:
+            query: Optional structured filter expression, as for ``Manager.search``.
+            sort_by: Sort fields and direction.
+            limit: Maximum number of rows to return; ``None`` (default) returns all.
+            offset: Number of matching users to skip.
+        """
+
+        ...
+
+
+class VersionProjection(Protocol):
+    """Abstract contract for reading the versions of users and groups without loading them."""
+
+    async def users(self, query: SearchQuery | None = None) -> list[VersionRow]:  # pragma: no cover
+        """Return the versions of the users matching query.
+
+        Args:
+            query: Optional structured filter expression, as for ``Manager.search``.
+        """
+
+        ...
+
+    async def groups(self, query: SearchQuery | None = None) -> list[VersionRow]:  # pragma: no cover
+        """Return the versions of the groups matching query.
+
+        Args:
+            query: Optional structured filter expression, as for ``Manager.search``.
+        """
+
+        ...
+
+
+class ChangeProjection(Protocol):
+    """Abstract contract for reading the change log of users and groups."""
+
+    async def users(
+        self, *, after: int = 0, since: datetime | None = None, limit: int | None = None
+    ) -> list[ChangeRow]:  # pragma: no cover
+        """Return the changes of users in the order they were made.
+
+        Args:
+            after: Only return changes with a greater cursor.
+            since: Only return changes made at or after this time.
+            limit: Maximum number of changes to return; ``None`` (default) returns all.
+        """
+
+        ...
+
+    async def groups(
+        self, *, after: int = 0, since: datetime | None = None, limit: int | None = None
+    ) -> list[ChangeRow]:  # pragma: no cover
+        """Return the changes of groups in the order they were made.
+
+        Args:
+            after: Only return changes with a greater cursor.
+            since: Only return changes made at or after this time.
+            limit: Maximum number of changes to return; ``None`` (default) returns all.
+        """
+
+        ...
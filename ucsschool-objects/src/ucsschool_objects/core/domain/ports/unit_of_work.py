@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from ucsschool_objects.core.domain.models import Group, Role, School, User
 
     from .manager import Manager
+    from .projection import ChangeProjection, UserProjection, VersionProjection
 
 
 class KelvinStorageSession(Protocol):
@@ -42,6 +43,24 @@ class KelvinStorageSession(Protocol):
 
         ...
 
+    @property
+    def user_rows(self) -> UserProjection:  # pragma: no cover
+        """Read-only user projection bound to this transaction scope."""
+
+        ...
+
+    @property
+    def versions(self) -> VersionProjection:  # pragma: no cover
+        """Read-only projection of user and group versions bound to this transaction scope."""
+
+        ...
+
+    @property
+    def changes(self) -> ChangeProjection:  # pragma: no cover
+        """Read-only projection of the user and group change log bound to this transaction scope."""
+
+        ...
+
     async def __aenter__(self) -> Self:  # pragma: no cover
         """Open transactional resources."""
 
@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Flat, read-only row types returned by projection queries.
+
+Projections are the read-optimised counterpart to the managers: they skip the
+domain object graph (identity semantics, lazy-field guards, change tracking)
+and return plain immutable rows carrying exactly what list responses render.
+Related objects are reduced to the names a response needs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import StrEnum
+from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class GroupRow:
+    """Group a user is a member of, reduced to its name, school and role names."""
+
+    public_id: UUID
+    name: str
+    school_name: str
+    role_names: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SchoolMembershipRow:
+    """One school membership of a user with the names of its roles."""
+
+    school_name: str
+    is_primary: bool
+    role_names: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class VersionRow:
+    """Stored version of a user or group.
+
+    The version changes whenever the object or what it shows of related
+    objects changes, so ``(public_id, version)`` identifies one state of it.
+    """
+
+    public_id: UUID
+    version: int
+
+
+class ChangeAction(StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeRow:
+    """One entry of the change log of users or groups.
+
+    ``cursor`` increases with every change; passing the last one seen as
+    ``after`` returns the changes made since. ``name`` and ``school_name``
+    (groups only) are those at the time of the change, so a ``DELETED``
+    entry still identifies the deleted object.
+    """
+
+    cursor: int
+    action: ChangeAction
+    public_id: UUID
+    name: str
+    school_name: str | None
+    changed_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class UserRow:
+    """User projection carrying scalar fields plus flattened relations.
+
+    ``school_memberships`` and ``groups`` are sorted by school and group name,
+    role names within them alphabetically, and guardian and ward names
+    alphabetically, so rows are deterministic for a given database state.
+    """
+
+    public_id: UUID
+    record_uid: str
+    source_uid: str
+    name: str
+    firstname: str
+    lastname: str
+    email: str | None
+    birthday: date | None
+    expiration_date: date | None
+    active: bool
+    udm_properties: dict[str, object]
+    school_memberships: tuple[SchoolMembershipRow, ...]
+    groups: tuple[GroupRow, ...]
+    legal_guardian_names: tuple[str, ...]
+    legal_ward_names: tuple[str, ...]
+
+    @property
+    def primary_school_name(self) -> str:
+        for membership in self.school_memberships:
+            if membership.is_primary:
+                return membership.school_name
+        raise ValueError("User has no primary school membership.")
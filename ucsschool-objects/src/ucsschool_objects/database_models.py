@@ -14,7 +14,7 @@
 from __future__ import annotations
 
 import uuid
-from datetime import date
+from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import (
@@ -23,11 +23,15 @@ from sqlalchemy import (
     INTEGER,
     JSON,
     UUID,
+    BigInteger,
     Boolean,
+    DateTime,
     ForeignKey,
+    Index,
     String,
     UniqueConstraint,
     event,
+    func,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -147,6 +151,18 @@ class Group(Base):
         String(255), nullable=True, info={"udm_attr": "description"}
     )
     udm_properties: Mapped[dict[str, object]] = mapped_column(_json_type(), nullable=False, default=dict)
+    version: Mapped[int] = mapped_column(
+        INTEGER,
+        nullable=False,
+        default=1,
+        server_default="1",
+        info={
+            "doc": (
+                "Incremented on every change of the group and of the related objects shown"
+                " in its representation, e.g. for entity tags."
+            )
+        },
+    )
 
     roles: Mapped[list["Role"]] = relationship("Role", secondary="group_role_association", lazy="raise")
 
@@ -227,6 +243,18 @@ class User(Base):
         BOOLEAN, nullable=False, default=True, info={"udm_attr": "disabled"}
     )
     udm_properties: Mapped[dict[str, object]] = mapped_column(_json_type(), nullable=False, default=dict)
+    version: Mapped[int] = mapped_column(
+        INTEGER,
+        nullable=False,
+        default=1,
+        server_default="1",
+        info={
+            "doc": (
+                "Incremented on every change of the user and of the related objects shown"
+                " in its representation, e.g. for entity tags."
+            )
+        },
+    )
 
     legal_wards: Mapped[list["User"]] = relationship(
         secondary="legal_guardian_association",
@@ -422,3 +450,38 @@ class UserDNMapping(Base):
         ForeignKey("user.public_id", ondelete="CASCADE"), nullable=False, index=True, unique=True
     )
     dn: Mapped[str] = mapped_column(String(4096), nullable=False, index=True, unique=True)
+
+
+######################
+##### Change log #####
+######################
+
+
+class ChangeLog(Base):
+    """One change of a user or group, in the order the changes were made.
+
+    The managers append an entry for every created and deleted object and for
+    every increment of a version, see ``managers._versions``. Name and school
+    are copied, so the entry of a deleted object still identifies it.
+    """
+
+    __tablename__: str = "change_log"
+    __table_args__: tuple[Index, ...] = (
+        Index("ix_change_log_object_type_id", "object_type", "id"),
+        Index("ix_change_log_changed_at", "changed_at"),
+    )
+
+    # SQLite only autoincrements INTEGER primary keys
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(INTEGER(), "sqlite"), primary_key=True, autoincrement=True
+    )
+    object_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    public_id: Mapped[uuid.UUID] = mapped_column(UUID, nullable=False)
+    action: Mapped[str] = mapped_column(String(16), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    school_name: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, info={"doc": "Name of the school of a group."}
+    )
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -12,6 +12,7 @@ from uuid import uuid4
 import pytest
 from sqlalchemy import inspect
 from ucsschool_objects import (
+    UNLOADED,
     UNSET,
     And,
     Filter,
@@ -43,7 +44,10 @@ from ucsschool_objects.core.adapters.sqlalchemy.managers.user_manager import (
     SQLAlchemyUserManager,
 )
 from ucsschool_objects.core.adapters.sqlalchemy.mappers import to_domain
-from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_domain import _is_loaded, _loaded_value
+from ucsschool_objects.core.adapters.sqlalchemy.mappers.to_domain import (
+    _field_reader,
+    _unloaded_attributes,
+)
 from ucsschool_objects.core.domain.errors import UnsupportedNestedField
 from ucsschool_objects.core.domain.models import is_loaded
 from ucsschool_objects.database_models import School as SchoolModel
@@ -314,16 +318,18 @@ def test_iter_filters_handles_filter_and_and_or_and_not() -> None:
     assert filters[2].field == "active"
 
 
-def test_is_loaded_returns_true_when_sqlalchemy_state_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_unloaded_attributes_empty_when_state_missing(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
     class _Model:
         value = "x"
 
     monkeypatch.setattr(to_domain, "inspect", lambda *_args, **_kwargs: None)
 
-    assert _is_loaded(_Model(), "value") is True
+    assert _unloaded_attributes(_Model()) == frozenset()
 
 
-def test_is_loaded_returns_true_when_state_has_no_unloaded(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_unloaded_attributes_empty_when_state_has_no_unloaded(monkeypatch: pytest.MonkeyPatch) -> None:
     class _State:
         unloaded = None
 
@@ -332,17 +338,22 @@ def test_is_loaded_returns_true_when_state_has_no_unloaded(monkeypatch: pytest.M
 
     monkeypatch.setattr(to_domain, "inspect", lambda *_args, **_kwargs: _State())
 
-    assert _is_loaded(_Model(), "value") is True
+    assert _unloaded_attributes(_Model()) == frozenset()
 
 
-def test_loaded_value_without_transform_returns_raw_value(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_field_reader_reads_only_loaded_attributes() -> None:
     class _Model:
         value = "raw-value"
 
-    monkeypatch.setattr(to_domain, "inspect", lambda *_args, **_kwargs: None)
+        @property
+        def other(self) -> str:
+            raise AssertionError("Unloaded attribute must not be read.")
+
+    fields = (("value", "value", lambda v: v), ("renamed", "other", str))
+    read = _field_reader(fields, frozenset({"other"}))
 
-    model = _Model()
-    assert _loaded_value(model, "value") == "raw-value"
+    assert read(_Model()) == {"value": "raw-value", "renamed": UNLOADED}
+    assert _field_reader(fields, frozenset({"other"})) is read
 
 
 def test_to_group_keeps_unloaded_relations_unloaded(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -400,7 +411,7 @@ def test_to_user_raises_when_membership_school_has_no_uuid(
     monkeypatch.setattr(
         to_domain,
         "_to_school_membership",
-        lambda _membership: SchoolMembership(
+        lambda _membership, _context: SchoolMembership(
             school=School(
                 public_id=UNSET,
                 record_uid="school-record",
@@ -420,3 +431,17 @@ def test_to_user_raises_when_membership_school_has_no_uuid(
         to_domain.to_user(
             model,  # type: ignore[arg-type]
         )
+
+
+def test_conversion_context_converts_models_without_public_id_separately(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(to_domain, "inspect", lambda *_args, **_kwargs: None)
+    context = to_domain.ConversionContext()
+    public_id = uuid4()
+    stored = SimpleNamespace(public_id=public_id, name="role", display_name={"de": "Rolle"})
+    new = SimpleNamespace(public_id=None, name="role", display_name={"de": "Rolle"})
+
+    assert to_domain.to_role(stored, context) is to_domain.to_role(stored, context)  # type: ignore[arg-type]
+    assert to_domain.to_role(new, context) is not to_domain.to_role(new, context)  # type: ignore[arg-type]
+    assert to_domain.to_role(stored) is not to_domain.to_role(stored)  # type: ignore[arg-type]
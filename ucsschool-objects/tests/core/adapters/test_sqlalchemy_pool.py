@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from ucsschool_objects.core.adapters.sqlalchemy.pool import MeasuredAsyncQueuePool, pool_status
+from ucsschool_objects.core.adapters.sqlalchemy.session import (
+    DatabaseSettings,
+    build_engine,
+    database_settings,
+)
+
+if TYPE_CHECKING:
+    import pathlib
+
+URL = make_url("postgresql+psycopg://kelvin@db.example/kelvin")
+
+
+@pytest.mark.parametrize(
+    ("options", "workers", "expected"),
+    [
+        pytest.param({}, 1, DatabaseSettings(url=URL), id="defaults"),
+        pytest.param({}, 2, DatabaseSettings(url=URL), id="default-two-workers"),
+        pytest.param({}, 8, DatabaseSettings(url=URL, pool_size=2, max_overflow=5), id="many-workers"),
+        pytest.param(
+            {}, 100, DatabaseSettings(url=URL, pool_size=1, max_overflow=0), id="too-many-workers"
+        ),
+        pytest.param(
+            {"max_connections": "200", "pool_size": "", "max_overflow": None},
+            4,
+            DatabaseSettings(url=URL),
+            id="capped-at-defaults",
+        ),
+        pytest.param(
+            {"max_connections": "40", "pool_size": "12"},
+            4,
+            DatabaseSettings(url=URL, pool_size=12, max_overflow=0),
+            id="explicit-pool-size",
+        ),
+        pytest.param(
+            {
+                "pool_size": "5",
+                "max_overflow": "2",
+                "pool_timeout": "2.5",
+                "pool_recycle": "1800",
+                "pool_pre_ping": "yes",
+                "pgbouncer": "true",
+            },
+            1,
+            DatabaseSettings(
+                url=URL,
+                pool_size=5,
+                max_overflow=2,
+                pool_timeout=2.5,
+                pool_recycle=1800,
+                pool_pre_ping=True,
+                prepared_statements=False,
+            ),
+            id="all-options",
+        ),
+    ],
+)
+def test_database_settings(
+    options: dict[str, str | None], workers: int, expected: DatabaseSettings
+) -> None:
+    assert database_settings(URL, options.get, workers=workers) == expected
+
+
+@pytest.mark.asyncio
+async def test_pool_status_counts_checkouts(tmp_path: pathlib.Path) -> None:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.sqlite'}",
+        poolclass=MeasuredAsyncQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            await first.execute(text("SELECT 1"))
+            await second.execute(text("SELECT 1"))
+            during = pool_status(engine)
+        after = pool_status(engine)
+    finally:
+        await engine.dispose()
+
+    assert during is not None
+    assert after is not None
+    assert (during.size, during.max_overflow) == (1, 1)
+    assert (during.checked_out, during.overflow, during.checkouts) == (2, 1, 2)
+    assert (after.checked_out, after.checkouts) == (0, 2)
+    assert 0 <= after.max_wait_seconds <= after.wait_seconds
+
+
+@pytest.mark.asyncio
+async def test_pool_status_without_measured_pool() -> None:
+    engine = build_engine(DatabaseSettings(url=make_url("sqlite+aiosqlite:///:memory:")))
+    try:
+        assert pool_status(engine) is None
+    finally:
+        await engine.dispose()
@@ -167,7 +167,9 @@ async def test_session_scope_rolls_back_on_exception(
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize("prop_name", ["schools", "roles", "groups", "users"])
+@pytest.mark.parametrize(
+    "prop_name", ["schools", "roles", "groups", "users", "user_rows", "versions", "changes"]
+)
 async def test_protocol_port_getter(
     wired_storage_factory: KelvinSqlAlchemySessionFactory,
     prop_name: str,
@@ -179,7 +181,9 @@ async def test_protocol_port_getter(
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize("prop_name", ["session", "schools", "roles", "groups", "users"])
+@pytest.mark.parametrize(
+    "prop_name", ["session", "schools", "roles", "groups", "users", "user_rows", "versions", "changes"]
+)
 async def test_raises_when_session_not_active(
     wired_storage_factory: KelvinSqlAlchemySessionFactory,
     prop_name: str,
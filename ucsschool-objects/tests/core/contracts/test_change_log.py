@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""The managers must log every change of a user or group in the order it was made."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from ucsschool_objects import ChangeAction, Group, Role, School, User
+from ucsschool_objects.core.adapters.sqlalchemy import (
+    SQLAlchemyChangeProjection,
+    SQLAlchemyGroupManager,
+    SQLAlchemySchoolManager,
+    SQLAlchemyUserManager,
+)
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from tests.test_types import (
+        AsyncGroupFactory as GroupFactory,
+        AsyncRoleFactory as RoleFactory,
+        AsyncSchoolFactory as SchoolFactory,
+        AsyncSchoolMembershipFactory as SchoolMembershipFactory,
+        AsyncUserFactory as UserFactory,
+    )
+    from ucsschool_objects.database_models import School as SchoolModel, User as UserModel
+
+
+@pytest.fixture
+async def student(
+    school_factory: SchoolFactory,
+    user_factory: UserFactory,
+    school_membership_factory: SchoolMembershipFactory,
+) -> tuple[SchoolModel, UserModel]:
+    school = await school_factory(name="change-school")
+    user = await user_factory()
+    await school_membership_factory(user=user, school=school, is_primary=True)
+    return school, user
+
+
+async def _create_workgroup(
+    session: AsyncSession, school: SchoolModel, role_factory: RoleFactory, member: UserModel
+) -> uuid.UUID:
+    role = await role_factory(name="workgroup")
+    public_id = uuid.uuid4()
+    await SQLAlchemyGroupManager(session).create(
+        Group(
+            public_id=public_id,
+            record_uid="rec-change-wg",
+            udm_properties={},
+            source_uid="src-change-wg",
+            name="change-school-wg",
+            display_name="wg",
+            create_share=False,
+            description=None,
+            roles={Role.minimal(role.public_id)},
+            allowed_email_senders_users=set(),
+            allowed_email_senders_groups=set(),
+            members={User.minimal(member.public_id)},
+            member_roles=set(),
+            school=School.minimal(school.public_id),
+            email=None,
+        )
+    )
+    return public_id
+
+
+@pytest.mark.asyncio
+async def test_changes_are_logged_in_order(
+    db_session: AsyncSession,
+    student: tuple[SchoolModel, UserModel],
+    role_factory: RoleFactory,
+) -> None:
+    school, user = student
+    changes = SQLAlchemyChangeProjection(db_session)
+
+    group_id = await _create_workgroup(db_session, school, role_factory, user)
+    await SQLAlchemyUserManager(db_session).modify(
+        user.public_id, [{"op": "replace", "path": "/firstname", "value": "Changed"}]
+    )
+    await SQLAlchemyGroupManager(db_session).delete(group_id)
+
+    group_changes = await changes.groups()
+    user_changes = await changes.users()
+    assert [(row.action, row.public_id, row.name, row.school_name) for row in group_changes] == [
+        (ChangeAction.CREATED, group_id, "change-school-wg", "change-school"),
+        (ChangeAction.DELETED, group_id, "change-school-wg", "change-school"),
+    ]
+    assert [(row.action, row.public_id, row.school_name) for row in user_changes] == [
+        (ChangeAction.UPDATED, user.public_id, None)
+    ] * 3
+    cursors = sorted(row.cursor for row in [*group_changes, *user_changes])
+    assert [row.cursor for row in group_changes] == [cursors[0], cursors[-1]]
+
+
+async def _last_cursor(changes: SQLAlchemyChangeProjection) -> int:
+    return max(row.cursor for row in [*await changes.users(), *await changes.groups()])
+
+
+@pytest.mark.asyncio
+async def test_school_rename_is_logged_for_its_members_and_groups(
+    db_session: AsyncSession,
+    student: tuple[SchoolModel, UserModel],
+    role_factory: RoleFactory,
+) -> None:
+    school, user = student
+    changes = SQLAlchemyChangeProjection(db_session)
+    group_id = await _create_workgroup(db_session, school, role_factory, user)
+    cursor = await _last_cursor(changes)
+
+    await SQLAlchemySchoolManager(db_session).modify(
+        school.public_id, [{"op": "replace", "path": "/name", "value": "renamed-school"}]
+    )
+
+    assert [
+        (row.action, row.public_id, row.school_name) for row in await changes.groups(after=cursor)
+    ] == [(ChangeAction.UPDATED, group_id, "renamed-school")]
+    assert [(row.action, row.public_id) for row in await changes.users(after=cursor)] == [
+        (ChangeAction.UPDATED, user.public_id)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_school_delete_is_logged_for_its_members_and_their_groups(
+    db_session: AsyncSession,
+    student: tuple[SchoolModel, UserModel],
+    school_factory: SchoolFactory,
+    group_factory: GroupFactory,
+    school_membership_factory: SchoolMembershipFactory,
+) -> None:
+    school, user = student
+    group = await group_factory(school=school)
+    other_school = await school_factory()
+    await school_membership_factory(user=user, school=other_school, groups=[group])
+    changes = SQLAlchemyChangeProjection(db_session)
+
+    await SQLAlchemySchoolManager(db_session).delete(other_school.public_id)
+
+    assert [(row.action, row.public_id) for row in await changes.groups()] == [
+        (ChangeAction.UPDATED, group.public_id)
+    ]
+    assert [(row.action, row.public_id) for row in await changes.users()] == [
+        (ChangeAction.UPDATED, user.public_id)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_changes_after_since_and_limit(
+    db_session: AsyncSession, student: tuple[SchoolModel, UserModel]
+) -> None:
+    _school, user = student
+    manager = SQLAlchemyUserManager(db_session)
+    changes = SQLAlchemyChangeProjection(db_session)
+    for firstname in ("One", "Two", "Three"):
+        await manager.modify(
+            user.public_id, [{"op": "replace", "path": "/firstname", "value": firstname}]
+        )
+
+    all_changes = await changes.users()
+    # SQLite keeps CURRENT_TIMESTAMP in seconds, so compare from just before it
+    since = all_changes[0].changed_at - timedelta(seconds=1)
+
+    assert [row.cursor for row in await changes.users(after=all_changes[0].cursor)] == [
+        row.cursor for row in all_changes[1:]
+    ]
+    assert await changes.users(after=all_changes[0].cursor, limit=1) == all_changes[1:2]
+    assert await changes.users(since=since) == all_changes
+    assert await changes.users(since=since + timedelta(days=1)) == []
+    assert await changes.groups(since=datetime(2000, 1, 1)) == []
@@ -0,0 +1,267 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""The managers must change the version of every object whose representation they change."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from ucsschool_objects import (
+    And,
+    Filter,
+    LoadSpec,
+    Operator,
+    SearchQuery,
+    User,
+    VersionRow,
+    track_changes,
+)
+from ucsschool_objects.core.adapters.sqlalchemy import (
+    SQLAlchemyGroupManager,
+    SQLAlchemySchoolManager,
+    SQLAlchemyUserManager,
+    SQLAlchemyVersionProjection,
+)
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from tests.test_types import (
+        AsyncGroupFactory as GroupFactory,
+        AsyncRoleFactory as RoleFactory,
+        AsyncSchoolFactory as SchoolFactory,
+        AsyncSchoolMembershipFactory as SchoolMembershipFactory,
+        AsyncUserFactory as UserFactory,
+    )
+    from ucsschool_objects.database_models import Group as GroupModel, User as UserModel
+
+
+async def _versions(session: AsyncSession, *objects: UserModel | GroupModel) -> dict[UUID, int]:
+    projection = SQLAlchemyVersionProjection(session)
+    public_ids = [obj.public_id for obj in objects]
+    query = SearchQuery(where=Filter(field="public_id", op=Operator.IN, value=public_ids))
+    rows = [*await projection.users(query), *await projection.groups(query)]
+    return {row.public_id: row.version for row in rows}
+
+
+def _changed(before: dict[UUID, int], after: dict[UUID, int]) -> set[UUID]:
+    return {public_id for public_id, version in after.items() if version != before[public_id]}
+
+
+@pytest.fixture
+async def family(
+    school_factory: SchoolFactory,
+    group_factory: GroupFactory,
+    user_factory: UserFactory,
+    school_membership_factory: SchoolMembershipFactory,
+) -> tuple[UserModel, GroupModel, GroupModel, UserModel]:
+    """A ward in a school class, an empty workgroup and the ward's legal guardian."""
+    school = await school_factory()
+    school_class = await group_factory(school=school)
+    workgroup = await group_factory(school=school)
+    ward = await user_factory()
+    await school_membership_factory(user=ward, school=school, is_primary=True, groups=[school_class])
+    guardian = await user_factory(legal_wards=[ward])
+    return ward, school_class, workgroup, guardian
+
+
+@pytest.mark.asyncio
+async def test_new_objects_have_version_one(
+    db_session: AsyncSession, family: tuple[UserModel, GroupModel, GroupModel, UserModel]
+) -> None:
+    ward, school_class, _workgroup, _guardian = family
+
+    rows = await SQLAlchemyVersionProjection(db_session).users(
+        SearchQuery(where=Filter(field="name", op=Operator.EQ, value=ward.name))
+    )
+
+    assert rows == [VersionRow(public_id=ward.public_id, version=1)]
+    assert (await _versions(db_session, school_class))[school_class.public_id] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("path", "value", "related_changed"),
+    [
+        pytest.param("/firstname", "Changed", False, id="scalar"),
+        pytest.param("/name", "renamed-ward", True, id="rename"),
+    ],
+)
+async def test_user_modify_bumps_objects_showing_the_user(
+    db_session: AsyncSession,
+    family: tuple[UserModel, GroupModel, GroupModel, UserModel],
+    path: str,
+    value: str,
+    related_changed: bool,
+) -> None:
+    ward, school_class, _workgroup, guardian = family
+    before = await _versions(db_session, *family)
+
+    await SQLAlchemyUserManager(db_session).modify(
+        ward.public_id, [{"op": "replace", "path": path, "value": value}]
+    )
+
+    expected = {ward.public_id}
+    if related_changed:
+        expected |= {school_class.public_id, guardian.public_id}
+    assert _changed(before, await _versions(db_session, *family)) == expected
+
+
+@pytest.mark.asyncio
+async def test_user_modify_relations_bumps_linked_and_unlinked_objects(
+    db_session: AsyncSession, family: tuple[UserModel, GroupModel, GroupModel, UserModel]
+) -> None:
+    ward, school_class, _workgroup, guardian = family
+    manager = SQLAlchemyUserManager(db_session)
+    user = await manager.get(
+        ward.public_id, load=LoadSpec.from_attributes("school_memberships", "legal_guardians")
+    )
+    before = await _versions(db_session, *family)
+
+    with track_changes(user) as tracker:
+        membership = next(iter(user.school_memberships.values()))
+        membership.groups = {
+            group for group in membership.groups if group.public_id != school_class.public_id
+        }
+        user.legal_guardians = set()
+    await manager.modify(ward.public_id, tracker.patch)
+
+    assert _changed(before, await _versions(db_session, *family)) == {
+        ward.public_id,
+        school_class.public_id,
+        guardian.public_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_group_modify_members_bumps_linked_users_only(
+    db_session: AsyncSession,
+    family: tuple[UserModel, GroupModel, GroupModel, UserModel],
+    school_membership_factory: SchoolMembershipFactory,
+) -> None:
+    _ward, school_class, _workgroup, guardian = family
+    await school_membership_factory(user=guardian, school=school_class.school, is_primary=True)
+    manager = SQLAlchemyGroupManager(db_session)
+    group = await manager.get(school_class.public_id, load=LoadSpec.from_attributes("members"))
+    before = await _versions(db_session, *family)
+
+    with track_changes(group) as tracker:
+        group.members = {*group.members, User.minimal(guardian.public_id)}
+    await manager.modify(school_class.public_id, tracker.patch)
+
+    assert _changed(before, await _versions(db_session, *family)) == {
+        school_class.public_id,
+        guardian.public_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_group_rename_bumps_all_members(
+    db_session: AsyncSession, family: tuple[UserModel, GroupModel, GroupModel, UserModel]
+) -> None:
+    ward, school_class, _workgroup, _guardian = family
+    before = await _versions(db_session, *family)
+
+    await SQLAlchemyGroupManager(db_session).modify(
+        school_class.public_id, [{"op": "replace", "path": "/name", "value": "renamed-class"}]
+    )
+
+    assert _changed(before, await _versions(db_session, *family)) == {
+        school_class.public_id,
+        ward.public_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_delete_bumps_objects_showing_the_deleted_one(
+    db_session: AsyncSession, family: tuple[UserModel, GroupModel, GroupModel, UserModel]
+) -> None:
+    ward, school_class, workgroup, guardian = family
+    before = await _versions(db_session, *family)
+
+    await SQLAlchemyGroupManager(db_session).delete(school_class.public_id)
+    after_group_delete = await _versions(db_session, ward, workgroup, guardian)
+    await SQLAlchemyUserManager(db_session).delete(ward.public_id)
+    after_user_delete = await _versions(db_session, workgroup, guardian)
+
+    assert _changed(before, after_group_delete) == {ward.public_id}
+    assert _changed(before, after_user_delete) == {guardian.public_id}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("path", "value", "related_changed"),
+    [
+        pytest.param("/display_name", "Changed", False, id="scalar"),
+        pytest.param("/name", "renamedschool", True, id="rename"),
+    ],
+)
+async def test_school_modify_bumps_objects_showing_the_school(
+    db_session: AsyncSession,
+    family: tuple[UserModel, GroupModel, GroupModel, UserModel],
+    path: str,
+    value: str,
+    related_changed: bool,
+) -> None:
+    ward, school_class, workgroup, _guardian = family
+    before = await _versions(db_session, *family)
+
+    await SQLAlchemySchoolManager(db_session).modify(
+        school_class.school.public_id, [{"op": "replace", "path": path, "value": value}]
+    )
+
+    expected: set[UUID] = set()
+    if related_changed:
+        expected = {ward.public_id, school_class.public_id, workgroup.public_id}
+    assert _changed(before, await _versions(db_session, *family)) == expected
+
+
+@pytest.mark.asyncio
+async def test_school_delete_bumps_members_and_their_groups(
+    db_session: AsyncSession,
+    family: tuple[UserModel, GroupModel, GroupModel, UserModel],
+    school_factory: SchoolFactory,
+    school_membership_factory: SchoolMembershipFactory,
+) -> None:
+    _ward, _school_class, workgroup, guardian = family
+    other_school = await school_factory()
+    await school_membership_factory(user=guardian, school=other_school, groups=[workgroup])
+    before = await _versions(db_session, *family)
+
+    await SQLAlchemySchoolManager(db_session).delete(other_school.public_id)
+
+    assert _changed(before, await _versions(db_session, *family)) == {
+        workgroup.public_id,
+        guardian.public_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_group_versions_filter_by_role(
+    db_session: AsyncSession,
+    school_factory: SchoolFactory,
+    group_factory: GroupFactory,
+    role_factory: RoleFactory,
+) -> None:
+    school = await school_factory()
+    workgroup = await group_factory(school=school, roles=[await role_factory(name="workgroup")])
+    await group_factory(school=school, roles=[await role_factory(name="school_class")])
+    projection = SQLAlchemyVersionProjection(db_session)
+
+    def by_name_and_role(role: str) -> SearchQuery:
+        return SearchQuery(
+            where=And(
+                clauses=(
+                    Filter(field="name", op=Operator.EQ, value=workgroup.name),
+                    Filter(field="roles.name", op=Operator.EQ, value=role),
+                )
+            )
+        )
+
+    assert await projection.groups(by_name_and_role("school_class")) == []
+    assert await projection.groups(by_name_and_role("workgroup")) == [
+        VersionRow(public_id=workgroup.public_id, version=1)
+    ]
@@ -39,3 +39,29 @@ async def test_primary_school_raises_when_no_primary(
     assert len(results) == 1
     with pytest.raises(ValueError, match="no primary school"):
         _ = results[0].primary_school
+
+
+@pytest.mark.asyncio
+async def test_search_shares_school_objects_between_users(
+    db_session: AsyncSession,
+    school_factory: SchoolFactory,
+    user_factory: UserFactory,
+    school_membership_factory: SchoolMembershipFactory,
+) -> None:
+    school = await school_factory(name="shared_school")
+    for name in ("shareduser1", "shareduser2"):
+        user = await user_factory(name=name)
+        await school_membership_factory(user=user, school=school, is_primary=True)
+
+    manager = SQLAlchemyUserManager(db_session)
+    results = list(
+        await manager.search(
+            SearchQuery(where=Filter(field="name", op=Operator.MATCHES, value="shareduser*")),
+            load=LoadSpec.from_attributes("school_memberships"),
+        )
+    )
+    assert len(results) == 2
+    schools = [membership.school for user in results for membership in user.school_memberships.values()]
+    assert len(schools) == 2
+    assert schools[0] is schools[1]
+    assert schools[0].public_id == school.public_id
@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: 2026 Univention GmbH
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""The user projection must return the same data as the user manager."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from ucsschool_objects import (
+    Filter,
+    GroupRow,
+    LoadSpec,
+    Operator,
+    SchoolMembershipRow,
+    SearchQuery,
+    SortSpec,
+    User,
+    UserRow,
+)
+from ucsschool_objects.core.adapters.sqlalchemy import SQLAlchemyUserManager, SQLAlchemyUserProjection
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from tests.test_types import (
+        AsyncGroupFactory as GroupFactory,
+        AsyncRoleFactory as RoleFactory,
+        AsyncSchoolFactory as SchoolFactory,
+        AsyncSchoolMembershipFactory as SchoolMembershipFactory,
+        AsyncUserFactory as UserFactory,
+    )
+
+_USER_LOAD_SPEC = LoadSpec.from_attributes(
+    "record_uid",
+    "source_uid",
+    "name",
+    "firstname",
+    "lastname",
+    "email",
+    "birthday",
+    "expiration_date",
+    "active",
+    "udm_properties",
+    "school_memberships",
+    "legal_guardians",
+    "legal_wards",
+)
+
+
+def _row_from_domain(user: User) -> UserRow:
+    return UserRow(
+        public_id=user.public_id,
+        record_uid=user.record_uid,
+        source_uid=user.source_uid,
+        name=user.name,
+        firstname=user.firstname,
+        lastname=user.lastname,
+        email=user.email,
+        birthday=user.birthday,
+        expiration_date=user.expiration_date,
+        active=user.active,
+        udm_properties=user.udm_properties,
+        school_memberships=tuple(
+            SchoolMembershipRow(
+                school_name=membership.school.name,
+                is_primary=membership.is_primary,
+                role_names=tuple(sorted(role.name for role in membership.roles)),
+            )
+            for membership in sorted(user.school_memberships.values(), key=lambda m: m.school.name)
+        ),
+        groups=tuple(
+            GroupRow(
+                public_id=group.public_id,
+                name=group.name,
+                school_name=group.school.name,
+                role_names=tuple(sorted(role.name for role in group.roles)),
+            )
+            for group in sorted(user.groups, key=lambda g: (g.school.name, g.name))
+        ),
+        legal_guardian_names=tuple(sorted(guardian.name for guardian in user.legal_guardians)),
+        legal_ward_names=tuple(sorted(ward.name for ward in user.legal_wards)),
+    )
+
+
+@pytest.fixture
+async def school_users(
+    school_factory: SchoolFactory,
+    role_factory: RoleFactory,
+    group_factory: GroupFactory,
+    user_factory: UserFactory,
+    school_membership_factory: SchoolMembershipFactory,
+) -> None:
+    school_a = await school_factory(name="projection_a")
+    school_b = await school_factory(name="projection_b")
+    student = await role_factory(name="student")
+    teacher = await role_factory(name="teacher")
+    school_class = await role_factory(name="school_class")
+    workgroup = await role_factory(name="workgroup")
+    class_1a = await group_factory(name="projection_a-1a", school=school_a, roles=[school_class])
+    class_1b = await group_factory(name="projection_a-1b", school=school_a, roles=[school_class])
+    chess = await group_factory(name="projection_b-chess", school=school_b, roles=[workgroup])
+
+    ward = await user_factory(name="projection_ward", udm_properties={"title": "Dr."})
+    await school_membership_factory(
+        user=ward, school=school_a, is_primary=True, roles=[student], groups=[class_1a]
+    )
+    await school_membership_factory(
+        user=ward, school=school_b, is_primary=False, roles=[student], groups=[chess]
+    )
+    teacher_user = await user_factory(name="projection_teacher")
+    await school_membership_factory(
+        user=teacher_user,
+        school=school_a,
+        is_primary=False,
+        roles=[teacher, student],
+        groups=[class_1a, class_1b],
+    )
+    await school_membership_factory(user=teacher_user, school=school_b, is_primary=True, roles=[teacher])
+    await user_factory(name="projection_guardian", legal_wards=[ward])
+    await user_factory(name="projection_unassigned")
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("school_users")
+@pytest.mark.parametrize(
+    ("query", "sort_by", "limit", "offset"),
+    [
+        pytest.param(None, (), None, 0, id="all"),
+        pytest.param(
+            SearchQuery(where=Filter(field="schools.name", op=Operator.EQ, value="projection_a")),
+            (SortSpec("name"),),
+            None,
+            0,
+            id="nested-filter",
+        ),
+        pytest.param(None, (SortSpec("name", ascending=False),), 2, 1, id="paginated"),
+        pytest.param(
+            SearchQuery(where=Filter(field="name", op=Operator.EQ, value="nobody")),
+            (),
+            None,
+            0,
+            id="no-match",
+        ),
+    ],
+)
+async def test_user_projection_matches_manager_search(
+    db_session: AsyncSession,
+    query: SearchQuery | None,
+    sort_by: tuple[SortSpec, ...],
+    limit: int | None,
+    offset: int,
+) -> None:
+    users = await SQLAlchemyUserManager(db_session).search(
+        query, sort_by=sort_by, limit=limit, offset=offset, load=_USER_LOAD_SPEC
+    )
+    expected = [_row_from_domain(user) for user in users]
+
+    rows = await SQLAlchemyUserProjection(db_session).search(
+        query, sort_by=sort_by, limit=limit, offset=offset
+    )
+
+    assert rows == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("school_users")
+async def test_user_projection_flattens_relations(db_session: AsyncSession) -> None:
+    rows = await SQLAlchemyUserProjection(db_session).search(
+        SearchQuery(where=Filter(field="name", op=Operator.MATCHES, value="projection_*")),
+        sort_by=(SortSpec("name"),),
+    )
+
+    by_name = {row.name: row for row in rows}
+    ward = by_name["projection_ward"]
+    assert ward.primary_school_name == "projection_a"
+    assert ward.udm_properties == {"title": "Dr."}
+    assert ward.school_memberships == (
+        SchoolMembershipRow(school_name="projection_a", is_primary=True, role_names=("student",)),
+        SchoolMembershipRow(school_name="projection_b", is_primary=False, role_names=("student",)),
+    )
+    assert [(group.name, group.role_names) for group in ward.groups] == [
+        ("projection_a-1a", ("school_class",)),
+        ("projection_b-chess", ("workgroup",)),
+    ]
+    assert ward.legal_guardian_names == ("projection_guardian",)
+    assert by_name["projection_guardian"].legal_ward_names == ("projection_ward",)
+    teacher = by_name["projection_teacher"]
+    assert teacher.primary_school_name == "projection_b"
+    assert teacher.school_memberships[0].role_names == ("student", "teacher")
+    with pytest.raises(ValueError, match="no primary school"):
+        _ = by_name["projection_unassigned"].primary_school_name
@@ -233,3 +233,9 @@ def test_to_json_handles_nested_model_collections() -> None:
     assert "school_memberships" in serialized
     assert "users" in serialized
     assert serialized["maybe"] == _UNLOADED_MARKER
+
+
+@pytest.mark.parametrize("model", [School, Role, Group, SchoolMembership, User])
+def test_domain_models_use_serialize_fields_as_slots(model: type) -> None:
+    assert model.__slots__ == model.__serialize_fields__
+    assert "__dict__" not in dir(model)
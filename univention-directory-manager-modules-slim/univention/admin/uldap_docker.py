@@ -10,6 +10,9 @@
 import logging
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 from pathlib import Path
 
@@ -34,6 +37,8 @@ APP_ID = "ucsschool-kelvin-rest-api"
 APP_BASE_PATH = Path("/var/lib/univention-appcenter/apps", APP_ID)
 APP_CONFIG_BASE_PATH = APP_BASE_PATH / "conf"
 CN_ADMIN_PASSWORD_FILE = APP_CONFIG_BASE_PATH / "cn_admin.secret"
+POLICY_CACHE_MAXSIZE = 1024
+POLICY_CACHE_TTL = 300  # policies changed through other connections are seen after this time
 
 
 def _ucr():  # type: () -> ConfigRegistry
@@ -157,6 +162,49 @@ def getMachineConnection(  # nosec
     )
 
 
+class _PolicyCache(object):
+    """
+    Cache of `access.getPolicies()`: the policy references of the ancestors of
+    the objects and the policy objects. Every object below a container resolves
+    the same chain, so that is read from LDAP only once per TTL.
+
+    The least recently used entry is removed when `maxsize` is reached.
+    """
+
+    def __init__(self, maxsize=POLICY_CACHE_MAXSIZE, ttl=POLICY_CACHE_TTL):
+        # type: (int, float) -> None
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # type: OrderedDict[Tuple[str, str], Tuple[Any, float]]
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        # type: (Tuple[str, str]) -> Any
+        """
+        :raises KeyError: if `key` is not cached or expired.
+        """
+        with self._lock:
+            value, expires_at = self._data[key]
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                raise KeyError(key)
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        # type: (Tuple[str, str], Any) -> None
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        # type: () -> None
+        with self._lock:
+            self._data.clear()
+
+
 def _fix_reconnect_handling(func):
     # Bug #47926: python ldap does not reconnect on ldap.UNAVAILABLE
     # We need this until https://github.com/python-ldap/python-ldap/pull/267 is fixed
@@ -249,6 +297,7 @@ class access(object):
         client_retry_count = 10
 
         self.client_connection_attempt = client_retry_count + 1
+        self._policy_cache = _PolicyCache()
 
         self.__open(ca_certfile)
 
@@ -596,15 +645,46 @@ class access(object):
                 dn = self.parentDn(dn)
                 if not dn:
                     break
-                try:
-                    parent = self.get(dn, attr=["univentionPolicyReference"], required=True)
-                except ldap.NO_SUCH_OBJECT:
+                policies = self._get_policy_references(dn)
+                if policies is None:
                     break
-                policies = parent.get("univentionPolicyReference", [])
 
             logger.debug("getPolicies: result: %s" % result)
         return result
 
+    def _get_policy_references(self, dn):
+        # type: (str) -> Optional[List[str]]
+        """
+        Return the policy references of the container `dn`, `None` if it does not exist.
+        """
+        key = ("references", dn.lower())
+        try:
+            return self._policy_cache.get(key)
+        except KeyError:
+            pass
+        try:
+            container = self.get(dn, attr=["univentionPolicyReference"], required=True)
+        except ldap.NO_SUCH_OBJECT:
+            references = None
+        else:
+            references = container.get("univentionPolicyReference", [])
+        self._policy_cache.set(key, references)
+        return references
+
+    def _get_policy(self, policy_dn):
+        # type: (str) -> Dict[str, List[Any]]
+        """
+        Return the attributes of the policy object `policy_dn`, an empty dict if it does not exist.
+        """
+        key = ("policy", policy_dn.lower())
+        try:
+            return self._policy_cache.get(key)
+        except KeyError:
+            pass
+        pattrs = self.get(policy_dn)
+        self._policy_cache.set(key, pattrs)
+        return pattrs
+
     def _merge_policy(self, policy_dn, obj_dn, object_classes, result):
         # type: (str, str, Set[str], Dict[str, Dict[str, Any]]) -> None
         """
@@ -615,7 +695,7 @@ class access(object):
         :param object_classes set: the set of object classes of the LDAP object.
         :param result list: A mapping, into which the policy is merged.
         """
-        pattrs = self.get(policy_dn)
+        pattrs = self._get_policy(policy_dn)
         if not pattrs:
             return
 
@@ -641,7 +721,7 @@ class access(object):
         fixed = set(pattrs.get("fixedAttributes", ()))
         empty = set(pattrs.get("emptyAttributes", ()))
         values = result.setdefault(ptype, {})
-        for key in list(empty) + pattrs.keys() + list(fixed):
+        for key in list(empty) + list(pattrs) + list(fixed):
             if key in (
                 "requiredObjectClasses",
                 "prohibitedObjectClasses",
@@ -655,7 +735,8 @@ class access(object):
                 continue
 
             if key not in values or key in fixed:
-                value = [] if key in empty else pattrs.get(key, [])
+                # a copy, the policy object is cached
+                value = [] if key in empty else list(pattrs.get(key, []))
                 logger.info("getPolicies: %s sets: %s=%s" % (policy_dn, key, value))
                 values[key] = {
                     "policy": policy_dn,
@@ -719,6 +800,8 @@ class access(object):
                 raise
             lo_ref = self._handle_referral(exc)
             rtype, rdata, rmsgid, resp_ctrls = lo_ref.add_ext_s(dn, nal, serverctrls=serverctrls)
+        # the new object may be a policy or a container with policy references
+        self._policy_cache.clear()
 
         if serverctrls and isinstance(response, dict):
             response["ctrls"] = resp_ctrls
@@ -839,6 +922,7 @@ class access(object):
                 raise
             lo_ref = self._handle_referral(exc)
             lo_ref.modify_ext_s(dn, ml)
+        self._policy_cache.clear()
 
     @_fix_reconnect_handling
     def modify_ext_s(self, dn, ml, serverctrls=None, response=None):
@@ -863,6 +947,7 @@ class access(object):
                 raise
             lo_ref = self._handle_referral(exc)
             rtype, rdata, rmsgid, resp_ctrls = lo_ref.modify_ext_s(dn, ml, serverctrls=serverctrls)
+        self._policy_cache.clear()
 
         if serverctrls and isinstance(response, dict):
             response["ctrls"] = resp_ctrls
@@ -922,6 +1007,7 @@ class access(object):
             rtype, rdata, rmsgid, resp_ctrls = lo_ref.rename_s(
                 dn, newrdn, newsuperior, serverctrls=serverctrls
             )
+        self._policy_cache.clear()
 
         if serverctrls and isinstance(response, dict):
             response["ctrls"] = resp_ctrls
@@ -944,6 +1030,7 @@ class access(object):
                     raise
                 lo_ref = self._handle_referral(exc)
                 lo_ref.delete_s(dn)
+            self._policy_cache.clear()
 
     def parentDn(self, dn):
         # type: (str) -> Optional[str]
@@ -1011,6 +1098,7 @@ class access(object):
         """
         odict = self.__dict__.copy()
         del odict["lo"]
+        del odict["_policy_cache"]
         return odict
 
     def __setstate__(self, dict):
@@ -1018,6 +1106,7 @@ class access(object):
         Set state for pickling.
         """
         self.__dict__.update(dict)
+        self._policy_cache = _PolicyCache()
         self.__open(self.ca_certfile)
 
     def _handle_referral(self, exception):